@@ -0,0 +1,33 @@
+"""add rss_feeds websub subscription columns
+
+Revision ID: 1f5c7a3e9b2d
+Revises: 6d2b9f4e8a3c
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f5c7a3e9b2d'
+down_revision: Union[str, None] = '6d2b9f4e8a3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rss_feeds', sa.Column('hub_url', sa.String(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('websub_topic', sa.String(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('websub_secret', sa.String(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('websub_lease_expires_at', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rss_feeds') as batch_op:
+        batch_op.drop_column('websub_lease_expires_at')
+        batch_op.drop_column('websub_secret')
+        batch_op.drop_column('websub_topic')
+        batch_op.drop_column('hub_url')
@@ -0,0 +1,46 @@
+"""add content_cache_entries and tasks.refresh_content
+
+Revision ID: 2a7e9c4d6b1f
+Revises: 9d4f6b8a2c1e
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a7e9c4d6b1f'
+down_revision: Union[str, None] = '9d4f6b8a2c1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('content_cache_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('url_key', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.BigInteger(), nullable=False),
+    sa.Column('last_hit_at', sa.BigInteger(), nullable=True),
+    sa.Column('expires_at', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_content_cache_entries_id'), 'content_cache_entries', ['id'], unique=False)
+    op.create_index(op.f('ix_content_cache_entries_url_key'), 'content_cache_entries', ['url_key'], unique=True)
+    op.create_index(op.f('ix_content_cache_entries_expires_at'), 'content_cache_entries', ['expires_at'], unique=False)
+    op.add_column('tasks', sa.Column('refresh_content', sa.Boolean(), nullable=False, server_default=sa.text('0')))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('refresh_content')
+    op.drop_index(op.f('ix_content_cache_entries_expires_at'), table_name='content_cache_entries')
+    op.drop_index(op.f('ix_content_cache_entries_url_key'), table_name='content_cache_entries')
+    op.drop_index(op.f('ix_content_cache_entries_id'), table_name='content_cache_entries')
+    op.drop_table('content_cache_entries')
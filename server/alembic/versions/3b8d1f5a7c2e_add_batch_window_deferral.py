@@ -0,0 +1,35 @@
+"""add rss_feeds defer_to_batch_window and tasks deferred_until
+
+Revision ID: 3b8d1f5a7c2e
+Revises: 9e4f2b6d8a1c
+Create Date: 2026-10-21 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8d1f5a7c2e'
+down_revision: Union[str, None] = '9e4f2b6d8a1c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'rss_feeds',
+        sa.Column('defer_to_batch_window', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+    op.add_column('tasks', sa.Column('deferred_until', sa.BigInteger(), nullable=True))
+    op.create_index(op.f('ix_tasks_deferred_until'), 'tasks', ['deferred_until'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tasks_deferred_until'), table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('deferred_until')
+    with op.batch_alter_table('rss_feeds') as batch_op:
+        batch_op.drop_column('defer_to_batch_window')
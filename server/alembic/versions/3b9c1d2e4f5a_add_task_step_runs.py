@@ -0,0 +1,52 @@
+"""add task_step_runs
+
+Revision ID: 3b9c1d2e4f5a
+Revises: fe52d265bea5
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9c1d2e4f5a'
+down_revision: Union[str, None] = 'fe52d265bea5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_step_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('step_index', sa.Integer(), nullable=False),
+    sa.Column('step_name', sa.String(), nullable=False),
+    sa.Column('step_type', sa.String(), nullable=False),
+    sa.Column('level', sa.String(), nullable=True),
+    sa.Column('lang', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.BigInteger(), nullable=False),
+    sa.Column('finished_at', sa.BigInteger(), nullable=True),
+    sa.Column('duration_ms', sa.Integer(), nullable=True),
+    sa.Column('provider', sa.String(), nullable=True),
+    sa.Column('calls', sa.Integer(), nullable=False),
+    sa.Column('tokens', sa.Integer(), nullable=False),
+    sa.Column('characters', sa.Integer(), nullable=False),
+    sa.Column('error_class', sa.String(), nullable=True),
+    sa.Column('error_message', sa.String(), nullable=True),
+    sa.Column('created_at', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.taskId'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_step_runs_id'), 'task_step_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_task_step_runs_task_id'), 'task_step_runs', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_step_runs_task_id'), table_name='task_step_runs')
+    op.drop_index(op.f('ix_task_step_runs_id'), table_name='task_step_runs')
+    op.drop_table('task_step_runs')
@@ -0,0 +1,34 @@
+"""add rss_feeds poll_interval and next_fetch_at
+
+Revision ID: 4c6a8e2f1d7b
+Revises: 8e1f4a6c2d9b
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c6a8e2f1d7b'
+down_revision: Union[str, None] = '8e1f4a6c2d9b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rss_feeds', sa.Column('poll_interval', sa.Integer(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('next_fetch_at', sa.BigInteger(), nullable=True))
+    # 已抓取过的源沿用原有的固定间隔安排下次抓取
+    op.execute(
+        "UPDATE rss_feeds SET next_fetch_at = last_fetch + fetch_interval * 1000 "
+        "WHERE last_fetch IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rss_feeds') as batch_op:
+        batch_op.drop_column('next_fetch_at')
+        batch_op.drop_column('poll_interval')
@@ -0,0 +1,29 @@
+"""add tasks.dedupe_key
+
+Revision ID: 5b8d3f1a7e2c
+Revises: 2a7e9c4d6b1f
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8d3f1a7e2c'
+down_revision: Union[str, None] = '2a7e9c4d6b1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('dedupe_key', sa.String(), nullable=True))
+    op.create_index(op.f('ix_tasks_dedupe_key'), 'tasks', ['dedupe_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tasks_dedupe_key'), table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('dedupe_key')
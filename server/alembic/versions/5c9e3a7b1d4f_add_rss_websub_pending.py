@@ -0,0 +1,31 @@
+"""add rss_feeds websub pending subscription
+
+Revision ID: 5c9e3a7b1d4f
+Revises: 3b8d1f5a7c2e
+Create Date: 2026-10-22 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9e3a7b1d4f'
+down_revision: Union[str, None] = '3b8d1f5a7c2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rss_feeds', sa.Column('websub_pending_mode', sa.String(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('websub_pending_topic', sa.String(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('websub_pending_expires_at', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rss_feeds') as batch_op:
+        batch_op.drop_column('websub_pending_expires_at')
+        batch_op.drop_column('websub_pending_topic')
+        batch_op.drop_column('websub_pending_mode')
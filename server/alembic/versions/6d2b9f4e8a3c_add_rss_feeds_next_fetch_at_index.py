@@ -0,0 +1,25 @@
+"""add rss_feeds next_fetch_at index
+
+Revision ID: 6d2b9f4e8a3c
+Revises: 4c6a8e2f1d7b
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2b9f4e8a3c'
+down_revision: Union[str, None] = '4c6a8e2f1d7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_rss_feeds_next_fetch_at', 'rss_feeds', ['next_fetch_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rss_feeds_next_fetch_at', table_name='rss_feeds')
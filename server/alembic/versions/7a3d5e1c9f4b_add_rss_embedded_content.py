@@ -0,0 +1,33 @@
+"""add rss_entries content and rss_feeds use_embedded_content
+
+Revision ID: 7a3d5e1c9f4b
+Revises: 1f5c7a3e9b2d
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3d5e1c9f4b'
+down_revision: Union[str, None] = '1f5c7a3e9b2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rss_entries', sa.Column('content', sa.Text(), nullable=True))
+    op.add_column(
+        'rss_feeds',
+        sa.Column('use_embedded_content', sa.Boolean(), nullable=False, server_default=sa.true())
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rss_feeds') as batch_op:
+        batch_op.drop_column('use_embedded_content')
+    with op.batch_alter_table('rss_entries') as batch_op:
+        batch_op.drop_column('content')
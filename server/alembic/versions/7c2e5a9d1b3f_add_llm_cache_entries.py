@@ -0,0 +1,48 @@
+"""add llm_cache_entries
+
+Revision ID: 7c2e5a9d1b3f
+Revises: 3b9c1d2e4f5a
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9d1b3f'
+down_revision: Union[str, None] = '3b9c1d2e4f5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('llm_cache_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cache_key', sa.String(), nullable=False),
+    sa.Column('template_name', sa.String(), nullable=False),
+    sa.Column('template_version', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('temperature', sa.String(), nullable=True),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('tokens', sa.Integer(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.BigInteger(), nullable=False),
+    sa.Column('last_hit_at', sa.BigInteger(), nullable=True),
+    sa.Column('expires_at', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_llm_cache_entries_id'), 'llm_cache_entries', ['id'], unique=False)
+    op.create_index(op.f('ix_llm_cache_entries_cache_key'), 'llm_cache_entries', ['cache_key'], unique=True)
+    op.create_index(op.f('ix_llm_cache_entries_template_name'), 'llm_cache_entries', ['template_name'], unique=False)
+    op.create_index(op.f('ix_llm_cache_entries_expires_at'), 'llm_cache_entries', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_llm_cache_entries_expires_at'), table_name='llm_cache_entries')
+    op.drop_index(op.f('ix_llm_cache_entries_template_name'), table_name='llm_cache_entries')
+    op.drop_index(op.f('ix_llm_cache_entries_cache_key'), table_name='llm_cache_entries')
+    op.drop_index(op.f('ix_llm_cache_entries_id'), table_name='llm_cache_entries')
+    op.drop_table('llm_cache_entries')
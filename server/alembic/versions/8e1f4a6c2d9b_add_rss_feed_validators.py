@@ -0,0 +1,31 @@
+"""add rss_feeds etag, last_modified and content_hash
+
+Revision ID: 8e1f4a6c2d9b
+Revises: 5b8d3f1a7e2c
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1f4a6c2d9b'
+down_revision: Union[str, None] = '5b8d3f1a7e2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rss_feeds', sa.Column('etag', sa.String(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('last_modified', sa.String(), nullable=True))
+    op.add_column('rss_feeds', sa.Column('content_hash', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rss_feeds') as batch_op:
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('last_modified')
+        batch_op.drop_column('etag')
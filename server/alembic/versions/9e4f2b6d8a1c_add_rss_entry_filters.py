@@ -0,0 +1,30 @@
+"""add rss_feeds entry_filters and rss_entries skip_reason
+
+Revision ID: 9e4f2b6d8a1c
+Revises: 7a3d5e1c9f4b
+Create Date: 2026-10-20 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4f2b6d8a1c'
+down_revision: Union[str, None] = '7a3d5e1c9f4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rss_feeds', sa.Column('entry_filters', sa.JSON(), nullable=True))
+    op.add_column('rss_entries', sa.Column('skip_reason', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rss_entries') as batch_op:
+        batch_op.drop_column('skip_reason')
+    with op.batch_alter_table('rss_feeds') as batch_op:
+        batch_op.drop_column('entry_filters')
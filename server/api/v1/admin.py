@@ -0,0 +1,69 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from db.session import get_db
+from models.user import User
+from auth.dependencies import get_admin_user
+from crud.task_step_run import task_step_run as step_run_crud
+from schemas.task import StepStatsResponse
+from schemas.llm_cache import LLMCacheStatsResponse, LLMCacheClearResponse
+from schemas.content_cache import ContentCacheStatsResponse, ContentCacheClearResponse
+from services.llm_cache import llm_cache
+from services.content_cache import content_cache
+
+router = APIRouter()
+
+@router.get("/step-stats", response_model=StepStatsResponse)
+async def get_step_stats(
+    group_by: str = Query("step_type", description="聚合维度: step_type/step_name/provider/level"),
+    start_date: Optional[int] = Query(None, description="开始时间(毫秒时间戳)"),
+    end_date: Optional[int] = Query(None, description="结束时间(毫秒时间戳)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """按维度聚合步骤耗时、重试次数和用量"""
+    try:
+        items = step_run_crud.get_stats(
+            db,
+            group_by=group_by,
+            start_date=start_date,
+            end_date=end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"group_by": group_by, "items": items}
+
+@router.get("/llm-cache", response_model=LLMCacheStatsResponse)
+async def get_llm_cache_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """获取LLM响应缓存的配置与命中统计"""
+    return llm_cache.get_stats(db)
+
+@router.delete("/llm-cache", response_model=LLMCacheClearResponse)
+async def clear_llm_cache(
+    template_name: Optional[str] = Query(None, description="只清空指定模板的缓存"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """清空LLM响应缓存"""
+    return {"removed": llm_cache.clear(db, template_name)}
+
+@router.get("/content-cache", response_model=ContentCacheStatsResponse)
+async def get_content_cache_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """获取网页正文缓存的配置与命中统计"""
+    return content_cache.get_stats(db)
+
+@router.delete("/content-cache", response_model=ContentCacheClearResponse)
+async def clear_content_cache(
+    url: Optional[str] = Query(None, description="只清空指定URL的缓存"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """清空网页正文缓存"""
+    return {"removed": content_cache.clear(db, url)}
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from api.v1 import auth, tasks, users, configs, rss
+from api.v1 import auth, tasks, users, configs, rss, admin
 
 api_router = APIRouter()
 
@@ -16,4 +16,7 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(configs.router, prefix="/configs", tags=["configs"])
 
 # RSS相关路由
-api_router.include_router(rss.router, prefix="/rss", tags=["rss"]) 
\ No newline at end of file
+api_router.include_router(rss.router, prefix="/rss", tags=["rss"])
+
+# 管理统计相关路由
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
\ No newline at end of file
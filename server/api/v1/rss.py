@@ -1,5 +1,6 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 import asyncio
@@ -24,6 +25,7 @@ from auth.dependencies import get_current_user
 from services.rss.feed_manager import FeedManager
 from services.task.processor import TaskProcessor
 from core.logging import log
+from core.scheduler import feed_scheduler
 
 router = APIRouter()
 
@@ -100,12 +102,23 @@ async def create_feed(
         db.refresh(new_feed)
         
         # 创建一个独立的后台任务来处理RSS源
+        feed_id = new_feed.id
         async def background_fetch():
             try:
                 async_db = SessionLocal()
                 try:
+                    feed = await asyncio.to_thread(async_db.get, RSSFeed, feed_id)
+                    if feed is None:
+                        return
                     manager = FeedManager(async_db, None)
-                    await manager.fetch_feed(new_feed)
+                    try:
+                        await manager.fetch_feed(feed)
+                    finally:
+                        is_active, next_fetch_at = await asyncio.to_thread(
+                            lambda: (feed.is_active, feed.next_fetch_at)
+                        )
+                        if is_active:
+                            feed_scheduler.schedule(feed_id, next_fetch_at)
                 except Exception as e:
                     log.error(f"RSS源初始化抓取失败: {str(e)}")
                 finally:
@@ -134,11 +147,23 @@ async def update_feed(
         raise HTTPException(status_code=404, detail="RSS源不存在")
     
     # 更新字段
-    for field, value in feed_update.model_dump(exclude_unset=True).items():
+    update_data = feed_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
         setattr(feed, field, value)
     
+    # 修改抓取间隔或恢复暂停的源后，下一轮立即抓取并重新计算间隔
+    if update_data.get('is_active'):
+        feed.error_count = 0
+    if 'fetch_interval' in update_data or update_data.get('is_active'):
+        feed.poll_interval = None
+        feed.next_fetch_at = None
+    
     db.commit()
     db.refresh(feed)
+    if feed.is_active:
+        feed_scheduler.schedule(feed.id, feed.next_fetch_at)
+    else:
+        feed_scheduler.remove(feed.id)
     return feed
 
 @router.delete("/feeds/{feed_id}")
@@ -156,6 +181,7 @@ async def delete_feed(
     db.query(RSSEntry).filter_by(feed_id=feed_id).delete()
     db.delete(feed)
     db.commit()
+    feed_scheduler.remove(feed_id)
     
     return {"message": "RSS源已删除"}
 
@@ -176,6 +202,11 @@ async def fetch_feed(
         return {"message": "RSS源更新成功"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"RSS源更新失败: {str(e)}")
+    finally:
+        if feed.is_active:
+            feed_scheduler.schedule(feed.id, feed.next_fetch_at)
+        else:
+            feed_scheduler.remove(feed.id)
 
 @router.get("/feeds/{feed_id}/entries", response_model=List[RSSEntryResponse])
 async def list_feed_entries(
@@ -199,3 +230,35 @@ async def list_feed_entries(
         .all()
     )
     return entries
+
+@router.get("/websub/{feed_id}", response_class=PlainTextResponse)
+def websub_verify(
+    feed_id: int,
+    mode: str = Query(..., alias="hub.mode"),
+    topic: Optional[str] = Query(None, alias="hub.topic"),
+    challenge: Optional[str] = Query(None, alias="hub.challenge"),
+    lease_seconds: Optional[int] = Query(None, alias="hub.lease_seconds"),
+    token: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """WebSub hub的订阅验证回调，确认时原样返回challenge"""
+    manager = FeedManager(db, None)
+    result = manager.confirm_subscription(feed_id, mode, topic, challenge, lease_seconds, token)
+    if result is None:
+        raise HTTPException(status_code=404, detail="订阅不存在")
+    return result
+
+@router.post("/websub/{feed_id}", status_code=status.HTTP_202_ACCEPTED)
+async def websub_push(
+    feed_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """接收WebSub hub推送的内容
+
+    签名无效的内容同样返回2xx以免hub重试，但不做处理
+    """
+    body = await request.body()
+    manager = FeedManager(db, None)
+    await manager.ingest_push(feed_id, body, request.headers.get("X-Hub-Signature"))
+    return Response(status_code=status.HTTP_202_ACCEPTED)
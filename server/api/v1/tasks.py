@@ -2,7 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from crud.task import task as task_crud
-from schemas.task import TaskCreate, TaskResponse, TaskListResponse, TaskQueryParams, TaskUpdate
+from crud.task_step_run import task_step_run as step_run_crud
+from schemas.task import (
+    TaskCreate, TaskResponse, TaskListResponse, TaskQueryParams, TaskUpdate,
+    TaskTimelineResponse
+)
 from models.user import User
 from auth.dependencies import get_current_active_user, get_current_user
 from db.session import get_db
@@ -62,6 +66,28 @@ async def get_task(
     
     return task
 
+@router.get("/{task_id}/timeline", response_model=TaskTimelineResponse)
+async def get_task_timeline(
+    task_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """获取任务各步骤的执行时间线"""
+    task = task_crud.get(db, task_id=task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    # 检查任务权限
+    if task.user_id != current_user.id and not task.is_public and not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="No permission to access this task")
+    
+    runs = step_run_crud.get_by_task(db, task_id=task_id)
+    return {
+        "taskId": task_id,
+        "total_duration_ms": sum(run.duration_ms or 0 for run in runs),
+        "items": runs
+    }
+
 @router.get("", response_model=TaskListResponse)
 async def list_tasks(
     params: TaskQueryParams = Depends(),
@@ -59,9 +59,17 @@ class Settings(BaseSettings):
     # RSS配置
     RSS_DEFAULT_FETCH_INTERVAL_SECONDS: int  # RSS源的默认抓取间隔（秒）
     RSS_MAX_ENTRIES_PER_FEED: int           # 每个RSS源最多处理的条目数
-    RSS_MAX_RETRY_COUNT: int                # RSS源抓取失败最大重试次数
-    RSS_ERROR_RETRY_INTERVAL: int           # RSS源出错后重试间隔（秒）
-    RSS_CONCURRENT_TASKS: int               # RSS任务并发处理数量
+    RSS_MAX_RETRY_COUNT: int                # RSS源连续失败超过该次数后自动暂停
+    RSS_ERROR_RETRY_INTERVAL: int           # RSS源出错后首次重试间隔（秒），之后指数退避
+    RSS_CONCURRENT_TASKS: int               # 同时抓取的RSS源数量
+    RSS_FETCH_PER_HOST: int = 4             # 同一主机同时抓取的RSS源数量
+    RSS_FETCH_TIMEOUT: float = 30.0         # 单个RSS源的抓取超时时间（秒）
+    RSS_PARSE_WORKERS: int = 2              # 解析RSS文档的进程数，为0时在线程中解析
+    RSS_EMBEDDED_CONTENT_MIN_LENGTH: int = 1000  # 源内嵌正文达到该长度(字符)时直接使用，不再抓取网页
+    RSS_BATCH_WINDOW: str = ""              # 批处理时段，如 "01:00-06:00"(TIMEZONE时区)，开启延后的源的任务在此时段执行
+    RSS_BATCH_MAX_STALENESS: int = 86400    # 延后任务的最长等待时间（秒），超过后不等批处理时段立即执行
+    WEBSUB_CALLBACK_BASE_URL: str = ""      # 服务的公网地址，用于接收WebSub推送，为空时不订阅
+    WEBSUB_LEASE_SECONDS: int = 864000      # WebSub订阅的租期（秒）
     RSS_MIN_FETCH_INTERVAL: int             # 最小抓取间隔（秒）
     RSS_MAX_FETCH_INTERVAL: int             # 最大抓取间隔（秒）
     RSS_MAX_INITIAL_ENTRIES: int            # 初次获取的最大条目数
@@ -75,6 +83,56 @@ class Settings(BaseSettings):
     
     # 任务处理相关配置
     MAX_TASK_WORKERS: int # 任务处理线程池最大并发数
+    TASK_ASYNC_RUNTIME: bool = False           # 是否在事件循环中以协程方式执行任务步骤
+    ASYNC_MAX_INFLIGHT_CALLS: int = 100        # 事件循环中同时进行的LLM/TTS请求数上限（各自计算）
+    ASYNC_CPU_WORKERS: int = 2                 # 事件循环模式下处理CPU密集工作的线程数
+    TASK_DEDUPE_ENABLED: bool = True           # 相同URL与风格参数的任务是否复用已有任务的音频和字幕
+    TASK_DEDUPE_WAIT_TIMEOUT: float = 3600.0   # 相同任务处理超过该时间（秒）后，新任务不再排队等待而是自行处理
+    
+    # 网页抓取配置
+    URL_FETCH_TIMEOUT: float = 30.0            # 网页请求超时时间（秒）
+    URL_FETCH_MAX_BYTES: int = 5242880         # 网页大小上限（字节），超出时中止读取
+    URL_FETCH_POOL_SIZE: int = 10              # 网页抓取连接池大小
+    URL_FETCH_REVALIDATE_ENTRIES: int = 256    # 保留ETag/Last-Modified用于条件请求的页面数
+    HTML_EXTRACTOR: str = "lxml"               # 正文提取器：lxml(readability打分) 或 bs4
+    CONTENT_CACHE_ENABLED: bool = True         # 是否按规范化URL缓存提取出的网页正文
+    CONTENT_CACHE_TTL_SECONDS: int = 86400     # 网页正文缓存有效期（秒，默认1天）
+    CONTENT_CACHE_MAX_ENTRIES: int = 2000      # 网页正文最大缓存条目数，超出时淘汰最久未使用的条目
+    
+    # LLM/TTS客户端连接池配置
+    CLIENT_POOL_MAX_CONNECTIONS: int = 20      # 每个客户端的最大连接数
+    CLIENT_POOL_MAX_KEEPALIVE: int = 10        # 保持活跃的空闲连接数
+    CLIENT_POOL_KEEPALIVE_EXPIRY: float = 60.0 # 空闲连接保持时间（秒）
+    CLIENT_POOL_TIMEOUT: float = 120.0         # 请求超时时间（秒）
+    
+    # LLM并发配置
+    LLM_MAX_CONCURRENCY: int = 0               # 进程内同时进行的LLM请求数上限（0表示与MAX_TASK_WORKERS相同）
+    
+    # 服务限流配置（0表示不限制）
+    LLM_RATE_LIMIT_RPM: int = 0                # 每个LLM端点每分钟请求数上限
+    LLM_RATE_LIMIT_TPM: int = 0                # 每个LLM端点每分钟token数上限
+    TTS_RATE_LIMIT_RPM: int = 0                # 每个TTS端点每分钟请求数上限
+    RATE_LIMIT_SHARED: bool = False            # 是否通过数据库在多个进程间共享限流配额
+    RATE_LIMIT_MAX_WAIT: float = 300.0         # 等待限流配额的最长时间（秒）
+    RATE_LIMIT_DEFAULT_BACKOFF: float = 5.0    # 服务端限流且未返回Retry-After时的暂停时间（秒）
+    RATE_LIMIT_MAX_RETRIES: int = 3            # 服务端限流后的最大重试次数
+    
+    # 内容生成配置
+    CONTENT_MULTI_LEVEL_MODE: bool = False     # 是否一次调用生成所有难度的内容
+    
+    # 长文本处理配置
+    LONG_TEXT_TOKEN_BUDGET: int = 3000         # 内容改写和对话生成的输入token预算，超出时分段精简
+    LONG_TEXT_CHUNK_TOKENS: int = 1500         # 分段精简时每个片段的token数
+    
+    # 翻译批次配置
+    TRANSLATION_BATCH_TOKEN_BUDGET: int = 800  # 每批翻译输入的token预算
+    TRANSLATION_MAX_BATCH_ITEMS: int = 20      # 每批最多翻译的对话条数
+    
+    # LLM响应缓存配置
+    LLM_CACHE_ENABLED: bool = True             # 是否启用LLM响应缓存
+    LLM_CACHE_TTL_SECONDS: int = 604800        # 缓存有效期（秒，默认7天）
+    LLM_CACHE_MAX_ENTRIES: int = 5000          # 最大缓存条目数，超出时淘汰最久未使用的条目
+    LLM_CACHE_DISABLED_TEMPLATES: str = ""     # 不使用缓存的模板名称，逗号分隔
     
     model_config = ConfigDict(
         env_file=".env",
@@ -102,7 +160,18 @@ class ConfigManager:
         'ALLOWED_URL_PATTERN',
         'TEST_USER_ENABLED',
         'TEST_USERNAME',
-        'TEST_PASSWORD'
+        'TEST_PASSWORD',
+        'LLM_CACHE_ENABLED',
+        'CONTENT_MULTI_LEVEL_MODE',
+        'LLM_CACHE_DISABLED_TEMPLATES',
+        'LLM_RATE_LIMIT_RPM',
+        'LLM_RATE_LIMIT_TPM',
+        'TTS_RATE_LIMIT_RPM',
+        'HTML_EXTRACTOR',
+        'CONTENT_CACHE_ENABLED',
+        'TASK_DEDUPE_ENABLED',
+        'RSS_BATCH_WINDOW',
+        'RSS_BATCH_MAX_STALENESS'
     }
 
     def __new__(cls):
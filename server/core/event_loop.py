@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict
+
+from core.config import settings
+from core.logging import log
+
+# 每个事件循环各自的信号量，asyncio.Semaphore 不能跨事件循环使用
+_loop_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def loop_semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    """获取当前事件循环中指定名称的信号量，不存在时按 limit 创建"""
+    loop = asyncio.get_running_loop()
+    semaphores = _loop_semaphores.setdefault(loop, {})
+    if name not in semaphores:
+        semaphores[name] = asyncio.Semaphore(limit)
+    return semaphores[name]
+
+
+class EventLoopManager:
+    """后台事件循环管理器
+
+    在独立线程中运行一个事件循环，I/O密集的任务步骤以协程方式在其中并发执行，
+    少量线程即可同时驱动大量进行中的LLM/TTS请求；CPU密集的工作(如音频处理)
+    通过 run_cpu 交给专用线程池，其余阻塞调用通过 asyncio.to_thread 交给默认线程池，
+    避免阻塞事件循环。
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+            return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            self.loop = asyncio.new_event_loop()
+            self.cpu_executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_CPU_WORKERS,
+                thread_name_prefix='async_cpu'
+            )
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                name='async_pipeline',
+                daemon=True
+            )
+            self._thread.start()
+            self.initialized = True
+            log.info(f"事件循环初始化完成，CPU线程数: {settings.ASYNC_CPU_WORKERS}")
+
+    @classmethod
+    def get_instance(cls) -> 'EventLoopManager':
+        """获取事件循环管理器实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Awaitable) -> Future:
+        """提交协程到后台事件循环
+
+        Args:
+            coro: 要执行的协程
+
+        Returns:
+            Future: 可在其他线程中等待结果的Future对象
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def shutdown(self):
+        """停止事件循环并关闭线程池"""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+        self.cpu_executor.shutdown(wait=False)
+        log.info("事件循环已关闭")
+
+
+async def run_cpu(fn: Callable, *args) -> Any:
+    """在CPU线程池中执行同步函数并等待结果
+
+    在后台事件循环中使用 EventLoopManager 的CPU线程池，其他事件循环中使用默认线程池。
+    """
+    loop = asyncio.get_running_loop()
+    manager = EventLoopManager._instance
+    executor = manager.cpu_executor if manager is not None and manager.loop is loop else None
+    return await loop.run_in_executor(executor, fn, *args)
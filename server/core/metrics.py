@@ -0,0 +1,191 @@
+"""Prometheus 监控指标
+
+所有指标集中定义在此模块，业务代码只导入需要的指标对象进行埋点，
+/metrics 接口通过 render_metrics 输出文本格式的指标数据。
+"""
+import time
+from contextlib import contextmanager
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# 使用独立的注册表，避免与进程内其他库注册的默认指标冲突
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+# 耗时较长的外部调用(LLM/TTS/任务)使用的分桶(秒)
+LONG_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+# 数据库提交、HTTP请求等短耗时操作使用的分桶(秒)
+SHORT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# ---- 任务处理 ----
+TASKS_TOTAL = Counter(
+    "lingopod_tasks_total",
+    "任务处理结果计数",
+    ["status"],
+    registry=REGISTRY,
+)
+TASK_DURATION = Histogram(
+    "lingopod_task_duration_seconds",
+    "单个任务从开始处理到结束的耗时",
+    ["status"],
+    buckets=LONG_BUCKETS,
+    registry=REGISTRY,
+)
+TASK_QUEUE_DEPTH = Gauge(
+    "lingopod_task_queue_depth",
+    "已提交到线程池但尚未开始执行的任务数",
+    registry=REGISTRY,
+)
+TASK_ACTIVE_WORKERS = Gauge(
+    "lingopod_task_active_workers",
+    "正在执行任务的工作线程数",
+    registry=REGISTRY,
+)
+TASK_DEDUPE_TOTAL = Counter(
+    "lingopod_task_dedupe_total",
+    "复用相同任务结果的次数(completed: 复用已完成任务, joined: 排队等待进行中的相同任务)",
+    ["result"],
+    registry=REGISTRY,
+)
+STEP_DURATION = Histogram(
+    "lingopod_step_duration_seconds",
+    "任务步骤耗时(含重试)",
+    ["step_type", "status"],
+    buckets=LONG_BUCKETS,
+    registry=REGISTRY,
+)
+
+# ---- 外部服务调用(LLM/TTS) ----
+PROVIDER_CALL_DURATION = Histogram(
+    "lingopod_provider_call_duration_seconds",
+    "LLM/TTS 服务调用耗时",
+    ["kind", "provider"],
+    buckets=LONG_BUCKETS,
+    registry=REGISTRY,
+)
+PROVIDER_CALL_ERRORS = Counter(
+    "lingopod_provider_call_errors_total",
+    "LLM/TTS 服务调用失败次数",
+    ["kind", "provider", "error"],
+    registry=REGISTRY,
+)
+
+RATE_LIMIT_WAIT = Histogram(
+    "lingopod_rate_limit_wait_seconds",
+    "调用外部服务前等待限流配额的时间（秒）",
+    ["key"],
+    buckets=SHORT_BUCKETS + (30, 60, 120, 300),
+    registry=REGISTRY,
+)
+
+RATE_LIMIT_THROTTLED = Counter(
+    "lingopod_rate_limit_throttled_total",
+    "外部服务返回限流响应(429)的次数",
+    ["key"],
+    registry=REGISTRY,
+)
+
+LLM_CACHE_REQUESTS = Counter(
+    "lingopod_llm_cache_requests_total",
+    "LLM响应缓存查询结果计数",
+    ["template", "result"],
+    registry=REGISTRY,
+)
+
+CONTENT_CACHE_REQUESTS = Counter(
+    "lingopod_content_cache_requests_total",
+    "网页正文缓存查询结果计数",
+    ["result"],
+    registry=REGISTRY,
+)
+
+# ---- RSS 抓取 ----
+RSS_FETCH_TOTAL = Counter(
+    "lingopod_rss_fetch_total",
+    "RSS源抓取结果计数",
+    ["result"],
+    registry=REGISTRY,
+)
+RSS_FETCH_DURATION = Histogram(
+    "lingopod_rss_fetch_duration_seconds",
+    "单个RSS源抓取与处理耗时",
+    buckets=LONG_BUCKETS,
+    registry=REGISTRY,
+)
+RSS_ENTRIES_CREATED = Counter(
+    "lingopod_rss_entries_created_total",
+    "RSS抓取新建的条目数",
+    registry=REGISTRY,
+)
+RSS_ENTRIES_SKIPPED = Counter(
+    "lingopod_rss_entries_skipped_total",
+    "被源的过滤规则跳过、未创建任务的RSS条目数",
+    ["rule"],
+    registry=REGISTRY,
+)
+RSS_TASKS_DEFERRED = Counter(
+    "lingopod_rss_tasks_deferred_total",
+    "延后到批处理时段的RSS任务计数(deferred 延后，window 时段内执行，staleness 等待超时后执行)",
+    ["event"],
+    registry=REGISTRY,
+)
+RSS_WEBSUB_EVENTS = Counter(
+    "lingopod_rss_websub_events_total",
+    "WebSub订阅与推送事件计数",
+    ["event"],
+    registry=REGISTRY,
+)
+
+# ---- 数据库 ----
+DB_COMMIT_DURATION = Histogram(
+    "lingopod_db_commit_duration_seconds",
+    "数据库事务提交耗时",
+    buckets=SHORT_BUCKETS,
+    registry=REGISTRY,
+)
+
+# ---- HTTP ----
+HTTP_REQUEST_DURATION = Histogram(
+    "lingopod_http_request_duration_seconds",
+    "HTTP请求处理耗时",
+    ["method", "route", "status"],
+    buckets=SHORT_BUCKETS,
+    registry=REGISTRY,
+)
+
+
+@contextmanager
+def track_provider_call(kind: str, provider: str):
+    """记录一次外部服务调用的耗时，异常时按异常类名计数后继续抛出
+
+    Args:
+        kind: 服务类型，如 llm、tts
+        provider: 服务提供方标识
+    """
+    provider = provider or "unknown"
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        PROVIDER_CALL_ERRORS.labels(kind=kind, provider=provider, error=type(e).__name__).inc()
+        raise
+    finally:
+        PROVIDER_CALL_DURATION.labels(kind=kind, provider=provider).observe(
+            time.perf_counter() - start
+        )
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """生成 Prometheus 文本格式的指标数据
+
+    Returns:
+        Tuple[bytes, str]: 指标内容与对应的 Content-Type
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,36 +1,173 @@
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+import asyncio
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+
 from core.config import settings
 from core.logging import log
-from db.session import get_db
+from db.session import get_db, SessionLocal
+from models.rss import RSSFeed
 from services.rss.feed_manager import FeedManager
 from services.task.processor import TaskProcessor
+from utils.time_utils import TimeUtil
+
+async def fetch_all_feeds() -> List[Tuple[int, Optional[int]]]:
+    """抓取所有到期的RSS源
 
-async def fetch_all_feeds():
-    """定时任务：抓取所有需要更新的RSS源"""
+    Returns:
+        本轮处理的仍启用的源及其下次抓取时间 [(feed_id, next_fetch_at)]
+    """
     try:
         # 获取数据库会话
         db = next(get_db())
         try:
             # 创建FeedManager
             manager = FeedManager(db, None)  # 不需要传递 TaskProcessor
-            await manager.process_all_feeds()
+            feeds = await manager.process_all_feeds() or []
+            return await asyncio.to_thread(
+                lambda: [(feed.id, feed.next_fetch_at) for feed in feeds if feed.is_active]
+            )
         finally:
             db.close()
     except Exception as e:
         log.error(f"RSS定时任务执行出错: {e}")
+        return []
+
+class FeedScheduler:
+    """RSS源调度器
+
+    以最小堆维护各源的下次抓取时间，在最早到期的时间点唤醒并抓取到期的源，
+    抓取完成后按新的下次抓取时间重新入堆。源的创建、修改和删除通过 schedule/remove 通知调度器。
+    每隔 RSS_MIN_FETCH_INTERVAL 秒还会做一次兜底扫描，处理未通知到调度器的变更
+    """
+    _instance = None
+    _lock = threading.Lock()
+    session_factory = SessionLocal
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+            return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            # (下次抓取时间, feed_id)，同一源重新调度后旧的堆元素在出堆时丢弃
+            self._heap: List[Tuple[int, int]] = []
+            self._due: Dict[int, int] = {}
+            self._heap_lock = threading.Lock()
+            self._loop: Optional[asyncio.AbstractEventLoop] = None
+            self._wakeup: Optional[asyncio.Event] = None
+            self._task: Optional[asyncio.Task] = None
+            self._last_sweep = 0
+            self.initialized = True
+
+    @classmethod
+    def get_instance(cls) -> 'FeedScheduler':
+        """获取RSS源调度器实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def start(self):
+        """在当前事件循环中启动调度"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._load()
+        self._task = self._loop.create_task(self._run())
+        log.info(f"RSS调度器已启动，待调度的源 {len(self._due)} 个")
+
+    def shutdown(self):
+        """停止调度并清空队列"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._loop = None
+        self._last_sweep = 0
+        with self._heap_lock:
+            self._heap.clear()
+            self._due.clear()
+
+    def schedule(self, feed_id: int, next_fetch_at: Optional[int] = None):
+        """安排源的下次抓取时间(毫秒时间戳)，为空时立即抓取，可从其他线程调用"""
+        due = next_fetch_at if next_fetch_at is not None else TimeUtil.now_ms()
+        with self._heap_lock:
+            self._due[feed_id] = due
+            heapq.heappush(self._heap, (due, feed_id))
+        self._notify()
+
+    def remove(self, feed_id: int):
+        """源被删除或暂停后不再调度"""
+        with self._heap_lock:
+            self._due.pop(feed_id, None)
+
+    def _notify(self):
+        """唤醒调度循环重新计算等待时间"""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _load(self):
+        """启动时载入所有启用的源"""
+        db = self.session_factory()
+        try:
+            rows = db.query(RSSFeed.id, RSSFeed.next_fetch_at).filter(RSSFeed.is_active == True).all()
+        finally:
+            db.close()
+        now = TimeUtil.now_ms()
+        with self._heap_lock:
+            for feed_id, next_fetch_at in rows:
+                due = next_fetch_at if next_fetch_at is not None else now
+                self._due[feed_id] = due
+                self._heap.append((due, feed_id))
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now: int) -> List[int]:
+        """取出所有已到期的源"""
+        due_ids = []
+        with self._heap_lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, feed_id = heapq.heappop(self._heap)
+                if self._due.get(feed_id) == due:
+                    del self._due[feed_id]
+                    due_ids.append(feed_id)
+        return due_ids
+
+    def _next_delay(self, now: int) -> float:
+        """距下一个源到期或下次兜底扫描的秒数"""
+        sweep_at = self._last_sweep + settings.RSS_MIN_FETCH_INTERVAL * 1000
+        with self._heap_lock:
+            # 丢弃已被重新调度或移除的堆顶元素
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            next_due = self._heap[0][0] if self._heap else sweep_at
+        return max(0, min(next_due, sweep_at) - now) / 1000
+
+    async def _run(self):
+        """调度循环"""
+        while True:
+            try:
+                now = TimeUtil.now_ms()
+                due_ids = self._pop_due(now)
+                if due_ids or now - self._last_sweep >= settings.RSS_MIN_FETCH_INTERVAL * 1000:
+                    self._last_sweep = now
+                    log.debug(f"RSS调度器唤醒，到期的源 {len(due_ids)} 个")
+                    for feed_id, next_fetch_at in await fetch_all_feeds():
+                        self.schedule(feed_id, next_fetch_at)
+
+                self._wakeup.clear()
+                delay = self._next_delay(TimeUtil.now_ms())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"RSS调度器执行出错: {e}")
+                await asyncio.sleep(1)
+
+feed_scheduler = FeedScheduler.get_instance()
 
-def setup_scheduler():
+def setup_scheduler() -> FeedScheduler:
     """设置定时任务"""
-    scheduler = AsyncIOScheduler()
-    
-    # 添加RSS抓取任务
-    scheduler.add_job(
-        fetch_all_feeds,
-        CronTrigger(minute="*/15"),  # 每15分钟执行一次
-        id="fetch_rss_feeds",
-        name="RSS Feed Fetcher",
-        misfire_grace_time=300  # 允许延迟5分钟
-    )
-    
-    return scheduler
+    return feed_scheduler
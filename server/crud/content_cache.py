@@ -0,0 +1,100 @@
+from typing import Optional, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from models.content_cache import ContentCacheEntry
+from utils.time_utils import TimeUtil
+
+class ContentCacheCRUD():
+    def get_valid(self, db: Session, url_key: str) -> Optional[ContentCacheEntry]:
+        """获取未过期的缓存条目，命中时更新命中统计"""
+        now = TimeUtil.now_ms()
+        entry = (
+            db.query(ContentCacheEntry)
+            .filter(ContentCacheEntry.url_key == url_key, ContentCacheEntry.expires_at > now)
+            .first()
+        )
+        if entry:
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_hit_at = now
+            db.commit()
+        return entry
+
+    def upsert(self, db: Session, *, url_key: str, ttl_seconds: int, **fields) -> ContentCacheEntry:
+        """写入缓存条目，已存在时覆盖内容并重置过期时间"""
+        now = TimeUtil.now_ms()
+        entry = db.query(ContentCacheEntry).filter(ContentCacheEntry.url_key == url_key).first()
+        if entry is None:
+            entry = ContentCacheEntry(url_key=url_key, hit_count=0)
+            db.add(entry)
+        for key, value in fields.items():
+            setattr(entry, key, value)
+        entry.created_at = now
+        entry.expires_at = now + ttl_seconds * 1000
+        db.commit()
+        return entry
+
+    def evict(self, db: Session, max_entries: int) -> int:
+        """删除过期条目，并在超出容量时按最近使用时间淘汰最旧的条目
+
+        Returns:
+            int: 删除的条目数
+        """
+        now = TimeUtil.now_ms()
+        removed = (
+            db.query(ContentCacheEntry)
+            .filter(ContentCacheEntry.expires_at <= now)
+            .delete(synchronize_session=False)
+        )
+
+        overflow = db.query(func.count(ContentCacheEntry.id)).scalar() - max_entries
+        if overflow > 0:
+            last_used = func.coalesce(ContentCacheEntry.last_hit_at, ContentCacheEntry.created_at)
+            stale_ids = [
+                row.id for row in
+                db.query(ContentCacheEntry.id).order_by(last_used.asc()).limit(overflow).all()
+            ]
+            removed += (
+                db.query(ContentCacheEntry)
+                .filter(ContentCacheEntry.id.in_(stale_ids))
+                .delete(synchronize_session=False)
+            )
+        db.commit()
+        return removed
+
+    def delete(self, db: Session, url_key: str) -> int:
+        """删除指定URL的缓存条目"""
+        removed = (
+            db.query(ContentCacheEntry)
+            .filter(ContentCacheEntry.url_key == url_key)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return removed
+
+    def clear(self, db: Session) -> int:
+        """清空缓存
+
+        Returns:
+            int: 删除的条目数
+        """
+        removed = db.query(ContentCacheEntry).delete(synchronize_session=False)
+        db.commit()
+        return removed
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """汇总缓存条目数、命中次数和内容大小"""
+        now = TimeUtil.now_ms()
+        row = db.query(
+            func.count(ContentCacheEntry.id).label("entries"),
+            func.sum(case((ContentCacheEntry.expires_at <= now, 1), else_=0)).label("expired"),
+            func.sum(ContentCacheEntry.hit_count).label("hits"),
+            func.sum(func.length(ContentCacheEntry.content)).label("size_chars"),
+        ).one()
+        return {
+            "entries": row.entries or 0,
+            "expired": row.expired or 0,
+            "stored_hits": row.hits or 0,
+            "size_chars": row.size_chars or 0,
+        }
+
+content_cache = ContentCacheCRUD()
@@ -0,0 +1,105 @@
+from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from models.llm_cache import LLMCacheEntry
+from utils.time_utils import TimeUtil
+
+class LLMCacheCRUD():
+    def get_valid(self, db: Session, cache_key: str) -> Optional[LLMCacheEntry]:
+        """获取未过期的缓存条目，命中时更新命中统计"""
+        now = TimeUtil.now_ms()
+        entry = (
+            db.query(LLMCacheEntry)
+            .filter(LLMCacheEntry.cache_key == cache_key, LLMCacheEntry.expires_at > now)
+            .first()
+        )
+        if entry:
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_hit_at = now
+            db.commit()
+        return entry
+
+    def upsert(self, db: Session, *, cache_key: str, ttl_seconds: int, **fields) -> LLMCacheEntry:
+        """写入缓存条目，已存在时覆盖内容并重置过期时间"""
+        now = TimeUtil.now_ms()
+        entry = db.query(LLMCacheEntry).filter(LLMCacheEntry.cache_key == cache_key).first()
+        if entry is None:
+            entry = LLMCacheEntry(cache_key=cache_key, hit_count=0)
+            db.add(entry)
+        for key, value in fields.items():
+            setattr(entry, key, value)
+        entry.created_at = now
+        entry.expires_at = now + ttl_seconds * 1000
+        db.commit()
+        return entry
+
+    def evict(self, db: Session, max_entries: int) -> int:
+        """删除过期条目，并在超出容量时按最近使用时间淘汰最旧的条目
+
+        Returns:
+            int: 删除的条目数
+        """
+        now = TimeUtil.now_ms()
+        removed = (
+            db.query(LLMCacheEntry)
+            .filter(LLMCacheEntry.expires_at <= now)
+            .delete(synchronize_session=False)
+        )
+
+        overflow = db.query(func.count(LLMCacheEntry.id)).scalar() - max_entries
+        if overflow > 0:
+            last_used = func.coalesce(LLMCacheEntry.last_hit_at, LLMCacheEntry.created_at)
+            stale_ids = [
+                row.id for row in
+                db.query(LLMCacheEntry.id).order_by(last_used.asc()).limit(overflow).all()
+            ]
+            removed += (
+                db.query(LLMCacheEntry)
+                .filter(LLMCacheEntry.id.in_(stale_ids))
+                .delete(synchronize_session=False)
+            )
+        db.commit()
+        return removed
+
+    def clear(self, db: Session, template_name: Optional[str] = None) -> int:
+        """清空缓存，可按模板清空
+
+        Returns:
+            int: 删除的条目数
+        """
+        query = db.query(LLMCacheEntry)
+        if template_name:
+            query = query.filter(LLMCacheEntry.template_name == template_name)
+        removed = query.delete(synchronize_session=False)
+        db.commit()
+        return removed
+
+    def get_stats(self, db: Session) -> List[Dict[str, Any]]:
+        """按模板汇总缓存条目数、命中次数和节省的token"""
+        now = TimeUtil.now_ms()
+        rows = (
+            db.query(
+                LLMCacheEntry.template_name.label("template_name"),
+                func.count(LLMCacheEntry.id).label("entries"),
+                func.sum(case((LLMCacheEntry.expires_at <= now, 1), else_=0)).label("expired"),
+                func.sum(LLMCacheEntry.hit_count).label("hits"),
+                func.sum(LLMCacheEntry.hit_count * LLMCacheEntry.tokens).label("tokens_saved"),
+                func.sum(func.length(LLMCacheEntry.response)).label("size_chars"),
+            )
+            .group_by(LLMCacheEntry.template_name)
+            .order_by(LLMCacheEntry.template_name)
+            .all()
+        )
+        return [
+            {
+                "template_name": row.template_name,
+                "entries": row.entries or 0,
+                "expired": row.expired or 0,
+                "hits": row.hits or 0,
+                "tokens_saved": row.tokens_saved or 0,
+                "size_chars": row.size_chars or 0,
+            }
+            for row in rows
+        ]
+
+llm_cache = LLMCacheCRUD()
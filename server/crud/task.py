@@ -18,6 +18,7 @@ class TaskCRUD():
             status=TaskStatus.PENDING.value,
             progress=TaskProgress.WAITING.value,  # 添加初始进度状态
             is_public=obj_in.is_public,
+            refresh_content=obj_in.refresh_content,
             created_by=user.id,
             user_id=user.id,
             created_at=TimeUtil.now_ms(),
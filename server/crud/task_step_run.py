@@ -0,0 +1,90 @@
+from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from models.task_step_run import TaskStepRun
+from models.enums import StepRunStatus
+
+class TaskStepRunCRUD():
+    # 允许的聚合维度
+    GROUP_BY_FIELDS = {
+        "step_type": TaskStepRun.step_type,
+        "step_name": TaskStepRun.step_name,
+        "provider": TaskStepRun.provider,
+        "level": TaskStepRun.level,
+    }
+
+    def create(self, db: Session, **fields) -> TaskStepRun:
+        """创建步骤执行记录"""
+        db_obj = TaskStepRun(**fields)
+        db.add(db_obj)
+        db.commit()
+        return db_obj
+
+    def get_by_task(self, db: Session, task_id: str) -> List[TaskStepRun]:
+        """获取任务的全部步骤执行记录，按执行顺序排列"""
+        return (
+            db.query(TaskStepRun)
+            .filter(TaskStepRun.task_id == task_id)
+            .order_by(TaskStepRun.id)
+            .all()
+        )
+
+    def get_stats(
+        self,
+        db: Session,
+        *,
+        group_by: str = "step_type",
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """按指定维度聚合步骤耗时、重试与用量"""
+        if group_by not in self.GROUP_BY_FIELDS:
+            raise ValueError(f"不支持的聚合维度: {group_by}")
+        key_column = self.GROUP_BY_FIELDS[group_by]
+
+        query = db.query(
+            key_column.label("key"),
+            func.count(TaskStepRun.id).label("runs"),
+            func.sum(case((TaskStepRun.status == StepRunStatus.FAILED.value, 1), else_=0)).label("failures"),
+            func.sum(case((TaskStepRun.status == StepRunStatus.SKIPPED.value, 1), else_=0)).label("skipped"),
+            func.sum(TaskStepRun.attempts).label("attempts"),
+            func.sum(TaskStepRun.duration_ms).label("total_duration_ms"),
+            func.avg(TaskStepRun.duration_ms).label("avg_duration_ms"),
+            func.max(TaskStepRun.duration_ms).label("max_duration_ms"),
+            func.sum(TaskStepRun.calls).label("calls"),
+            func.sum(TaskStepRun.tokens).label("tokens"),
+            func.sum(TaskStepRun.characters).label("characters"),
+        )
+        if start_date:
+            query = query.filter(TaskStepRun.started_at >= start_date)
+        if end_date:
+            query = query.filter(TaskStepRun.started_at <= end_date)
+
+        rows = (
+            query.group_by(key_column)
+            .order_by(func.sum(TaskStepRun.duration_ms).desc())
+            .all()
+        )
+
+        stats = []
+        for row in rows:
+            runs = row.runs or 0
+            executed = runs - (row.skipped or 0)
+            attempts = row.attempts or 0
+            stats.append({
+                "key": row.key,
+                "runs": runs,
+                "failures": row.failures or 0,
+                "skipped": row.skipped or 0,
+                "attempts": attempts,
+                "retries": max(attempts - executed, 0),
+                "total_duration_ms": row.total_duration_ms or 0,
+                "avg_duration_ms": float(row.avg_duration_ms or 0),
+                "max_duration_ms": row.max_duration_ms or 0,
+                "calls": row.calls or 0,
+                "tokens": row.tokens or 0,
+                "characters": row.characters or 0,
+            })
+        return stats
+
+task_step_run = TaskStepRunCRUD()
@@ -6,6 +6,10 @@ Base = declarative_base()
 from models.user import User
 from models.task import Task
 from models.rss import RSSFeed, RSSEntry
+from models.task_step_run import TaskStepRun
+from models.llm_cache import LLMCacheEntry
+from models.rate_limit import RateLimitBucket
+from models.content_cache import ContentCacheEntry
 
 # 确保所有模型都在这里导入，这样 alembic 才能检测到它们
-__all__ = ["Base", "User", "Task", "RSSFeed", "RSSEntry"]
\ No newline at end of file
+__all__ = ["Base", "User", "Task", "RSSFeed", "RSSEntry", "TaskStepRun", "LLMCacheEntry", "RateLimitBucket", "ContentCacheEntry"]
\ No newline at end of file
@@ -1,14 +1,16 @@
 import logging
 import os
 import configparser
+import time
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
 from alembic.config import Config
 from alembic import command
 
 from auth.utils import get_password_hash
 from core.config import settings
+from core.metrics import DB_COMMIT_DURATION
 from models.user import User
 
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{settings.DB_PATH}"
@@ -18,6 +20,18 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@event.listens_for(Session, "before_commit")
+def _before_commit(session):
+    """记录事务提交开始时间"""
+    session.info["commit_started_at"] = time.perf_counter()
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    """统计事务提交耗时"""
+    started_at = session.info.pop("commit_started_at", None)
+    if started_at is not None:
+        DB_COMMIT_DURATION.observe(time.perf_counter() - started_at)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -6,15 +6,19 @@ from contextlib import asynccontextmanager
 import logging
 import threading
 import os
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from core.exceptions import validation_exception_handler, general_exception_handler
 from core.config import config_manager
+from core import metrics
 from core.scheduler import setup_scheduler
+from services.task.batch_window import deferred_task_dispatcher
 from db.session import get_db, init_db
 from services.task.task_service import TaskService
 from api.v1.api import api_router
+from utils.prompt_utils import PromptUtils
 
 # 配置日志
 logging.basicConfig(
@@ -30,6 +34,10 @@ async def lifespan(app: FastAPI):
     # 启动时的操作
     init_db()
     
+    # 校验提示词模板，模板有误时直接启动失败
+    templates = PromptUtils.validate_templates()
+    logging.info(f"提示词模板校验通过，共 {len(templates)} 个")
+    
     # 确保任务目录存在
     os.makedirs(config_manager.TASK_DIR, exist_ok=True)
     
@@ -51,12 +59,17 @@ async def lifespan(app: FastAPI):
         scheduler = setup_scheduler()
         scheduler.start()
         
+        # 启动延后任务调度器
+        logging.info("正在启动延后任务调度器...")
+        deferred_task_dispatcher.start()
+        
         logging.info(f"服务器已启动 - 监听地址: {config_manager.HOST}:{config_manager.PORT}")
         yield
         
         # 关闭时的操作
         logging.info("正在关闭RSS调度器...")
         scheduler.shutdown()
+        deferred_task_dispatcher.shutdown()
         logging.info("服务器正在关闭...")
     finally:
         db.close()
@@ -76,6 +89,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 请求耗时统计
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """按路由模板统计HTTP请求耗时，避免路径参数造成标签膨胀"""
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        metrics.HTTP_REQUEST_DURATION.labels(
+            method=request.method,
+            route=_route_template(request),
+            status=str(status_code)
+        ).observe(time.perf_counter() - start)
+
+def _route_template(request: Request) -> str:
+    """返回路由匹配到的路径模板，未匹配路由(如404)时返回 unmatched"""
+    route = request.scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    # 定义在子路由器上的路由，其 path 不含 include_router 的前缀(路由器前缀均为固定路径)，
+    # 前缀即请求路径中该路由所匹配部分之前的内容
+    path = request.scope["path"]
+    regex = getattr(route, "path_regex", None)
+    if regex is not None and not regex.match(path):
+        for index, char in enumerate(path):
+            if char == "/" and regex.match(path[index:]):
+                return path[:index] + template
+    return template
+
 # 异常处理
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
@@ -83,6 +129,12 @@ app.add_exception_handler(Exception, general_exception_handler)
 # 包含API路由
 app.include_router(api_router, prefix="/api/v1")
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus 指标采集接口"""
+    content, content_type = metrics.render_metrics()
+    return Response(content=content, media_type=content_type)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to LingoPod API"}
\ No newline at end of file
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, BigInteger, Integer, Text
+from db.base import Base
+from utils.time_utils import TimeUtil
+
+
+class ContentCacheEntry(Base):
+    """网页正文缓存
+
+    以去除跟踪参数后的规范化URL为键，保存提取出的正文和标题，
+    不同用户、不同任务提交同一篇文章时直接复用，不再重复下载和解析。
+    """
+    __tablename__ = "content_cache_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url_key = Column(String, nullable=False, unique=True, index=True)  # 规范化URL的sha256
+    url = Column(String, nullable=False)  # 规范化URL
+    title = Column(String, nullable=True)  # 网页标题
+    content = Column(Text, nullable=False)  # 提取出的正文
+    hit_count = Column(Integer, nullable=False, default=0)  # 命中次数
+    created_at = Column(BigInteger, nullable=False, default=TimeUtil.now_ms)
+    last_hit_at = Column(BigInteger, nullable=True)  # 最近命中时间(毫秒时间戳)
+    expires_at = Column(BigInteger, nullable=False, index=True)  # 过期时间(毫秒时间戳)
+
+    def __repr__(self):
+        return f"<ContentCacheEntry(url={self.url}, hits={self.hit_count})>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, BigInteger, Integer, Text
+from db.base import Base
+from utils.time_utils import TimeUtil
+
+
+class LLMCacheEntry(Base):
+    """LLM响应缓存
+
+    以模板版本哈希、渲染输入、模型名称和温度计算缓存键，
+    相同输入的重复调用(任务重试、重跑、重复文章)直接返回缓存结果。
+    """
+    __tablename__ = "llm_cache_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String, nullable=False, unique=True, index=True)  # 缓存键(sha256)
+    template_name = Column(String, nullable=False, index=True)  # 提示词模板名称
+    template_version = Column(String, nullable=False)  # 提示词模板版本哈希
+    model = Column(String, nullable=False)  # 模型名称
+    temperature = Column(String, nullable=True)  # 采样温度
+    response = Column(Text, nullable=False)  # LLM原始响应内容
+    tokens = Column(Integer, nullable=False, default=0)  # 生成该响应消耗的token
+    hit_count = Column(Integer, nullable=False, default=0)  # 命中次数
+    created_at = Column(BigInteger, nullable=False, default=TimeUtil.now_ms)
+    last_hit_at = Column(BigInteger, nullable=True)  # 最近命中时间(毫秒时间戳)
+    expires_at = Column(BigInteger, nullable=False, index=True)  # 过期时间(毫秒时间戳)
+
+    def __repr__(self):
+        return f"<LLMCacheEntry(template={self.template_name}, model={self.model}, hits={self.hit_count})>"
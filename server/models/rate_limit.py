@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, BigInteger, Float
+from db.base import Base
+
+
+class RateLimitBucket(Base):
+    """跨进程共享的限流令牌桶状态
+
+    多个服务进程共用同一个数据库时，通过原子更新该表实现同一服务端点的全局限流。
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String, primary_key=True)  # 限流键，如 llm:requests:<base_url>:<model>
+    tokens = Column(Float, nullable=False)  # 当前可用令牌数
+    updated_at = Column(BigInteger, nullable=False)  # 上次补充令牌的时间(毫秒时间戳)
+    blocked_until = Column(BigInteger, nullable=False, default=0)  # 收到429后暂停到的时间(毫秒时间戳)
+
+    def __repr__(self):
+        return f"<RateLimitBucket(key={self.key}, tokens={self.tokens})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, BigInteger, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, BigInteger, UniqueConstraint, JSON
 from sqlalchemy.orm import relationship
 
 from db.base import Base
@@ -18,6 +18,21 @@ class RSSFeed(Base):
     fetch_interval = Column(Integer, default=900)  # 抓取间隔（秒）
     initial_entries_count = Column(Integer, default=2)  # 首次添加时处理的条目数
     update_entries_count = Column(Integer, default=1)  # 每次更新时处理的条目数
+    use_embedded_content = Column(Boolean, nullable=False, default=True)  # 是否使用源内嵌的正文代替抓取网页
+    entry_filters = Column(JSON, nullable=True)  # 条目过滤规则，不满足的条目只记录不创建任务
+    defer_to_batch_window = Column(Boolean, nullable=False, default=False)  # 新条目的任务是否延后到批处理时段执行
+    etag = Column(String, nullable=True)  # 上次响应的ETag，用于条件请求
+    last_modified = Column(String, nullable=True)  # 上次响应的Last-Modified，用于条件请求
+    content_hash = Column(String, nullable=True)  # 上次处理的内容哈希，服务端忽略条件请求时用于判断是否变化
+    poll_interval = Column(Integer, nullable=True)  # 根据发布频率和ttl/Cache-Control计算的实际抓取间隔（秒）
+    next_fetch_at = Column(BigInteger, nullable=True, index=True)  # 下次抓取时间（毫秒时间戳），为空时立即抓取
+    hub_url = Column(String, nullable=True)  # 源声明的WebSub hub地址
+    websub_topic = Column(String, nullable=True)  # WebSub订阅的topic(源的self链接)
+    websub_secret = Column(String, nullable=True)  # WebSub推送签名密钥，已发起订阅时设置
+    websub_lease_expires_at = Column(BigInteger, nullable=True)  # WebSub订阅到期时间（毫秒时间戳），hub验证订阅后设置
+    websub_pending_mode = Column(String, nullable=True)  # 已发起、等待hub验证的订阅请求类型
+    websub_pending_topic = Column(String, nullable=True)  # 等待hub验证的订阅topic
+    websub_pending_expires_at = Column(BigInteger, nullable=True)  # 等待hub验证的截止时间（毫秒时间戳），之后的验证请求不再接受
     created_at = Column(BigInteger, nullable=False, default=TimeUtil.now_ms)
     updated_at = Column(BigInteger, nullable=False, default=TimeUtil.now_ms, onupdate=TimeUtil.now_ms)
     
@@ -38,6 +53,8 @@ class RSSEntry(Base):
     title = Column(String)
     link = Column(String)
     published = Column(BigInteger)  # 毫秒时间戳
+    content = Column(Text, nullable=True)  # 源内嵌的正文(纯文本)，足够长时任务直接使用，不再抓取网页
+    skip_reason = Column(String, nullable=True)  # 被源的过滤规则跳过的原因，跳过的条目不创建任务
     processed = Column(Boolean, default=False)
     task_id = Column(String, ForeignKey("tasks.taskId", ondelete="CASCADE"))
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -43,6 +43,9 @@ class Task(Base):
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # 所属用户ID
     is_public = Column(Boolean, nullable=False, default=False)  # 是否公开
+    refresh_content = Column(Boolean, nullable=False, default=False)  # 跳过网页正文缓存，重新抓取
+    dedupe_key = Column(String, nullable=True, index=True)  # 规范化URL与风格参数的哈希，用于复用相同任务的结果
+    deferred_until = Column(BigInteger, nullable=True, index=True)  # 延后到批处理时段的任务最晚开始时间(毫秒时间戳)，为空时不延后
     created_by = Column(Integer, nullable=False)  # 创建者ID
     updated_by = Column(Integer, nullable=True)  # 更新者ID
     created_at = Column(BigInteger, nullable=False, default=TimeUtil.now_ms)  # 创建时间(毫秒时间戳)
@@ -69,6 +72,12 @@ class Task(Base):
         uselist=False
     )
     rss_entries = relationship("RSSEntry", back_populates="task")
+    step_runs = relationship(
+        "TaskStepRun",
+        back_populates="task",
+        cascade="all, delete-orphan",
+        order_by="TaskStepRun.id"
+    )
 
     @validates('url')
     def validate_url(self, key, url):
@@ -119,7 +128,8 @@ class Task(Base):
             "total_steps": self.total_steps,
             "step_progress": self.step_progress,
             "error": self.error,
-            "progress_message": self.progress_message
+            "progress_message": self.progress_message,
+            "deferred_until": self.deferred_until
         }
 
     def __repr__(self):
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, BigInteger, Integer, ForeignKey
+from sqlalchemy.orm import relationship
+from db.base import Base
+from utils.time_utils import TimeUtil
+
+
+class TaskStepRun(Base):
+    """任务步骤执行记录
+    
+    每个步骤执行结束（成功、失败或跳过）后写入一条记录，
+    包含起止时间、尝试次数、服务提供方以及token/字符用量，用于分析任务耗时分布。
+    """
+    __tablename__ = "task_step_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(String, ForeignKey("tasks.taskId", ondelete="CASCADE"), nullable=False, index=True)
+    step_index = Column(Integer, nullable=False)  # 步骤序号
+    step_name = Column(String, nullable=False)  # 步骤名称
+    step_type = Column(String, nullable=False)  # 步骤类名，如 ContentStep
+    level = Column(String, nullable=True)  # 难度等级
+    lang = Column(String, nullable=True)  # 语言
+    status = Column(String, nullable=False)  # 执行结果：completed/failed/skipped
+    attempts = Column(Integer, nullable=False, default=0)  # 实际执行次数(含重试)
+    started_at = Column(BigInteger, nullable=False)  # 开始时间(毫秒时间戳)
+    finished_at = Column(BigInteger, nullable=True)  # 结束时间(毫秒时间戳)
+    duration_ms = Column(Integer, nullable=True)  # 耗时(毫秒)
+    provider = Column(String, nullable=True)  # 服务提供方，如模型名称或TTS引擎
+    calls = Column(Integer, nullable=False, default=0)  # 外部服务调用次数
+    tokens = Column(Integer, nullable=False, default=0)  # LLM token 用量
+    characters = Column(Integer, nullable=False, default=0)  # 处理的字符数(如TTS合成文本)
+    error_class = Column(String, nullable=True)  # 失败时的异常类名
+    error_message = Column(String, nullable=True)  # 失败时的错误信息
+    created_at = Column(BigInteger, nullable=False, default=TimeUtil.now_ms)
+
+    task = relationship("Task", back_populates="step_runs")
+
+    def __repr__(self):
+        return f"<TaskStepRun(task_id={self.task_id}, step={self.step_name}, status={self.status})>"
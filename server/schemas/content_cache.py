@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+class ContentCacheStatsResponse(BaseModel):
+    enabled: bool
+    ttl_seconds: int
+    max_entries: int
+    hits: int = Field(..., description="进程启动以来的命中次数")
+    misses: int = Field(..., description="进程启动以来的未命中次数")
+    errors: int = Field(..., description="缓存读写失败次数")
+    hit_rate: float
+    entries: int = Field(..., description="缓存条目数")
+    expired: int = Field(..., description="已过期但尚未清理的条目数")
+    stored_hits: int = Field(..., description="现存条目的累计命中次数")
+    size_chars: int = Field(..., description="缓存正文总字符数")
+
+class ContentCacheClearResponse(BaseModel):
+    removed: int
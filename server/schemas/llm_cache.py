@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+# 按模板汇总的LLM缓存统计
+class LLMCacheTemplateStats(BaseModel):
+    template_name: str
+    entries: int = Field(..., description="缓存条目数")
+    expired: int = Field(..., description="已过期但尚未清理的条目数")
+    hits: int = Field(..., description="累计命中次数")
+    tokens_saved: int = Field(..., description="命中节省的token数")
+    size_chars: int = Field(..., description="缓存内容总字符数")
+
+class LLMCacheStatsResponse(BaseModel):
+    enabled: bool
+    ttl_seconds: int
+    max_entries: int
+    disabled_templates: List[str]
+    hits: int = Field(..., description="进程启动以来的命中次数")
+    misses: int = Field(..., description="进程启动以来的未命中次数")
+    errors: int = Field(..., description="缓存读写失败次数")
+    hit_rate: float
+    items: List[LLMCacheTemplateStats]
+
+class LLMCacheClearResponse(BaseModel):
+    removed: int
@@ -1,7 +1,42 @@
-from typing import Optional
-from pydantic import BaseModel, HttpUrl, Field, model_validator
+import re
+from typing import List, Optional
+from pydantic import BaseModel, HttpUrl, Field, field_validator, model_validator
 from core.config import settings
 
+class RSSEntryFilters(BaseModel):
+    """RSS条目过滤规则，满足全部规则的条目才创建任务"""
+    include_keywords: List[str] = Field(
+        default_factory=list,
+        description="标题或正文须包含其中任一关键词（不区分大小写）"
+    )
+    exclude_keywords: List[str] = Field(
+        default_factory=list,
+        description="标题或正文包含其中任一关键词时跳过（不区分大小写）"
+    )
+    categories: List[str] = Field(
+        default_factory=list,
+        description="条目分类须匹配其中之一（不区分大小写）"
+    )
+    title_pattern: Optional[str] = Field(
+        default=None,
+        description="标题须匹配的正则表达式"
+    )
+    min_content_length: Optional[int] = Field(
+        default=None,
+        description="内嵌正文或摘要的最小长度（字符）",
+        ge=0
+    )
+
+    @field_validator('title_pattern')
+    @classmethod
+    def validate_title_pattern(cls, value):
+        if value is not None:
+            try:
+                re.compile(value)
+            except re.error as e:
+                raise ValueError(f"无效的正则表达式: {e}")
+        return value
+
 class RSSFeedBase(BaseModel):
     """RSS源基础模型"""
     url: HttpUrl
@@ -25,6 +60,18 @@ class RSSFeedBase(BaseModel):
         description="后续更新的条目数量",
         ge=1
     )
+    use_embedded_content: bool = Field(
+        default=True,
+        description="源内嵌了足够长的正文时直接使用，不再抓取网页"
+    )
+    entry_filters: Optional[RSSEntryFilters] = Field(
+        default=None,
+        description="条目过滤规则，不满足的条目不创建任务"
+    )
+    defer_to_batch_window: bool = Field(
+        default=False,
+        description="新条目的任务是否延后到批处理时段执行"
+    )
 
     @model_validator(mode='before')
     @classmethod
@@ -66,6 +113,22 @@ class RSSFeedUpdate(BaseModel):
         description="后续更新的条目数量",
         ge=1
     )
+    use_embedded_content: bool = Field(
+        default=True,
+        description="源内嵌了足够长的正文时直接使用，不再抓取网页"
+    )
+    entry_filters: Optional[RSSEntryFilters] = Field(
+        default=None,
+        description="条目过滤规则，不满足的条目不创建任务"
+    )
+    defer_to_batch_window: bool = Field(
+        default=False,
+        description="新条目的任务是否延后到批处理时段执行"
+    )
+    is_active: Optional[bool] = Field(
+        default=None,
+        description="是否启用，连续失败自动暂停的源可以通过设为true恢复"
+    )
 
 class RSSFeedList(RSSFeedBase):
     """RSS源列表响应模型"""
@@ -75,6 +138,10 @@ class RSSFeedList(RSSFeedBase):
     last_fetch: Optional[int] = None
     is_active: bool
     error_count: int
+    poll_interval: Optional[int] = None
+    next_fetch_at: Optional[int] = None
+    hub_url: Optional[str] = None
+    websub_lease_expires_at: Optional[int] = None
     created_at: int
     updated_at: int
 
@@ -97,6 +164,7 @@ class RSSEntryResponse(RSSEntryBase):
     id: int
     feed_id: int
     processed: bool
+    skip_reason: Optional[str] = None
     task_id: Optional[str] = None
     created_at: int
     updated_at: int
@@ -49,6 +49,7 @@ class LanguageFiles(BaseModel):
 # 创建任务时的请求模型
 class TaskCreate(TaskBase):
     is_public: bool = Field(default=False, description="是否公开")
+    refresh_content: bool = Field(default=False, description="跳过网页正文缓存，强制重新抓取")
     style_params: Optional[StyleParams] = Field(
         default_factory=StyleParams,
         description="对话风格参数"
@@ -112,3 +113,50 @@ class TaskQueryParams(BaseModel):
 class TaskListResponse(BaseModel):
     total: int
     items: List[TaskResponse]
+
+# 步骤执行记录响应模型
+class TaskStepRunResponse(BaseModel):
+    """步骤执行记录"""
+    model_config = ConfigDict(from_attributes=True)
+
+    step_index: int
+    step_name: str
+    step_type: str
+    level: Optional[str] = None
+    lang: Optional[str] = None
+    status: str
+    attempts: int
+    started_at: int
+    finished_at: Optional[int] = None
+    duration_ms: Optional[int] = None
+    provider: Optional[str] = None
+    calls: int = 0
+    tokens: int = 0
+    characters: int = 0
+    error_class: Optional[str] = None
+    error_message: Optional[str] = None
+
+# 任务时间线响应模型
+class TaskTimelineResponse(BaseModel):
+    taskId: str
+    total_duration_ms: int = Field(0, description="所有步骤耗时之和(毫秒)")
+    items: List[TaskStepRunResponse]
+
+# 步骤耗时聚合统计
+class StepStatsItem(BaseModel):
+    key: Optional[str] = Field(None, description="聚合维度取值")
+    runs: int
+    failures: int
+    skipped: int
+    attempts: int
+    retries: int
+    total_duration_ms: int
+    avg_duration_ms: float
+    max_duration_ms: int
+    calls: int
+    tokens: int
+    characters: int
+
+class StepStatsResponse(BaseModel):
+    group_by: str
+    items: List[StepStatsItem]
@@ -0,0 +1,145 @@
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from core.config import settings
+from core.logging import log
+from services.edgetts import EdgeTTSService
+
+
+class ClientPool:
+    """进程级LLM/TTS客户端池
+
+    所有步骤共享同一组客户端及其HTTP连接池，复用keep-alive连接。
+    每次获取客户端时比较相关配置的签名，配置变更(如通过
+    ConfigManager.update_config 修改 API_BASE_URL、MODEL 或 TTS_*)后
+    自动重建对应客户端。旧客户端不主动关闭，正在进行的请求可以正常完成。
+    客户端关闭SDK内置的重试(max_retries=0)，429及 Retry-After 统一由限流器处理。
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    LLM_CONFIG_KEYS = ("API_BASE_URL", "API_KEY", "MODEL")
+    LLM_SLOTS_CONFIG_KEYS = ("LLM_MAX_CONCURRENCY", "MAX_TASK_WORKERS")
+    TTS_CONFIG_KEYS = ("TTS_BASE_URL", "TTS_API_KEY")
+    POOL_CONFIG_KEYS = (
+        "CLIENT_POOL_MAX_CONNECTIONS",
+        "CLIENT_POOL_MAX_KEEPALIVE",
+        "CLIENT_POOL_KEEPALIVE_EXPIRY",
+        "CLIENT_POOL_TIMEOUT",
+    )
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+            return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            self._build_lock = threading.Lock()
+            # name -> (配置签名, 客户端)
+            self._clients: Dict[str, Tuple[Tuple, Any]] = {}
+            self.initialized = True
+
+    @classmethod
+    def get_instance(cls) -> 'ClientPool':
+        """获取客户端池实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def get_chat_model(self) -> ChatOpenAI:
+        """获取共享的LLM客户端"""
+        return self._get_or_build("llm", self.LLM_CONFIG_KEYS, self._build_chat_model)
+
+    def get_llm_slots(self) -> threading.BoundedSemaphore:
+        """获取进程内LLM请求并发信号量，所有任务和步骤共享"""
+        return self._get_or_build("llm_slots", self.LLM_SLOTS_CONFIG_KEYS, self._build_llm_slots)
+
+    def get_openai_tts(self) -> OpenAI:
+        """获取共享的OpenAI TTS客户端"""
+        return self._get_or_build("openai_tts", self.TTS_CONFIG_KEYS, self._build_openai_tts)
+
+    def get_async_openai_tts(self) -> AsyncOpenAI:
+        """获取共享的异步OpenAI TTS客户端"""
+        return self._get_or_build("async_openai_tts", self.TTS_CONFIG_KEYS, self._build_async_openai_tts)
+
+    def get_edge_tts(self) -> EdgeTTSService:
+        """获取共享的Edge TTS服务(代理配置在每次请求时读取)"""
+        return self._get_or_build("edge_tts", (), EdgeTTSService)
+
+    def reset(self):
+        """丢弃所有已创建的客户端，下次获取时重新创建"""
+        with self._build_lock:
+            self._clients.clear()
+
+    def _get_or_build(self, name: str, config_keys: Tuple[str, ...], factory: Callable[[], Any]) -> Any:
+        """按配置签名获取客户端，签名变化时重建"""
+        signature = tuple(getattr(settings, key) for key in config_keys + self.POOL_CONFIG_KEYS)
+        cached = self._clients.get(name)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with self._build_lock:
+            cached = self._clients.get(name)
+            if cached and cached[0] == signature:
+                return cached[1]
+            if cached:
+                log.info(f"检测到配置变更，重建客户端: {name}")
+            client = factory()
+            self._clients[name] = (signature, client)
+            return client
+
+    def _build_http_client(self) -> httpx.Client:
+        """创建带连接池限制和keep-alive的HTTP客户端"""
+        return httpx.Client(limits=self._limits(), timeout=settings.CLIENT_POOL_TIMEOUT)
+
+    def _build_async_http_client(self) -> httpx.AsyncClient:
+        """创建异步HTTP客户端，供事件循环中的协程使用"""
+        return httpx.AsyncClient(limits=self._limits(), timeout=settings.CLIENT_POOL_TIMEOUT)
+
+    @staticmethod
+    def _limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.CLIENT_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CLIENT_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.CLIENT_POOL_KEEPALIVE_EXPIRY,
+        )
+
+    def _build_chat_model(self) -> ChatOpenAI:
+        return ChatOpenAI(
+            model_name=settings.MODEL,
+            openai_api_key=settings.API_KEY,
+            openai_api_base=settings.API_BASE_URL,
+            http_client=self._build_http_client(),
+            http_async_client=self._build_async_http_client(),
+            max_retries=0
+        )
+
+    @staticmethod
+    def llm_concurrency() -> int:
+        """进程内LLM请求并发上限，LLM_MAX_CONCURRENCY 为0时与任务线程数一致"""
+        return settings.LLM_MAX_CONCURRENCY or settings.MAX_TASK_WORKERS
+
+    def _build_llm_slots(self) -> threading.BoundedSemaphore:
+        return threading.BoundedSemaphore(self.llm_concurrency())
+
+    def _build_openai_tts(self) -> OpenAI:
+        return OpenAI(
+            base_url=settings.TTS_BASE_URL,
+            api_key=settings.TTS_API_KEY,
+            http_client=self._build_http_client(),
+            max_retries=0
+        )
+
+    def _build_async_openai_tts(self) -> AsyncOpenAI:
+        return AsyncOpenAI(
+            base_url=settings.TTS_BASE_URL,
+            api_key=settings.TTS_API_KEY,
+            http_client=self._build_async_http_client(),
+            max_retries=0
+        )
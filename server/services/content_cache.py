@@ -0,0 +1,134 @@
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy.orm import Session
+
+from core import metrics
+from core.config import settings
+from core.logging import log
+from crud.content_cache import content_cache as content_cache_crud
+from db.session import SessionLocal
+
+# 不影响页面内容的跟踪参数
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "ref_src", "spm", "share_source", "share_medium",
+}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """规范化URL：协议和域名转小写、去掉默认端口、片段和跟踪参数，其余查询参数排序"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class ContentCache:
+    """基于SQLite的网页正文缓存
+
+    以规范化URL为键保存提取出的正文和标题，按有效期和条目数淘汰。
+    缓存读写失败只记录日志，不影响页面抓取。
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    @staticmethod
+    def build_key(url: str) -> str:
+        """计算缓存键"""
+        return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """查询缓存，返回 (正文内容, 标题)，未命中或出错时返回None"""
+        if not settings.CONTENT_CACHE_ENABLED:
+            return None
+
+        db = self.session_factory()
+        try:
+            entry = content_cache_crud.get_valid(db, self.build_key(url))
+            cached = (entry.content, entry.title) if entry else None
+        except Exception as e:
+            db.rollback()
+            self._count("_errors")
+            log.warning(f"读取网页正文缓存失败: {url}, error: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+        if cached is None:
+            self._count("_misses")
+            metrics.CONTENT_CACHE_REQUESTS.labels(result="miss").inc()
+        else:
+            self._count("_hits")
+            metrics.CONTENT_CACHE_REQUESTS.labels(result="hit").inc()
+            log.info(f"使用缓存的网页正文: {url}")
+        return cached
+
+    def set(self, url: str, content: str, title: Optional[str]):
+        """写入缓存并执行过期与容量淘汰"""
+        if not settings.CONTENT_CACHE_ENABLED:
+            return
+
+        db = self.session_factory()
+        try:
+            content_cache_crud.upsert(
+                db,
+                url_key=self.build_key(url),
+                ttl_seconds=settings.CONTENT_CACHE_TTL_SECONDS,
+                url=canonicalize_url(url),
+                content=content,
+                title=title
+            )
+            content_cache_crud.evict(db, settings.CONTENT_CACHE_MAX_ENTRIES)
+        except Exception as e:
+            db.rollback()
+            self._count("_errors")
+            log.warning(f"写入网页正文缓存失败: {url}, error: {str(e)}")
+        finally:
+            db.close()
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """获取缓存配置、进程内命中统计以及持久化统计"""
+        with self._lock:
+            hits, misses, errors = self._hits, self._misses, self._errors
+        lookups = hits + misses
+        return {
+            "enabled": bool(settings.CONTENT_CACHE_ENABLED),
+            "ttl_seconds": settings.CONTENT_CACHE_TTL_SECONDS,
+            "max_entries": settings.CONTENT_CACHE_MAX_ENTRIES,
+            "hits": hits,
+            "misses": misses,
+            "errors": errors,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            **content_cache_crud.get_stats(db),
+        }
+
+    def clear(self, db: Session, url: Optional[str] = None) -> int:
+        """清空缓存，提供URL时只删除该URL的缓存"""
+        if url:
+            return content_cache_crud.delete(db, self.build_key(url))
+        return content_cache_crud.clear(db)
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+content_cache = ContentCache()
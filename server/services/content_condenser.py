@@ -0,0 +1,178 @@
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from core.config import settings
+from core.logging import log
+from services.client_pool import ClientPool
+from services.llm import LLMService
+from utils.token_utils import TokenUtil
+
+# 段落与句子的切分规则
+_PARAGRAPH_PATTERN = re.compile(r'\n\s*\n|\n')
+_SENTENCE_PATTERN = re.compile(r'(?<=[.!?。！？；;])\s*')
+
+
+class ContentCondenser:
+    """长文本 map-reduce 精简
+
+    文本token数不超过预算时原样返回；超出时按段落切分为若干片段，
+    并发提炼每个片段(map)，再将提炼结果整合为一篇覆盖全文的精简文章(reduce)。
+    提炼结果仍超出预算时对其再次执行 map，最多 MAX_ROUNDS 轮。
+    """
+    MAP_TEMPLATE = "content_chunk_condense"
+    REDUCE_TEMPLATE = "content_condense_reduce"
+    MAX_ROUNDS = 3
+    WORDS_PER_TOKEN = 0.75
+
+    def __init__(self, llm_service: Optional[LLMService] = None):
+        self.llm_service = llm_service or LLMService()
+
+    def condense(self, text: str, budget: Optional[int] = None, step=None) -> str:
+        """将文本精简到token预算以内
+
+        Args:
+            text: 原始文本
+            budget: token预算，默认为 LONG_TEXT_TOKEN_BUDGET
+            step: 可选的步骤对象，用于记录调用用量
+
+        Returns:
+            str: 原文或精简后的文本
+        """
+        budget = budget or settings.LONG_TEXT_TOKEN_BUDGET
+        if not self._needs_condense(text, budget):
+            return text
+
+        current, summaries = text, []
+        for round_index in range(1, self.MAX_ROUNDS + 1):
+            chunks = self.split_chunks(current, settings.LONG_TEXT_CHUNK_TOKENS)
+            summaries = self._map(chunks, budget, step)
+            current = "\n\n".join(summaries)
+            if self._round_done(round_index, chunks, current, budget):
+                break
+
+        if len(summaries) > 1:
+            current = self.llm_service.invoke(
+                self.REDUCE_TEMPLATE, self._reduce_inputs(current, budget),
+                step=step, validate=self._validate_text
+            ).strip()
+        return current
+
+    async def acondense(self, text: str, budget: Optional[int] = None, step=None) -> str:
+        """condense 的协程版本，各片段以协程并发提炼"""
+        budget = budget or settings.LONG_TEXT_TOKEN_BUDGET
+        if not self._needs_condense(text, budget):
+            return text
+
+        current, summaries = text, []
+        for round_index in range(1, self.MAX_ROUNDS + 1):
+            chunks = self.split_chunks(current, settings.LONG_TEXT_CHUNK_TOKENS)
+            target_words = self._target_words(budget // len(chunks))
+            summaries = await asyncio.gather(*(
+                self.llm_service.ainvoke(
+                    self.MAP_TEMPLATE, self._map_inputs(index, chunks, target_words),
+                    step=step, validate=self._validate_text
+                )
+                for index in range(len(chunks))
+            ))
+            summaries = [summary.strip() for summary in summaries]
+            current = "\n\n".join(summaries)
+            if self._round_done(round_index, chunks, current, budget):
+                break
+
+        if len(summaries) > 1:
+            current = (await self.llm_service.ainvoke(
+                self.REDUCE_TEMPLATE, self._reduce_inputs(current, budget),
+                step=step, validate=self._validate_text
+            )).strip()
+        return current
+
+    def _needs_condense(self, text: str, budget: int) -> bool:
+        tokens = TokenUtil.count(text)
+        if tokens <= budget:
+            return False
+        log.info(f"文本约 {tokens} tokens，超出预算 {budget}，开始分段精简")
+        return True
+
+    def _round_done(self, round_index: int, chunks: List[str], current: str, budget: int) -> bool:
+        """一轮提炼后结果已在预算以内，或已无法继续拆分"""
+        tokens = TokenUtil.count(current)
+        log.info(f"第{round_index}轮精简: {len(chunks)} 个片段，结果约 {tokens} tokens")
+        return tokens <= budget or len(chunks) == 1
+
+    def _map_inputs(self, index: int, chunks: List[str], target_words: int) -> Dict:
+        return {
+            "content": chunks[index],
+            "chunk_index": index + 1,
+            "chunk_total": len(chunks),
+            "target_words": target_words
+        }
+
+    def _reduce_inputs(self, content: str, budget: int) -> Dict:
+        return {
+            "content": content,
+            "target_words": self._target_words(budget)
+        }
+
+    def split_chunks(self, text: str, chunk_tokens: int) -> List[str]:
+        """按段落(必要时按句子)切分文本，每个片段不超过 chunk_tokens"""
+        units = []
+        for paragraph in _PARAGRAPH_PATTERN.split(text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if TokenUtil.count(paragraph) <= chunk_tokens:
+                units.append(paragraph)
+            else:
+                units.extend(self._split_long_paragraph(paragraph, chunk_tokens))
+
+        separator = "\n\n"
+        separator_tokens = TokenUtil.count(separator)
+        chunks, current, current_tokens = [], [], 0
+        for unit in units:
+            unit_tokens = TokenUtil.count(unit) + separator_tokens
+            if current and current_tokens + unit_tokens > chunk_tokens:
+                chunks.append(separator.join(current))
+                current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += unit_tokens
+        if current:
+            chunks.append(separator.join(current))
+        return chunks
+
+    def _split_long_paragraph(self, paragraph: str, chunk_tokens: int) -> List[str]:
+        """超长段落按句子切分，单句仍超长时按字符硬切"""
+        pieces = []
+        for sentence in _SENTENCE_PATTERN.split(paragraph):
+            if not sentence:
+                continue
+            sentence_tokens = TokenUtil.count(sentence)
+            if sentence_tokens <= chunk_tokens:
+                pieces.append(sentence)
+                continue
+            size = max(1, len(sentence) * chunk_tokens // sentence_tokens)
+            pieces.extend(sentence[i:i + size] for i in range(0, len(sentence), size))
+        return pieces
+
+    def _map(self, chunks: List[str], budget: int, step) -> List[str]:
+        """并发提炼各片段，结果保持原始顺序"""
+        target_words = self._target_words(budget // len(chunks))
+        max_workers = max(1, min(ClientPool.llm_concurrency(), len(chunks)))
+
+        def condense_chunk(index: int) -> str:
+            return self.llm_service.invoke(
+                self.MAP_TEMPLATE, self._map_inputs(index, chunks, target_words),
+                step=step, validate=self._validate_text
+            ).strip()
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='condense') as executor:
+            return list(executor.map(condense_chunk, range(len(chunks))))
+
+    def _target_words(self, tokens: int) -> int:
+        return max(50, int(tokens * self.WORDS_PER_TOKEN))
+
+    @staticmethod
+    def _validate_text(result) -> None:
+        if not isinstance(result, str) or not result.strip():
+            raise ValueError("精简结果为空")
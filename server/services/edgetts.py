@@ -24,6 +24,10 @@ class EdgeTTSService:
         """生成语音文件"""
         return asyncio.run(self._generate_audio(text, voice, response_format, speed))
 
+    async def agenerate_speech(self, text: str, voice: str, response_format: str = "mp3", speed: float = 1.0) -> str:
+        """生成语音文件（协程版本，在调用方的事件循环中执行）"""
+        return await self._generate_audio(text, voice, response_format, speed)
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def _generate_audio(self, text: str, voice: str, response_format: str, speed: float) -> str:
         """生成音频文件，失败时最多重试3次"""
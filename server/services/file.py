@@ -79,6 +79,24 @@ class FileService:
             shutil.rmtree(task_dir)
             log.info(f"已删除任务文件夹: {task_dir}")
 
+    @staticmethod
+    def link_file(src_path: str, dst_path: str):
+        """以硬链接共享文件，文件系统不支持硬链接时复制
+        
+        Args:
+            src_path: 源文件路径
+            dst_path: 目标文件路径，已存在时覆盖
+        """
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        try:
+            os.link(src_path, dst_path)
+        except OSError:
+            if not os.path.exists(src_path):
+                raise
+            shutil.copy2(src_path, dst_path)
+
     @staticmethod
     def update_task_files(task_id: str, level: str, lang: str, file_type: str) -> str:
         """更新任务文件结构并返回生成的文件名
@@ -133,6 +151,10 @@ class FileService:
         # 确保目录存在
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
+        # 文件可能是与其他任务共享的硬链接，先删除再写入，避免修改对方的内容
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        
         # 写入文件
         mode = 'wb' if isinstance(content, bytes) else 'w'
         encoding = None if isinstance(content, bytes) else 'utf-8'
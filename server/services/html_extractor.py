@@ -0,0 +1,279 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Type
+
+from bs4 import BeautifulSoup
+from core.config import settings
+from core.logging import log
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    # 未安装 lxml 时只能使用 BeautifulSoup 提取
+    etree = lxml_html = None
+
+# 提取前移除的标签
+REMOVED_TAGS = ('script', 'style', 'noscript', 'iframe', 'nav', 'footer', 'aside')
+# 作为段落参与打分的标签，以及不含块级子元素时视作段落的 div
+PARAGRAPH_TAGS = {'p', 'pre', 'td', 'blockquote'}
+BLOCK_TAGS = {'p', 'pre', 'div', 'table', 'ul', 'ol', 'dl', 'blockquote', 'section', 'article', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+# 根据 class/id 判断节点是否可能为正文
+_UNLIKELY = re.compile(
+    r'comment|footer|sidebar|side-bar|menu|share|social|related|recommend|promo|advert|\bad\b|'
+    r'banner|breadcrumb|cookie|subscribe|newsletter|popup|modal|masthead|pagination', re.I
+)
+_POSITIVE = re.compile(r'article|body|content|entry|main|post|story|text|blog', re.I)
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>', re.I)
+# 计入段落得分的最短文本长度
+MIN_PARAGRAPH_LENGTH = 25
+_TAG_WEIGHTS = {
+    'article': 10, 'main': 10, 'div': 5, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+    'ol': -3, 'ul': -3, 'form': -3, 'li': -3, 'th': -5, 'h1': -5, 'h2': -5, 'h3': -5, 'header': -5
+}
+
+
+def clean_content(content: str) -> str:
+    """
+    清理和格式化内容
+
+    Args:
+        content: 原始内容文本
+
+    Returns:
+        str: 清理后的内容
+    """
+    # 分行处理
+    lines = content.split('\n')
+
+    # 清理每一行
+    cleaned_lines = []
+    for line in lines:
+        line = line.strip()
+        # 跳过空行和太短的行
+        if line and len(line) > 2:
+            cleaned_lines.append(line)
+
+    # 合并行
+    cleaned_content = '\n'.join(cleaned_lines)
+
+    # 删除多余的空白字符
+    cleaned_content = ' '.join(cleaned_content.split())
+
+    return cleaned_content
+
+
+class HTMLExtractor(ABC):
+    """正文提取器基类，子类通过 register_extractor 注册后可由 HTML_EXTRACTOR 配置选用"""
+    name: str = None
+
+    @classmethod
+    def available(cls) -> bool:
+        """提取器依赖的解析库是否已安装"""
+        return True
+
+    @abstractmethod
+    def extract(self, html: str) -> Tuple[str, Optional[str]]:
+        """
+        从HTML中提取正文内容和标题
+
+        Args:
+            html: 网页HTML
+
+        Returns:
+            Tuple[str, Optional[str]]: (正文内容, 标题)，未找到正文时内容为空字符串
+        """
+        pass
+
+
+_EXTRACTORS: Dict[str, Type[HTMLExtractor]] = {}
+_instances: Dict[str, HTMLExtractor] = {}
+
+
+def register_extractor(cls: Type[HTMLExtractor]) -> Type[HTMLExtractor]:
+    """注册正文提取器"""
+    _EXTRACTORS[cls.name] = cls
+    return cls
+
+
+def get_extractor(name: Optional[str] = None) -> HTMLExtractor:
+    """
+    获取正文提取器
+
+    Args:
+        name: 提取器名称，默认使用 HTML_EXTRACTOR 配置；未知或依赖缺失时回退到 bs4
+    """
+    name = name or settings.HTML_EXTRACTOR
+    cls = _EXTRACTORS.get(name)
+    if cls is None or not cls.available():
+        log.warning(f"正文提取器 {name} 不可用，使用 {SoupExtractor.name}")
+        cls = SoupExtractor
+
+    if cls.name not in _instances:
+        _instances[cls.name] = cls()
+    return _instances[cls.name]
+
+
+@register_extractor
+class SoupExtractor(HTMLExtractor):
+    """基于 BeautifulSoup html.parser 的提取器，按 article/main/内容类 div 的顺序查找正文"""
+    name = 'bs4'
+
+    def extract(self, html: str) -> Tuple[str, Optional[str]]:
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # 移除不需要的标签
+        for tag in soup(['script', 'style', 'nav', 'footer', 'iframe']):
+            tag.decompose()
+
+        # 获取标题
+        title = None
+        title_tag = soup.find('title')
+        if title_tag:
+            title = title_tag.get_text().strip()
+
+        # 获取正文内容
+        # 首先尝试获取文章主体
+        article = soup.find('article')
+        if not article:
+            article = soup.find('main')
+        if not article:
+            article = soup.find('div', class_=['content', 'article', 'post'])
+
+        if article:
+            content = article.get_text(separator='\n', strip=True)
+        else:
+            # 如果找不到明确的文章区域，获取所有段落文本
+            paragraphs = soup.find_all('p')
+            content = '\n'.join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
+
+        return clean_content(content), title
+
+
+@register_extractor
+class LxmlExtractor(HTMLExtractor):
+    """基于 lxml 的提取器，按 readability 的方式为候选节点打分选取正文
+
+    每个足够长的段落按逗号数和长度计分，分数累加到父节点(全额)和祖父节点(一半)，
+    节点初始分由标签和 class/id 决定，最终分数按链接文本占比折减。
+    得分最高的节点及其得分足够高的兄弟节点组成正文。
+    """
+    name = 'lxml'
+
+    @classmethod
+    def available(cls) -> bool:
+        return lxml_html is not None
+
+    def extract(self, html: str) -> Tuple[str, Optional[str]]:
+        # lxml 不接受带编码声明的 str
+        html = _XML_DECLARATION.sub('', html, count=1)
+        if not html.strip():
+            return '', None
+        try:
+            root = lxml_html.document_fromstring(html)
+        except (etree.ParserError, ValueError):
+            return '', None
+
+        title = root.findtext('.//title')
+        title = title.strip() if title else None
+
+        etree.strip_elements(root, etree.Comment, *REMOVED_TAGS, with_tail=False)
+        self._drop_unlikely(root)
+
+        nodes = self._select_nodes(root)
+        content = '\n'.join(
+            text.strip() for node in nodes for text in node.itertext() if text.strip()
+        )
+        return clean_content(content), title
+
+    @staticmethod
+    def _drop_unlikely(root):
+        """移除 class/id 表明不是正文的节点(评论、侧栏、分享等)"""
+        unlikely = []
+        for node in root.iter():
+            if not isinstance(node.tag, str) or node.tag in ('html', 'body', 'article', 'main'):
+                continue
+            marker = f"{node.get('class', '')} {node.get('id', '')}"
+            if marker.strip() and _UNLIKELY.search(marker) and not _POSITIVE.search(marker):
+                unlikely.append(node)
+        for node in unlikely:
+            node.drop_tree()
+
+    def _select_nodes(self, root) -> List:
+        """选取得分最高的候选节点及其同级正文节点"""
+        scores = self._score_candidates(root)
+        if not scores:
+            # 没有足够长的段落时退回到所有段落
+            return list(root.iter('p'))
+
+        top = max(scores, key=scores.get)
+        parent = top.getparent()
+        if parent is None:
+            return [top]
+
+        threshold = max(10.0, scores[top] * 0.2)
+        nodes = []
+        for sibling in parent:
+            if not isinstance(sibling.tag, str):
+                continue
+            if sibling is top or scores.get(sibling, 0) >= threshold:
+                nodes.append(sibling)
+            elif sibling.tag == 'p':
+                text = _node_text(sibling)
+                if len(text) > 80 and _link_density(sibling, text) < 0.25:
+                    nodes.append(sibling)
+        return nodes
+
+    def _score_candidates(self, root) -> Dict:
+        scores = {}
+        for node in root.iter():
+            if not _is_paragraph(node):
+                continue
+            text = _node_text(node)
+            if len(text) < MIN_PARAGRAPH_LENGTH:
+                continue
+
+            score = 1 + text.count(',') + text.count('，') + min(len(text) // 100, 3)
+            parent = node.getparent()
+            grandparent = parent.getparent() if parent is not None else None
+            for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+                if ancestor is None or ancestor.tag in ('html', 'body'):
+                    continue
+                if ancestor not in scores:
+                    scores[ancestor] = self._initial_score(ancestor)
+                scores[ancestor] += score * share
+
+        return {
+            node: score * (1 - _link_density(node, _node_text(node)))
+            for node, score in scores.items()
+        }
+
+    @staticmethod
+    def _initial_score(node) -> float:
+        score = _TAG_WEIGHTS.get(node.tag, 0)
+        marker = f"{node.get('class', '')} {node.get('id', '')}"
+        if _POSITIVE.search(marker):
+            score += 25
+        if _UNLIKELY.search(marker):
+            score -= 25
+        return score
+
+
+def _is_paragraph(node) -> bool:
+    if node.tag in PARAGRAPH_TAGS:
+        return True
+    # 不含块级子元素的 div 视作段落
+    return node.tag == 'div' and not any(child.tag in BLOCK_TAGS for child in node)
+
+
+def _node_text(node) -> str:
+    return ' '.join(node.text_content().split())
+
+
+def _link_density(node, text: str) -> float:
+    """链接文本占节点文本的比例"""
+    if not text:
+        return 1.0
+    link_length = sum(len(_node_text(link)) for link in node.iter('a'))
+    return min(link_length / len(text), 1.0)
@@ -1,17 +1,190 @@
+import asyncio
+from openai import RateLimitError
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from core.config import settings
 from core.logging import log
-from typing import List, Dict
+from core.event_loop import loop_semaphore
+from core.metrics import track_provider_call
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from utils.prompt_utils import PromptUtils
+from services.client_pool import ClientPool
+from services.llm_cache import llm_cache
+from services.rate_limiter import RateLimiter, RateLimiterRegistry, retry_after_seconds
+from utils.token_utils import TokenUtil
+
+# 缓存未命中标记
+_MISS = object()
 
 class LLMService:
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model_name=settings.MODEL,
-            openai_api_key=settings.API_KEY,
-            openai_api_base=settings.API_BASE_URL
+    @property
+    def llm(self) -> ChatOpenAI:
+        """共享的LLM客户端，配置变更后自动重建"""
+        return ClientPool.get_instance().get_chat_model()
+
+    @property
+    def provider(self) -> str:
+        """服务提供方标识(模型名称)"""
+        return settings.MODEL
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """当前LLM端点的限流器"""
+        return RateLimiterRegistry.get_instance().get("llm", f"{settings.API_BASE_URL}|{settings.MODEL}")
+
+    def invoke(self, template_name: str, inputs: Dict, json_output: bool = False, step=None,
+               validate: Optional[Callable[[Any], None]] = None) -> Any:
+        """使用提示词模板调用LLM
+
+        Args:
+            template_name: 提示词模板名称
+            inputs: 模板输入参数
+            json_output: 是否将结果解析为JSON
+            step: 可选的步骤对象，用于记录调用用量
+            validate: 可选的结果校验函数，校验失败时抛出异常，未通过校验的结果不会写入缓存
+                      步骤重试执行(step.retrying)时跳过缓存查询，新的响应覆盖原有缓存
+
+        Returns:
+            Any: 文本内容，或解析后的JSON对象
+        """
+        chat_prompt = PromptUtils.create_chat_prompt(template_name)
+        llm = self.llm
+
+        cache_info, cached = self._lookup_cache(template_name, inputs, llm, json_output, validate, step)
+        if cached is not _MISS:
+            return cached
+
+        message = self._call(chat_prompt, llm, inputs)
+        return self._handle_response(message, cache_info, json_output, validate, step)
+
+    async def ainvoke(self, template_name: str, inputs: Dict, json_output: bool = False, step=None,
+                      validate: Optional[Callable[[Any], None]] = None) -> Any:
+        """invoke 的协程版本，在事件循环中等待LLM响应而不占用线程
+
+        参数与返回值同 invoke，缓存读写在线程池中执行。
+        """
+        chat_prompt = PromptUtils.create_chat_prompt(template_name)
+        llm = self.llm
+
+        cache_info, cached = await asyncio.to_thread(
+            self._lookup_cache, template_name, inputs, llm, json_output, validate, step
         )
+        if cached is not _MISS:
+            return cached
+
+        message = await self._acall(chat_prompt, llm, inputs)
+        return await asyncio.to_thread(
+            self._handle_response, message, cache_info, json_output, validate, step
+        )
+
+    def _lookup_cache(self, template_name: str, inputs: Dict, llm: ChatOpenAI, json_output: bool,
+                      validate: Optional[Callable[[Any], None]], step) -> Tuple[Optional[Dict], Any]:
+        """查询响应缓存
+
+        Returns:
+            Tuple[Optional[Dict], Any]: (写入缓存所需的信息，未启用缓存时为None; 命中时的解析结果，未命中为 _MISS)
+        """
+        if not llm_cache.is_enabled(template_name):
+            return None, _MISS
+
+        template_version = PromptUtils.get_template_version(template_name)
+        temperature = getattr(llm, 'temperature', None)
+        cache_info = {
+            "cache_key": llm_cache.build_key(
+                template_name, template_version, inputs, self.provider, temperature
+            ),
+            "template_name": template_name,
+            "template_version": template_version,
+            "temperature": temperature,
+        }
+        if step is not None and getattr(step, 'retrying', False):
+            log.debug(f"步骤重试，跳过LLM缓存: {template_name}")
+            return cache_info, _MISS
+        cached = llm_cache.get(cache_info["cache_key"], template_name)
+        if cached is not None:
+            try:
+                result = self._parse(cached, json_output, validate)
+                log.debug(f"LLM缓存命中: {template_name}")
+                if step is not None:
+                    step.record_usage(provider=self.provider, calls=0)
+                return cache_info, result
+            except Exception as e:
+                log.warning(f"LLM缓存内容校验失败，重新调用: {template_name}, error: {str(e)}")
+        return cache_info, _MISS
+
+    def _handle_response(self, message, cache_info: Optional[Dict], json_output: bool,
+                         validate: Optional[Callable[[Any], None]], step) -> Any:
+        """记录用量，解析校验响应并写入缓存"""
+        usage = getattr(message, 'usage_metadata', None) or {}
+        tokens = usage.get('total_tokens', 0)
+        if step is not None:
+            step.record_usage(provider=self.provider, tokens=tokens)
+
+        content = message.content if hasattr(message, 'content') else str(message)
+        # 先完成解析和校验再写缓存，避免缓存无效的响应
+        result = self._parse(content, json_output, validate)
+
+        if cache_info is not None:
+            llm_cache.set(
+                cache_info["cache_key"],
+                template_name=cache_info["template_name"],
+                template_version=cache_info["template_version"],
+                model=self.provider,
+                temperature=cache_info["temperature"],
+                response=content,
+                tokens=tokens
+            )
+        return result
+
+    def _call(self, chat_prompt: ChatPromptTemplate, llm: ChatOpenAI, inputs: Dict):
+        """在限流配额内调用LLM，服务端限流(429)时按 Retry-After 暂停后重试"""
+        limiter = self.rate_limiter
+        # 按提示词长度预扣token，调用完成后按实际用量修正
+        estimated = TokenUtil.count(chat_prompt.format(**inputs)) if limiter.limits_tokens else 0
+        for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+            limiter.acquire(tokens=estimated)
+            try:
+                with ClientPool.get_instance().get_llm_slots(), track_provider_call("llm", self.provider):
+                    message = (chat_prompt | llm).invoke(inputs)
+                break
+            except RateLimitError as e:
+                self._on_throttled(limiter, e, attempt)
+
+        usage = getattr(message, 'usage_metadata', None) or {}
+        limiter.report_usage(estimated, usage.get('total_tokens', 0))
+        return message
+
+    async def _acall(self, chat_prompt: ChatPromptTemplate, llm: ChatOpenAI, inputs: Dict):
+        """_call 的协程版本，并发数受 ASYNC_MAX_INFLIGHT_CALLS 约束"""
+        limiter = self.rate_limiter
+        estimated = TokenUtil.count(chat_prompt.format(**inputs)) if limiter.limits_tokens else 0
+        for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+            await limiter.aacquire(tokens=estimated)
+            try:
+                async with loop_semaphore("llm", settings.ASYNC_MAX_INFLIGHT_CALLS):
+                    with track_provider_call("llm", self.provider):
+                        message = await (chat_prompt | llm).ainvoke(inputs)
+                break
+            except RateLimitError as e:
+                self._on_throttled(limiter, e, attempt)
+
+        usage = getattr(message, 'usage_metadata', None) or {}
+        limiter.report_usage(estimated, usage.get('total_tokens', 0))
+        return message
 
+    @staticmethod
+    def _on_throttled(limiter: RateLimiter, error: RateLimitError, attempt: int):
+        """服务端限流时暂停端点，超过重试次数后继续抛出异常"""
+        limiter.report_throttled(retry_after_seconds(error))
+        if attempt >= settings.RATE_LIMIT_MAX_RETRIES:
+            raise error
+        log.warning(f"LLM服务限流，重试 {attempt + 1}/{settings.RATE_LIMIT_MAX_RETRIES}")
 
+    @staticmethod
+    def _parse(content: str, json_output: bool, validate: Optional[Callable[[Any], None]]) -> Any:
+        """解析并校验响应内容"""
+        result = JsonOutputParser().parse(content) if json_output else content
+        if validate is not None:
+            validate(result)
+        return result
@@ -0,0 +1,129 @@
+import json
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from core import metrics
+from core.config import settings
+from core.logging import log
+from crud.llm_cache import llm_cache as llm_cache_crud
+from db.session import SessionLocal
+
+
+class LLMCache:
+    """基于SQLite的LLM响应缓存
+
+    缓存键由模板名称、模板版本哈希、输入参数、模型名称和温度共同决定，
+    模板内容或模型变化后自动失效。缓存读写失败只记录日志，不影响LLM调用。
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    @property
+    def disabled_templates(self) -> Set[str]:
+        """不使用缓存的模板集合"""
+        value = settings.LLM_CACHE_DISABLED_TEMPLATES or ""
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    def is_enabled(self, template_name: str) -> bool:
+        """判断模板是否启用缓存"""
+        return bool(settings.LLM_CACHE_ENABLED) and template_name not in self.disabled_templates
+
+    @staticmethod
+    def build_key(template_name: str, template_version: str, inputs: Dict,
+                  model: str, temperature: Optional[float]) -> str:
+        """计算缓存键"""
+        payload = json.dumps(
+            {
+                "template": template_name,
+                "version": template_version,
+                "inputs": inputs,
+                "model": model,
+                "temperature": temperature,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, cache_key: str, template_name: str) -> Optional[str]:
+        """查询缓存，未命中或出错时返回None"""
+        db = self.session_factory()
+        try:
+            entry = llm_cache_crud.get_valid(db, cache_key)
+            response = entry.response if entry else None
+        except Exception as e:
+            db.rollback()
+            self._count("_errors")
+            log.warning(f"读取LLM缓存失败: {template_name}, error: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+        if response is None:
+            self._count("_misses")
+            metrics.LLM_CACHE_REQUESTS.labels(template=template_name, result="miss").inc()
+        else:
+            self._count("_hits")
+            metrics.LLM_CACHE_REQUESTS.labels(template=template_name, result="hit").inc()
+        return response
+
+    def set(self, cache_key: str, *, template_name: str, template_version: str,
+            model: str, temperature: Optional[float], response: str, tokens: int = 0):
+        """写入缓存并执行过期与容量淘汰"""
+        db = self.session_factory()
+        try:
+            llm_cache_crud.upsert(
+                db,
+                cache_key=cache_key,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                template_name=template_name,
+                template_version=template_version,
+                model=model,
+                temperature=None if temperature is None else str(temperature),
+                response=response,
+                tokens=tokens or 0
+            )
+            llm_cache_crud.evict(db, settings.LLM_CACHE_MAX_ENTRIES)
+        except Exception as e:
+            db.rollback()
+            self._count("_errors")
+            log.warning(f"写入LLM缓存失败: {template_name}, error: {str(e)}")
+        finally:
+            db.close()
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """获取缓存配置、进程内命中统计以及按模板汇总的持久化统计"""
+        with self._lock:
+            hits, misses, errors = self._hits, self._misses, self._errors
+        lookups = hits + misses
+        return {
+            "enabled": bool(settings.LLM_CACHE_ENABLED),
+            "ttl_seconds": settings.LLM_CACHE_TTL_SECONDS,
+            "max_entries": settings.LLM_CACHE_MAX_ENTRIES,
+            "disabled_templates": sorted(self.disabled_templates),
+            "hits": hits,
+            "misses": misses,
+            "errors": errors,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "items": llm_cache_crud.get_stats(db),
+        }
+
+    def clear(self, db: Session, template_name: Optional[str] = None) -> int:
+        """清空缓存，可按模板清空"""
+        return llm_cache_crud.clear(db, template_name)
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+llm_cache = LLMCache()
@@ -0,0 +1,311 @@
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from core import metrics
+from core.config import settings
+from core.logging import log
+from db.session import SessionLocal
+from models.rate_limit import RateLimitBucket
+from utils.time_utils import TimeUtil
+
+# 未配置请求数上限时使用的容量，相当于不限流，但仍可响应429暂停
+UNLIMITED = 1e9
+
+
+class RateLimitTimeout(Exception):
+    """等待限流令牌超时"""
+    pass
+
+
+class TokenBucket:
+    """进程内令牌桶，容量为每分钟配额，按秒匀速补充"""
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.refill_per_sec = capacity / 60
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, amount: float) -> float:
+        """尝试取出令牌
+
+        Returns:
+            float: 成功返回0，否则返回建议等待的秒数
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.refill_per_sec
+
+    def adjust(self, delta: float):
+        """按实际用量修正令牌数，delta为正表示多扣除"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - delta)
+
+    def block(self, seconds: float):
+        """暂停发放令牌"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+        self._updated = now
+
+
+class SharedTokenBucket:
+    """基于数据库的跨进程令牌桶
+
+    令牌的补充与扣除在一条带条件的 UPDATE 语句中完成，多个进程并发时由数据库保证原子性。
+    """
+
+    def __init__(self, key: str, capacity: float,
+                 session_factory: Callable[[], Session] = SessionLocal):
+        self.key = key
+        self.capacity = capacity
+        self.refill_per_ms = capacity / 60000
+        self.session_factory = session_factory
+
+    def try_acquire(self, amount: float) -> float:
+        """尝试取出令牌，返回值同 TokenBucket.try_acquire"""
+        amount = min(amount, self.capacity)
+        db = self.session_factory()
+        try:
+            now = TimeUtil.now_ms()
+            self._ensure_row(db, now)
+            refilled = self._refilled(now)
+            acquired = (
+                db.query(RateLimitBucket)
+                .filter(
+                    RateLimitBucket.key == self.key,
+                    RateLimitBucket.blocked_until <= now,
+                    refilled >= amount
+                )
+                .update(
+                    {RateLimitBucket.tokens: refilled - amount, RateLimitBucket.updated_at: now},
+                    synchronize_session=False
+                )
+            )
+            db.commit()
+            if acquired:
+                return 0.0
+
+            row = db.get(RateLimitBucket, self.key)
+            if row.blocked_until > now:
+                return (row.blocked_until - now) / 1000
+            available = min(self.capacity, row.tokens + (now - row.updated_at) * self.refill_per_ms)
+            return max(amount - available, 0) / (self.refill_per_ms * 1000) or 0.05
+        finally:
+            db.close()
+
+    def adjust(self, delta: float):
+        """按实际用量修正令牌数"""
+        self._update(lambda now: {
+            RateLimitBucket.tokens: func.min(self.capacity, self._refilled(now) - delta),
+            RateLimitBucket.updated_at: now
+        })
+
+    def block(self, seconds: float):
+        """暂停发放令牌"""
+        self._update(lambda now: {
+            RateLimitBucket.blocked_until: func.max(RateLimitBucket.blocked_until, now + int(seconds * 1000))
+        })
+
+    def _refilled(self, now: int):
+        """补充令牌后的可用数量(SQL表达式)"""
+        return func.min(
+            self.capacity,
+            RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * self.refill_per_ms
+        )
+
+    def _update(self, values: Callable[[int], Dict]):
+        db = self.session_factory()
+        try:
+            now = TimeUtil.now_ms()
+            self._ensure_row(db, now)
+            db.query(RateLimitBucket).filter(RateLimitBucket.key == self.key).update(
+                values(now), synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _ensure_row(self, db: Session, now: int):
+        db.execute(
+            insert(RateLimitBucket)
+            .values(key=self.key, tokens=self.capacity, updated_at=now, blocked_until=0)
+            .on_conflict_do_nothing(index_elements=["key"])
+        )
+
+
+class RateLimiter:
+    """单个服务端点的限流器，同时限制每分钟请求数和token数"""
+
+    def __init__(self, key: str, rpm: int, tpm: int, shared: bool = False):
+        self.key = key
+
+        def make_bucket(suffix: str, capacity: float):
+            if shared:
+                return SharedTokenBucket(f"{key}:{suffix}", capacity)
+            return TokenBucket(capacity)
+
+        # 请求数桶始终存在，用于在收到429时暂停该端点的所有调用
+        self.requests = make_bucket("requests", rpm if rpm > 0 else UNLIMITED)
+        self.tokens = make_bucket("tokens", tpm) if tpm > 0 else None
+
+    @property
+    def limits_tokens(self) -> bool:
+        """是否配置了token数限制"""
+        return self.tokens is not None
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None):
+        """阻塞直到获得一次请求和指定数量token的配额
+
+        Raises:
+            RateLimitTimeout: 等待超过 timeout(默认 RATE_LIMIT_MAX_WAIT)秒
+        """
+        for wait in self._acquire_steps(tokens, timeout):
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0, timeout: Optional[float] = None):
+        """acquire 的协程版本，等待期间不占用线程"""
+        for wait in self._acquire_steps(tokens, timeout):
+            await asyncio.sleep(wait)
+
+    def _acquire_steps(self, tokens: int, timeout: Optional[float]) -> Iterator[float]:
+        """依次从请求数桶和token桶取出配额，需要等待时产出等待秒数
+
+        等待超时或被取消时归还已取出的配额，避免请求数桶的令牌在token桶超时后丢失
+        """
+        timeout = settings.RATE_LIMIT_MAX_WAIT if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        acquired = []
+        try:
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is None or amount <= 0:
+                    continue
+                while True:
+                    wait = bucket.try_acquire(amount)
+                    if wait <= 0:
+                        acquired.append((bucket, amount))
+                        break
+                    if time.monotonic() + wait > deadline:
+                        raise RateLimitTimeout(f"等待限流配额超时: {self.key}")
+                    yield min(wait, 1.0)
+        except BaseException:
+            for bucket, amount in acquired:
+                bucket.adjust(-amount)
+            raise
+
+        waited = time.monotonic() - start
+        metrics.RATE_LIMIT_WAIT.labels(key=self.key).observe(waited)
+        if waited >= 1:
+            log.info(f"限流等待 {waited:.1f} 秒: {self.key}")
+
+    def report_usage(self, estimated: int, actual: int):
+        """用实际token用量修正预扣的token数"""
+        if self.tokens is not None and actual:
+            self.tokens.adjust(actual - estimated)
+
+    def report_throttled(self, retry_after: Optional[float] = None):
+        """服务端返回429时暂停该端点的所有调用"""
+        seconds = retry_after if retry_after is not None else settings.RATE_LIMIT_DEFAULT_BACKOFF
+        log.warning(f"服务端限流，暂停 {seconds:.1f} 秒: {self.key}")
+        metrics.RATE_LIMIT_THROTTLED.labels(key=self.key).inc()
+        self.requests.block(seconds)
+        if self.tokens is not None:
+            self.tokens.block(seconds)
+
+
+class RateLimiterRegistry:
+    """按服务端点管理限流器，限额配置变化时重建"""
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+            return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            self._build_lock = threading.Lock()
+            # key -> (配置签名, 限流器)
+            self._limiters: Dict[str, Tuple[Tuple, RateLimiter]] = {}
+            self.initialized = True
+
+    @classmethod
+    def get_instance(cls) -> 'RateLimiterRegistry':
+        """获取限流器注册表实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def get(self, kind: str, endpoint: str) -> RateLimiter:
+        """获取服务端点的限流器
+
+        Args:
+            kind: 服务类型，llm 或 tts
+            endpoint: 服务端点标识，如 base_url 与模型名称
+        """
+        if kind == "llm":
+            rpm, tpm = settings.LLM_RATE_LIMIT_RPM, settings.LLM_RATE_LIMIT_TPM
+        else:
+            rpm, tpm = settings.TTS_RATE_LIMIT_RPM, 0
+        signature = (rpm, tpm, bool(settings.RATE_LIMIT_SHARED))
+        key = f"{kind}:{endpoint}"
+
+        cached = self._limiters.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        with self._build_lock:
+            cached = self._limiters.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+            limiter = RateLimiter(key, rpm, tpm, shared=signature[2])
+            self._limiters[key] = (signature, limiter)
+            return limiter
+
+    def reset(self):
+        """丢弃所有限流器"""
+        with self._build_lock:
+            self._limiters.clear()
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """从429异常的响应头中解析建议等待时间(秒)"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get('retry-after-ms')
+        if retry_after_ms:
+            return float(retry_after_ms) / 1000
+        retry_after = headers.get('retry-after')
+        if not retry_after:
+            return None
+        try:
+            return float(retry_after)
+        except ValueError:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max((retry_at - TimeUtil.now()).total_seconds(), 0)
+    except Exception:
+        return None
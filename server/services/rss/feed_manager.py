@@ -1,10 +1,15 @@
-import feedparser
 import asyncio
+import multiprocessing
+import hashlib
+import hmac
+import random
+import re
+import secrets
 import time
 import uuid
 from datetime import datetime
 import zoneinfo
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, select, extract
 from sqlalchemy.orm import Session, attributes
@@ -15,101 +20,288 @@ from models.enums import TaskStatus, TaskProgress
 from core.config import settings
 from services.task.processor import TaskProcessor
 from core.logging import log
+from core import metrics
 from utils.time_utils import TimeUtil
 from db.session import SessionLocal
 import logging
 import aiohttp
 import threading
+from concurrent.futures import ProcessPoolExecutor
+from services.rss.parser import parse_feed_document
+from services.rss.filters import entry_skip_reason
+from services.task.batch_window import deferred_task_dispatcher, deferred_until
 
 logger = logging.getLogger(__name__)
 
+# 发起WebSub订阅后等待hub验证的时间（秒），超时后的验证请求不再接受，下次抓取时重新订阅
+WEBSUB_VERIFY_WINDOW_SECONDS = 3600
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """获取解析RSS文档的进程池，首次使用时创建
+
+    使用spawn方式启动子进程，避免复制应用中的线程和数据库连接
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=settings.RSS_PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_pool
+
 class FeedManager:
     def __init__(self, db: Session, task_processor: TaskProcessor):
         self.db = db
         self.task_processor = task_processor
         self.timezone = zoneinfo.ZoneInfo(settings.TIMEZONE)
+        # 数据库操作在线程中执行，同一会话上的操作依次进行
+        self._db_lock = asyncio.Lock()
         
-    async def fetch_feed(self, feed: RSSFeed) -> None:
+    async def _run_db(self, func, *args):
+        """在线程中执行数据库操作，避免同步查询和提交阻塞事件循环"""
+        async with self._db_lock:
+            return await asyncio.to_thread(func, *args)
+
+    @staticmethod
+    def _client_session() -> aiohttp.ClientSession:
+        """创建抓取RSS源的会话，连接池按主机限制并发，每个请求有总超时"""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=max(1, settings.RSS_CONCURRENT_TASKS),
+                limit_per_host=settings.RSS_FETCH_PER_HOST
+            ),
+            timeout=aiohttp.ClientTimeout(total=settings.RSS_FETCH_TIMEOUT)
+        )
+
+    async def fetch_feed(self, feed: RSSFeed, session: Optional[aiohttp.ClientSession] = None) -> None:
         """获取并处理RSS源的内容
         
         Args:
             feed: RSS源对象
+            session: 本轮抓取共享的会话，未提供时单独创建
             
         Raises:
             Exception: 当获取或处理RSS内容出错时抛出
         """
-        try:
-            # 异步获取RSS内容
-            async with aiohttp.ClientSession() as session:
-                async with session.get(feed.url) as response:
-                    content = await response.text()
-                    parsed = feedparser.parse(content)
-            
-            # 检查状态码（如果存在）
-            status = getattr(parsed, 'status', 200)
-            if isinstance(status, int) and status >= 400:
-                raise Exception(f"获取RSS内容失败: HTTP {status}")
-            
-            # 更新feed信息
-            is_initial_fetch = feed.last_fetch is None
-            current_time = TimeUtil.now_ms()
-            feed.last_fetch = current_time
-            feed.error_count = 0
-            
-            # 处理条目，按发布时间倒序排序
-            entries = sorted(
-                parsed.entries,
-                key=lambda x: x.get('published_parsed', 0),
-                reverse=True
-            )
+        await self.fetch_feeds([feed], session)
+
+    async def fetch_feeds(self, feeds: List[RSSFeed], session: Optional[aiohttp.ClientSession] = None) -> None:
+        """获取同一URL的RSS内容一次，分发给所有订阅该URL的用户
+        
+        Args:
+            feeds: URL相同的RSS源列表(每个订阅用户一个)
+            session: 本轮抓取共享的会话，未提供时单独创建
             
+        Raises:
+            Exception: 当获取或处理RSS内容出错时抛出
+        """
+        if session is None:
+            async with self._client_session() as session:
+                return await self.fetch_feeds(feeds, session)
+        
+        url, request_headers = await self._run_db(self._prepare_request, feeds)
+        start = time.perf_counter()
+        try:
+            await self._fetch_and_process(feeds, session, url, request_headers)
+        except Exception as e:
+            metrics.RSS_FETCH_TOTAL.labels(result="error").inc(len(feeds))
+            log.error(f"处理RSS源出错: {url}, error={str(e)}")
+            await self._run_db(self._record_failure, feeds)
+            raise
+        finally:
+            metrics.RSS_FETCH_DURATION.observe(time.perf_counter() - start)
+        
+        # 源声明了WebSub hub时订阅推送
+        await self._ensure_subscription(feeds, session)
+
+    async def _fetch_and_process(
+        self,
+        feeds: List[RSSFeed],
+        session: aiohttp.ClientSession,
+        url: str,
+        request_headers: dict
+    ) -> None:
+        """请求RSS源并处理有变化的内容"""
+        # 异步获取RSS内容，所有订阅者都抓取过且校验信息一致时发送条件请求
+        async with session.get(url, headers=request_headers) as response:
+            if response.status == 304:
+                await self._run_db(
+                    self._mark_unchanged, feeds, response.headers, self._publisher_min_interval(response.headers)
+                )
+                return
+            if response.status >= 400:
+                raise Exception(f"获取RSS内容失败: HTTP {response.status}")
+            body = await response.read()
+            headers = response.headers
+            links = {rel: str(link['url']) for rel, link in response.links.items()}
+        
+        # 服务端不支持条件请求时，以内容哈希判断各订阅者上次处理后是否有变化
+        content_hash = hashlib.sha256(body).hexdigest()
+        changed, limit = await self._run_db(self._split_unchanged, feeds, headers, content_hash)
+        if not changed:
+            return
+        
+        keyed_entries, cadence, info = await self._parse(body, limit)
+        if any(guid is None for guid, _ in keyed_entries):
+            log.warning(f"跳过无效条目: 缺少guid, feed={url}")
+        publisher_min = self._publisher_min_interval(headers, info['ttl'])
+        
+        # hub 可以在文档的 <link rel="hub"> 或响应的 Link 头中声明
+        hub = info['hub'] or links.get('hub')
+        topic = info['self'] or links.get('self') or url
+        await self._run_db(
+            self._process_entries, changed, keyed_entries, headers, content_hash, cadence, publisher_min,
+            (hub, topic)
+        )
+
+    def _prepare_request(self, feeds: List[RSSFeed]):
+        """读取请求地址和条件请求头"""
+        return feeds[0].url, self._conditional_headers(feeds)
+
+    def _split_unchanged(self, feeds: List[RSSFeed], headers, content_hash: str):
+        """标记内容未变化的订阅者
+        
+        Returns:
+            (需要处理条目的订阅者, 这些订阅者最多需要的条目数)
+        """
+        unchanged = [
+            feed for feed in feeds
+            if feed.last_fetch is not None and content_hash == feed.content_hash
+        ]
+        if unchanged:
+            self._mark_unchanged(unchanged, headers, self._publisher_min_interval(headers))
+        changed = [feed for feed in feeds if feed not in unchanged]
+        return changed, self._entry_limit(changed)
+
+    @staticmethod
+    def _entry_limit(feeds: List[RSSFeed]) -> int:
+        """这些订阅者本次最多需要处理的条目数"""
+        return max(
+            (
+                (feed.initial_entries_count if feed.last_fetch is None else feed.update_entries_count) or 0
+                for feed in feeds
+            ),
+            default=0
+        )
+
+    @staticmethod
+    def _embedded_content(feed: RSSFeed, entry: dict) -> Optional[str]:
+        """源未关闭且内嵌正文足够长时返回正文，任务据此跳过网页抓取"""
+        content = entry.get('content')
+        if not feed.use_embedded_content or not content:
+            return None
+        if len(content) < settings.RSS_EMBEDDED_CONTENT_MIN_LENGTH:
+            return None
+        return content
+
+    @staticmethod
+    async def _parse(body: bytes, limit: int):
+        """解析RSS文档
+
+        解析是CPU密集的纯Python代码，在线程中执行仍会与事件循环争抢GIL，
+        因此默认放到进程池中执行；RSS_PARSE_WORKERS 为0时在线程中执行
+        """
+        if settings.RSS_PARSE_WORKERS <= 0:
+            return await asyncio.to_thread(parse_feed_document, body, limit)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_parse_pool(), parse_feed_document, body, limit)
+
+    def _process_entries(
+        self,
+        feeds: List[RSSFeed],
+        keyed_entries: list,
+        headers,
+        content_hash: str,
+        cadence: Optional[float] = None,
+        publisher_min: float = 0,
+        websub_links: Optional[Tuple[Optional[str], str]] = None
+    ) -> None:
+        """按各订阅者的条目数量设置选取条目，一次查询完成查重并在同一事务中写入所有订阅者的新条目和任务
+        
+        Args:
+            feeds: 内容有变化、需要处理条目的RSS源
+            keyed_entries: parse_feed_document 返回的按发布时间倒序排列的 (guid, 条目) 列表
+            headers: 本次响应头
+            content_hash: 本次响应内容的哈希
+            cadence: 根据发布频率估算的抓取间隔（秒），条目不足时为None
+            publisher_min: 发布方通过 ttl/Cache-Control 要求的最小抓取间隔（秒）
+            websub_links: 文档声明的 (hub, self) 链接，与条目在同一事务中保存；推送的内容不更新hub
+        """
+        current_time = TimeUtil.now_ms()
+        push_active = self._push_active(feeds, current_time)
+        selected = []
+        for feed in feeds:
             # 根据是否首次抓取决定处理的条目数量
             max_entries = (
-                feed.initial_entries_count if is_initial_fetch
+                feed.initial_entries_count if feed.last_fetch is None
                 else feed.update_entries_count
             )
+            selected.append((feed, [(guid, entry) for guid, entry in keyed_entries[:max_entries] if guid]))
             
-            # 提取所有条目的guid进行批量查重
-            entry_guids = []
-            entry_data = []
-            
-            for entry in entries[:max_entries]:
-                guid = entry.get('id') or entry.get('link')
-                if not guid:
-                    log.warning(f"跳过无效条目: 缺少guid, feed={feed.url}")
-                    continue
-                entry_guids.append(guid)
-                entry_data.append(entry)
-            
-            if not entry_guids:
-                log.info(f"没有找到有效的RSS条目: {feed.url}")
-                self.db.commit()
-                return
-                
-            # 批量查询已存在的guid，同时考虑user_id
+            # 更新feed信息，校验信息与本次处理在同一事务中提交
+            feed.last_fetch = current_time
+            feed.error_count = 0
+            self._update_validators(feed, headers)
+            feed.content_hash = content_hash
+            if websub_links is not None:
+                feed.hub_url, feed.websub_topic = websub_links
+            self._schedule_next(feed, current_time, cadence, publisher_min, push_active)
+        
+        # 批量查询所有订阅者已存在的guid
+        entry_guids = {guid for _, items in selected for guid, _ in items}
+        existing = set()
+        if entry_guids:
             stmt = (
-                select(RSSEntry.guid)
+                select(RSSEntry.guid, RSSEntry.user_id)
                 .where(
                     RSSEntry.guid.in_(entry_guids),
-                    RSSEntry.user_id == feed.user_id
+                    RSSEntry.user_id.in_({feed.user_id for feed in feeds})
                 )
             )
-            existing_guids = set(row[0] for row in self.db.execute(stmt).fetchall())
-            
-            # 批量处理新条目
-            new_entries = []
-            new_tasks = []
+            existing = {(row[0], row[1]) for row in self.db.execute(stmt).fetchall()}
+        
+        # 批量处理新条目
+        new_entries = []
+        new_tasks = []
+        linked = []
+        skipped = []
+        results = []
+        for feed, items in selected:
+            if not items:
+                log.info(f"没有找到有效的RSS条目: {feed.url}")
+                results.append("empty")
+                continue
             
-            for entry in entry_data:
-                guid = entry.get('id') or entry.get('link')
-                
+            count = 0
+            for guid, entry in items:
                 # 跳过已存在的条目
-                if guid in existing_guids:
+                if (guid, feed.user_id) in existing:
                     log.debug(f"跳过已存在的条目: {guid}")
                     continue
                 
                 # 处理发布时间
-                published = self._parse_entry_time(entry) or current_time
+                published = entry.get('published') or current_time
+                
+                # 不满足源的过滤规则的条目只记录，不创建任务，之后也不再重复检查
+                skip_reason = entry_skip_reason(feed.entry_filters, entry)
+                if skip_reason:
+                    log.debug(f"条目不满足过滤规则 {skip_reason}，跳过: {guid}")
+                    new_entries.append(RSSEntry(
+                        feed_id=feed.id,
+                        guid=guid,
+                        title=entry.get('title'),
+                        link=entry.get('link'),
+                        published=published,
+                        skip_reason=skip_reason,
+                        user_id=feed.user_id
+                    ))
+                    skipped.append(skip_reason)
+                    existing.add((guid, feed.user_id))
+                    continue
                 
                 try:
                     # 创建RSS条目记录
@@ -119,9 +311,9 @@ class FeedManager:
                         title=entry.get('title'),
                         link=entry.get('link'),
                         published=published,
+                        content=self._embedded_content(feed, entry),
                         user_id=feed.user_id
                     )
-                    new_entries.append(new_entry)
                     
                     # 创建播客任务
                     task = Task(
@@ -132,98 +324,387 @@ class FeedManager:
                         is_public=True,
                         created_by=feed.user_id,
                         status=TaskStatus.PENDING.value,
-                        progress=TaskProgress.WAITING.value
+                        progress=TaskProgress.WAITING.value,
+                        deferred_until=deferred_until(current_time) if feed.defer_to_batch_window else None
                     )
-                    new_tasks.append(task)
                 except Exception as e:
                     log.error(f"创建条目或任务失败: {str(e)}, guid={guid}")
                     continue
+                new_entries.append(new_entry)
+                new_tasks.append(task)
+                linked.append((new_entry, task))
+                existing.add((guid, feed.user_id))
+                count += 1
             
-            if new_entries:
-                try:
-                    # 1. 保存条目和任务
-                    self.db.add_all(new_entries)
-                    self.db.add_all(new_tasks)
-                    self.db.flush()
-                    
-                    # 2. 更新关联关系
-                    for entry, task in zip(new_entries, new_tasks):
-                        entry.task_id = task.taskId
-                    
-                    # 3. 提交事务
-                    self.db.commit()
-                    
-                    # 4. 启动任务处理 - 使用execute_task
-                    from services.task.task_service import execute_task
-                    for task in new_tasks:
-                        # 只传递task_id，让execute_task自己创建新的数据库会话
-                        threading.Thread(
-                            target=execute_task,
-                            args=(task.taskId, False)
-                        ).start()
-                    
-                    log.info(f"成功处理RSS源 {feed.url}: 添加了 {len(new_entries)} 个新条目")
-                except Exception as e:
-                    log.error(f"保存新条目时出错: {str(e)}")
-                    self.db.rollback()
-                    raise
+            if count:
+                log.info(f"成功处理RSS源 {feed.url}: 用户 {feed.user_id} 添加了 {count} 个新条目")
+                results.append("new_entries")
             else:
-                log.info(f"RSS源 {feed.url} 没有新的条目需要处理")
-                self.db.commit()
+                log.info(f"RSS源 {feed.url} 用户 {feed.user_id} 没有新的条目需要处理")
+                results.append("no_new_entries")
+        
+        try:
+            # 1. 保存条目和任务
+            self.db.add_all(new_entries)
+            self.db.add_all(new_tasks)
+            self.db.flush()
             
+            # 2. 更新关联关系
+            for entry, task in linked:
+                entry.task_id = task.taskId
+            
+            # 3. 提交事务
+            self.db.commit()
         except Exception as e:
-            log.error(f"处理RSS源出错: {feed.url}, error={str(e)}")
+            log.error(f"保存新条目时出错: {str(e)}")
+            self.db.rollback()
             raise
-            
-    def _parse_entry_time(self, entry) -> int:
-        """解析RSS条目的发布时间
         
-        Args:
-            entry: RSS条目数据
+        # 4. 启动任务处理
+        if new_tasks:
+            # 延后的任务由延后任务调度器在批处理时段或等待超时后执行
+            deferred = [task for task in new_tasks if task.deferred_until is not None]
+            self._start_tasks([task for task in new_tasks if task.deferred_until is None])
+            if deferred:
+                log.info(f"{len(deferred)} 个任务延后到批处理时段执行")
+                metrics.RSS_TASKS_DEFERRED.labels(event="deferred").inc(len(deferred))
+                deferred_task_dispatcher.notify()
+            metrics.RSS_ENTRIES_CREATED.inc(len(new_tasks))
+        for skip_reason in skipped:
+            metrics.RSS_ENTRIES_SKIPPED.labels(rule=skip_reason.split(':')[0]).inc()
+        for result in results:
+            metrics.RSS_FETCH_TOTAL.labels(result=result).inc()
             
-        Returns:
-            毫秒时间戳，如果解析失败返回当前时间戳
+    @staticmethod
+    def _start_tasks(tasks: List[Task]) -> None:
+        """启动任务处理 - 使用execute_task"""
+        from services.task.task_service import execute_task
+        for task in tasks:
+            # 只传递task_id，让execute_task自己创建新的数据库会话
+            threading.Thread(
+                target=execute_task,
+                args=(task.taskId, False)
+            ).start()
+
+    @staticmethod
+    def _conditional_headers(feeds: List[RSSFeed]) -> dict:
+        """根据上次抓取保存的 ETag/Last-Modified 构造条件请求头
+        
+        有订阅者尚未抓取过，或各订阅者保存的校验信息不一致时不发送条件请求，
+        否则304响应会让需要完整内容的订阅者错过条目
         """
+        headers = {}
+        if any(feed.last_fetch is None for feed in feeds):
+            return headers
+        if len({(feed.etag, feed.last_modified) for feed in feeds}) > 1:
+            return headers
+        if feeds[0].etag:
+            headers['If-None-Match'] = feeds[0].etag
+        if feeds[0].last_modified:
+            headers['If-Modified-Since'] = feeds[0].last_modified
+        return headers
+
+    @staticmethod
+    def _update_validators(feed: RSSFeed, headers) -> None:
+        """保存响应中的 ETag/Last-Modified，未返回时保留原值"""
+        feed.etag = headers.get('ETag') or feed.etag
+        feed.last_modified = headers.get('Last-Modified') or feed.last_modified
+
+    def _mark_unchanged(self, feeds: List[RSSFeed], headers, publisher_min: float = 0) -> None:
+        """RSS源内容未变化，只更新抓取时间，跳过解析和条目处理"""
+        current_time = TimeUtil.now_ms()
+        push_active = self._push_active(feeds, current_time)
+        for feed in feeds:
+            feed.last_fetch = current_time
+            feed.error_count = 0
+            self._update_validators(feed, headers)
+            self._schedule_next(feed, current_time, None, publisher_min, push_active)
+        self.db.commit()
+        metrics.RSS_FETCH_TOTAL.labels(result="not_modified").inc(len(feeds))
+        log.info(f"RSS源内容未变化: {feeds[0].url}, 订阅者 {len(feeds)} 个")
+
+    @staticmethod
+    def _publisher_min_interval(headers, ttl: Optional[str] = None) -> float:
+        """发布方要求的最小抓取间隔（秒），取RSS ttl(分钟)与 Cache-Control max-age 中较大者"""
+        interval = 0
+        if ttl:
+            try:
+                interval = int(ttl) * 60
+            except (TypeError, ValueError):
+                log.debug(f"忽略无效的ttl: {ttl}")
+        cache_control = headers.get('Cache-Control', '')
+        match = re.search(r'max-age=(\d+)', cache_control)
+        if match and 'no-cache' not in cache_control and 'no-store' not in cache_control:
+            interval = max(interval, int(match.group(1)))
+        return interval
+
+    @staticmethod
+    def _push_active(feeds: List[RSSFeed], current_time: int) -> bool:
+        """订阅该URL的源中是否有有效期内的WebSub订阅"""
+        return any((feed.websub_lease_expires_at or 0) > current_time for feed in feeds)
+
+    @staticmethod
+    def _schedule_next(
+        feed: RSSFeed,
+        current_time: int,
+        cadence: Optional[float],
+        publisher_min: float,
+        push_active: bool = False
+    ) -> None:
+        """计算抓取成功后的下次抓取时间
+        
+        用户设置的抓取间隔和发布方的 ttl/Cache-Control 为下限，发布频率较低的源相应延长间隔，
+        结果限制在 RSS_MIN_FETCH_INTERVAL 与 RSS_MAX_FETCH_INTERVAL 之间；
+        本次无法估算发布频率(如内容未变化)时沿用上次的间隔。
+        WebSub订阅有效期间新内容由hub推送，轮询只作兜底，使用最大抓取间隔
+        """
+        interval = cadence if cadence is not None else (feed.poll_interval or 0)
+        interval = max(interval, feed.fetch_interval or 0, publisher_min, settings.RSS_MIN_FETCH_INTERVAL)
+        interval = int(min(interval, settings.RSS_MAX_FETCH_INTERVAL))
+        if push_active:
+            interval = settings.RSS_MAX_FETCH_INTERVAL
+        feed.poll_interval = interval
+        feed.next_fetch_at = current_time + interval * 1000
+
+    @staticmethod
+    def _retry_delay(error_count: int) -> float:
+        """第N次连续失败后的重试间隔（秒），指数退避并加入随机抖动，避免失败的源同时重试"""
+        delay = min(settings.RSS_ERROR_RETRY_INTERVAL * 2 ** (error_count - 1), settings.RSS_MAX_FETCH_INTERVAL)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _record_failure(self, feeds: List[RSSFeed]) -> None:
+        """丢弃未提交的修改并记录抓取失败，安排退避重试，连续失败超过 RSS_MAX_RETRY_COUNT 次后暂停该源"""
+        self.db.rollback()
+        current_time = TimeUtil.now_ms()
         try:
-            published_parsed = entry.get('published_parsed')
-            if published_parsed:
-                return int(time.mktime(published_parsed) * 1000)  # 转换为毫秒时间戳
-            return TimeUtil.now_ms()
+            for feed in feeds:
+                feed.error_count = (feed.error_count or 0) + 1
+                if feed.error_count > settings.RSS_MAX_RETRY_COUNT:
+                    feed.is_active = False
+                    feed.next_fetch_at = None
+                    metrics.RSS_FETCH_TOTAL.labels(result="paused").inc()
+                    log.warning(f"RSS源连续失败 {feed.error_count} 次，已暂停: {feed.url}, user={feed.user_id}")
+                else:
+                    feed.next_fetch_at = current_time + int(self._retry_delay(feed.error_count) * 1000)
+            self.db.commit()
         except Exception as e:
-            log.warning(f"解析发布时间失败: {str(e)}")
-            return TimeUtil.now_ms()
-            
-    async def process_all_feeds(self) -> None:
-        """处理所有需要更新的RSS源"""
+            log.error(f"记录RSS源失败状态出错: {str(e)}")
+            self.db.rollback()
+
+    async def _ensure_subscription(self, feeds: List[RSSFeed], session: aiohttp.ClientSession) -> None:
+        """源声明了hub且没有即将到期的有效订阅时，向hub发起订阅，hub随后回调验证"""
+        hub_url = None
         try:
-            # 获取所有需要更新的活跃RSS源
-            current_time = TimeUtil.now_ms()
-            feeds = (
-                self.db.query(RSSFeed)
-                .filter(RSSFeed.is_active == True)
-                .filter(
-                    (RSSFeed.last_fetch.is_(None)) |
-                    (current_time > RSSFeed.last_fetch + RSSFeed.fetch_interval * 1000)  # 转换为毫秒
-                )
-                .all()
+            request = await self._run_db(self._prepare_subscription, feeds)
+            if request is None:
+                return
+            hub_url, data = request
+            async with session.post(hub_url, data=data) as response:
+                if response.status >= 400:
+                    raise Exception(f"HTTP {response.status}")
+            metrics.RSS_WEBSUB_EVENTS.labels(event="subscribe_requested").inc()
+            log.info(f"已向WebSub hub发起订阅: {data['hub.topic']} -> {hub_url}")
+        except Exception as e:
+            metrics.RSS_WEBSUB_EVENTS.labels(event="subscribe_failed").inc()
+            log.warning(f"WebSub订阅失败: hub={hub_url}, error={str(e)}")
+
+    def _prepare_subscription(self, feeds: List[RSSFeed]):
+        """生成订阅请求，同一URL只由一个源订阅，推送内容分发给所有订阅者
+        
+        Returns:
+            (hub地址, 订阅参数)，无需订阅时返回None
+        """
+        base_url = settings.WEBSUB_CALLBACK_BASE_URL
+        # 优先沿用已订阅的源，保持回调地址和密钥不变
+        candidates = sorted((feed for feed in feeds if feed.hub_url), key=lambda feed: feed.websub_secret is None)
+        if not base_url or not candidates:
+            return None
+        renew_at = TimeUtil.now_ms() + 2 * settings.RSS_MAX_FETCH_INTERVAL * 1000
+        if any((feed.websub_lease_expires_at or 0) > renew_at for feed in feeds):
+            return None
+        
+        feed = candidates[0]
+        feed.websub_secret = feed.websub_secret or secrets.token_hex(32)
+        feed.websub_topic = feed.websub_topic or feed.url
+        # 记录等待验证的订阅，只有与之匹配的验证请求才会被确认
+        feed.websub_pending_mode = 'subscribe'
+        feed.websub_pending_topic = feed.websub_topic
+        feed.websub_pending_expires_at = TimeUtil.now_ms() + WEBSUB_VERIFY_WINDOW_SECONDS * 1000
+        self.db.commit()
+        token = self._callback_token(feed)
+        return feed.hub_url, {
+            'hub.mode': 'subscribe',
+            'hub.topic': feed.websub_topic,
+            'hub.callback': f"{base_url.rstrip('/')}/api/v1/rss/websub/{feed.id}?token={token}",
+            'hub.lease_seconds': str(settings.WEBSUB_LEASE_SECONDS),
+            'hub.secret': feed.websub_secret,
+        }
+
+    def confirm_subscription(
+        self,
+        feed_id: int,
+        mode: str,
+        topic: Optional[str],
+        challenge: Optional[str],
+        lease_seconds: Optional[int] = None,
+        token: Optional[str] = None
+    ) -> Optional[str]:
+        """处理hub的订阅验证请求
+        
+        订阅验证须携带回调地址中的token，并与本地等待验证的订阅(类型、topic、截止时间)一致
+        
+        Returns:
+            确认时返回需要原样回复的challenge，拒绝时返回None
+        """
+        feed = self.db.get(RSSFeed, feed_id)
+        if mode == 'subscribe':
+            if not self._is_pending(feed, mode, topic, token):
+                return None
+            # hub授予的租期不超过请求的租期
+            lease_seconds = min(lease_seconds or settings.WEBSUB_LEASE_SECONDS, settings.WEBSUB_LEASE_SECONDS)
+            feed.websub_lease_expires_at = TimeUtil.now_ms() + lease_seconds * 1000
+            self._clear_pending(feed)
+            self.db.commit()
+            metrics.RSS_WEBSUB_EVENTS.labels(event="subscribe_verified").inc()
+            log.info(f"WebSub订阅已验证: {topic}, 有效期 {lease_seconds} 秒")
+            return challenge or ""
+        if mode == 'unsubscribe':
+            # 只确认本地已不再需要的订阅
+            if feed is None or not feed.websub_secret:
+                return challenge or ""
+            return None
+        if mode == 'denied':
+            if feed is not None and feed.websub_secret:
+                if not self._valid_token(feed, token):
+                    return None
+                feed.websub_secret = None
+                feed.websub_lease_expires_at = None
+                self._clear_pending(feed)
+                self.db.commit()
+            metrics.RSS_WEBSUB_EVENTS.labels(event="subscribe_denied").inc()
+            log.warning(f"WebSub hub拒绝了订阅: feed_id={feed_id}, topic={topic}")
+            return ""
+        return None
+
+    @staticmethod
+    def _callback_token(feed: RSSFeed) -> str:
+        """由推送密钥派生的回调地址token，续订时保持不变，hub据此识别为同一订阅"""
+        return hmac.new(feed.websub_secret.encode(), f"callback:{feed.id}".encode(), hashlib.sha256).hexdigest()[:32]
+
+    def _valid_token(self, feed: RSSFeed, token: Optional[str]) -> bool:
+        return bool(token) and hmac.compare_digest(token, self._callback_token(feed))
+
+    def _is_pending(self, feed: Optional[RSSFeed], mode: str, topic: Optional[str], token: Optional[str]) -> bool:
+        """验证请求是否与等待验证的订阅一致且未过期"""
+        if feed is None or not feed.websub_secret or not self._valid_token(feed, token):
+            return False
+        return (
+            feed.websub_pending_mode == mode
+            and feed.websub_pending_topic == topic
+            and (feed.websub_pending_expires_at or 0) > TimeUtil.now_ms()
+        )
+
+    @staticmethod
+    def _clear_pending(feed: RSSFeed) -> None:
+        feed.websub_pending_mode = None
+        feed.websub_pending_topic = None
+        feed.websub_pending_expires_at = None
+
+    @staticmethod
+    def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+        """校验推送内容的 X-Hub-Signature 头(method=hexdigest)"""
+        if not signature or '=' not in signature:
+            return False
+        method, digest = signature.split('=', 1)
+        if method not in ('sha1', 'sha256', 'sha384', 'sha512'):
+            return False
+        expected = hmac.new(secret.encode(), body, method).hexdigest()
+        return hmac.compare_digest(expected, digest.strip().lower())
+
+    async def ingest_push(self, feed_id: int, body: bytes, signature: Optional[str]) -> bool:
+        """处理hub推送的内容，签名有效时按与轮询相同的流程为所有订阅该URL的用户创建条目和任务
+        
+        Returns:
+            是否接受了推送内容
+        """
+        status, url, feeds = await self._run_db(self._push_targets, feed_id, body, signature)
+        metrics.RSS_WEBSUB_EVENTS.labels(event=f"push_{status}").inc()
+        if status != "accepted":
+            log.warning(f"忽略WebSub推送: feed_id={feed_id}, 原因={status}")
+            return False
+        
+        if not feeds:
+            return True
+        limit = await self._run_db(self._entry_limit, feeds)
+        keyed_entries, _, _ = await self._parse(body, limit)
+        await self._run_db(
+            self._process_entries, feeds, keyed_entries, {}, hashlib.sha256(body).hexdigest()
+        )
+        log.info(f"已处理WebSub推送: {url}")
+        return True
+
+    def _push_targets(self, feed_id: int, body: bytes, signature: Optional[str]):
+        """校验推送并查询订阅该URL的启用中的源
+        
+        Returns:
+            (结果, URL, 源列表)，结果为 accepted/unknown_feed/invalid_signature
+        """
+        feed = self.db.get(RSSFeed, feed_id)
+        if feed is None or not feed.websub_secret:
+            return "unknown_feed", None, []
+        if not self.verify_signature(feed.websub_secret, body, signature):
+            return "invalid_signature", feed.url, []
+        feeds = self.db.query(RSSFeed).filter(RSSFeed.url == feed.url, RSSFeed.is_active == True).all()
+        return "accepted", feed.url, feeds
+
+    def _due_feeds(self) -> List[RSSFeed]:
+        """查询已到下次抓取时间的活跃RSS源"""
+        current_time = TimeUtil.now_ms()
+        return (
+            self.db.query(RSSFeed)
+            .filter(RSSFeed.is_active == True)
+            .filter(
+                (RSSFeed.next_fetch_at.is_(None)) |
+                (RSSFeed.next_fetch_at <= current_time)
             )
+            .all()
+        )
+
+    async def process_all_feeds(self) -> List[RSSFeed]:
+        """处理所有需要更新的RSS源
+        
+        Returns:
+            本轮处理的RSS源，下次抓取时间已更新
+        """
+        try:
+            # 获取所有需要更新的活跃RSS源
+            feeds = await self._run_db(self._due_feeds)
             
             if not feeds:
                 logger.info("没有需要更新的RSS源")
-                return
+                return []
                 
-            # 限制并发数量，避免系统负载过高
-            chunk_size = 5  # 每批处理5个feeds
-            for i in range(0, len(feeds), chunk_size):
-                chunk = feeds[i:i + chunk_size]
-                tasks = [self.fetch_feed(feed) for feed in chunk]
-                await asyncio.gather(*tasks)
+            # 多个用户订阅的同一URL只抓取和解析一次
+            groups = {}
+            for feed in feeds:
+                groups.setdefault(feed.url, []).append(feed)
+            
+            # 所有源共享一个会话，信号量限制同时抓取的源数量，
+            # 某个源完成后立即开始下一个，慢源不会阻塞其他源
+            semaphore = asyncio.Semaphore(max(1, settings.RSS_CONCURRENT_TASKS))
+            async with self._client_session() as session:
+                async def fetch(group: List[RSSFeed]):
+                    async with semaphore:
+                        try:
+                            await self.fetch_feeds(group, session)
+                        except Exception:
+                            # fetch_feeds 已记录错误，丢弃该源未提交的修改后继续处理其他源
+                            await self._run_db(self.db.rollback)
                 
-                # 在每批处理之间稍作暂停，避免过度占用资源
-                if i + chunk_size < len(feeds):
-                    await asyncio.sleep(1)
+                await asyncio.gather(*(fetch(group) for group in groups.values()))
                     
-            logger.info(f"完成所有RSS源的处理，共处理 {len(feeds)} 个源")
+            logger.info(f"完成所有RSS源的处理，共处理 {len(feeds)} 个源，{len(groups)} 个不同URL")
+            return feeds
                 
         except Exception as e:
             logger.error(f"批量处理RSS源时出错: {str(e)}")
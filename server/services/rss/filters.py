@@ -0,0 +1,48 @@
+import re
+from typing import Dict, Optional
+
+from core.logging import log
+
+
+def entry_skip_reason(filters: Optional[Dict], entry: Dict) -> Optional[str]:
+    """按源的过滤规则检查条目
+
+    Args:
+        filters: 源的过滤规则(RSSEntryFilters)，为空时不过滤
+        entry: parse_feed_document 返回的条目
+
+    Returns:
+        跳过原因，形如 "exclude_keywords:赞助"；条目需要处理时返回None
+    """
+    if not filters:
+        return None
+
+    title = entry.get('title') or ''
+    body = entry.get('content') or entry.get('summary') or ''
+    text = f"{title}\n{body}".lower()
+
+    include_keywords = [keyword for keyword in filters.get('include_keywords') or [] if keyword]
+    if include_keywords and not any(keyword.lower() in text for keyword in include_keywords):
+        return "include_keywords"
+
+    for keyword in filters.get('exclude_keywords') or []:
+        if keyword and keyword.lower() in text:
+            return f"exclude_keywords:{keyword}"
+
+    min_content_length = filters.get('min_content_length')
+    if min_content_length and len(body) < min_content_length:
+        return "min_content_length"
+
+    categories = {category.lower() for category in filters.get('categories') or [] if category}
+    if categories and not categories & {category.lower() for category in entry.get('categories') or []}:
+        return "categories"
+
+    title_pattern = filters.get('title_pattern')
+    if title_pattern:
+        try:
+            if not re.search(title_pattern, title):
+                return "title_pattern"
+        except re.error as e:
+            log.warning(f"忽略无效的标题过滤规则 {title_pattern}: {e}")
+
+    return None
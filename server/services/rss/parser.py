@@ -0,0 +1,89 @@
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+import feedparser
+from bs4 import BeautifulSoup
+
+# 估算发布频率时使用的最近条目数
+CADENCE_SAMPLE_SIZE = 10
+
+
+def cadence_interval(published: List[float]) -> Optional[float]:
+    """根据最近条目的发布时间估算抓取间隔（秒）
+
+    取最近若干条目发布间隔的中位数的一半，使每个发布周期内约抓取两次；
+    带发布时间的条目少于两条时无法估算，返回None
+    """
+    published = sorted(published, reverse=True)[:CADENCE_SAMPLE_SIZE]
+    gaps = [newer - older for newer, older in zip(published, published[1:]) if newer > older]
+    if not gaps:
+        return None
+    return statistics.median(gaps) / 2
+
+
+def parse_feed_document(body: bytes, limit: int) -> Tuple[List[Tuple[Optional[str], Dict]], Optional[float], Dict]:
+    """解析RSS文档
+
+    在独立进程中执行，只返回处理条目需要的字段，减少进程间传输的数据量
+
+    Args:
+        body: RSS文档内容
+        limit: 最多返回的条目数
+
+    Returns:
+        (按发布时间倒序排列的 (guid, 条目) 列表, 根据发布频率估算的抓取间隔, 源信息)，
+        条目缺少guid时guid为None，条目的 published 为毫秒时间戳，缺少发布时间时为None，
+        content 为内嵌正文的纯文本，没有内嵌正文时为None，summary 为摘要的纯文本，categories 为分类列表；
+        源信息包含 ttl 以及 rel="hub"/rel="self" 链接 hub、self
+    """
+    parsed = feedparser.parse(body)
+
+    # 处理条目，按发布时间倒序排序
+    entries = sorted(
+        parsed.entries,
+        key=lambda x: x.get('published_parsed', 0),
+        reverse=True
+    )
+    published = [time.mktime(entry['published_parsed']) for entry in entries if entry.get('published_parsed')]
+    keyed_entries = [
+        (
+            entry.get('id') or entry.get('link'),
+            {
+                'title': entry.get('title'),
+                'link': entry.get('link'),
+                'published': _published_ms(entry),
+                'content': _embedded_content(entry),
+                'summary': _plain_text(entry.get('summary') or '', entry.get('summary_detail', {}).get('type')),
+                'categories': [tag.get('term') for tag in entry.get('tags') or [] if tag.get('term')]
+            }
+        )
+        for entry in entries[:limit]
+    ]
+    links = {link.get('rel'): link.get('href') for link in parsed.feed.get('links', [])}
+    info = {'ttl': parsed.feed.get('ttl'), 'hub': links.get('hub'), 'self': links.get('self')}
+    return keyed_entries, cadence_interval(published), info
+
+
+def _published_ms(entry) -> Optional[int]:
+    """条目发布时间的毫秒时间戳，无法解析时返回None"""
+    try:
+        published_parsed = entry.get('published_parsed')
+        if published_parsed:
+            return int(time.mktime(published_parsed) * 1000)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return None
+
+
+def _embedded_content(entry) -> Optional[str]:
+    """条目内嵌的正文(content:encoded/Atom content)转换为纯文本，有多个时取最长的"""
+    texts = [_plain_text(content.get('value') or '', content.get('type')) for content in entry.get('content') or []]
+    return max(texts, key=len, default=None) or None
+
+
+def _plain_text(value: str, content_type: Optional[str]) -> str:
+    """HTML转换为纯文本，与网页正文提取的清理方式一致"""
+    if 'html' in (content_type or ''):
+        value = BeautifulSoup(value, 'html.parser').get_text('\n')
+    return ' '.join(value.split())
@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import zoneinfo
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+
+from core import metrics
+from core.config import settings
+from core.logging import log
+from db.session import SessionLocal
+from models.enums import TaskStatus
+from models.task import Task
+from utils.time_utils import TimeUtil
+
+
+def parse_window(window: str) -> Optional[Tuple[time, time]]:
+    """解析 "HH:MM-HH:MM" 格式的批处理时段，为空或格式错误时返回None"""
+    if not window:
+        return None
+    try:
+        start, end = (datetime.strptime(part.strip(), "%H:%M").time() for part in window.split("-"))
+    except ValueError:
+        log.warning(f"忽略格式错误的批处理时段: {window}")
+        return None
+    if start == end:
+        return None
+    return start, end
+
+
+def _local_time(now_ms: int) -> datetime:
+    return datetime.fromtimestamp(now_ms / 1000, zoneinfo.ZoneInfo(settings.TIMEZONE))
+
+
+def in_batch_window(now_ms: int) -> bool:
+    """当前是否处于批处理时段，时段可以跨越午夜"""
+    window = parse_window(settings.RSS_BATCH_WINDOW)
+    if window is None:
+        return False
+    start, end = window
+    current = _local_time(now_ms).time()
+    if start < end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+def next_window_start(now_ms: int) -> Optional[int]:
+    """下一个批处理时段的开始时间（毫秒时间戳），未配置时段时返回None"""
+    window = parse_window(settings.RSS_BATCH_WINDOW)
+    if window is None:
+        return None
+    local = _local_time(now_ms)
+    start = datetime.combine(local.date(), window[0], tzinfo=local.tzinfo)
+    if start <= local:
+        start += timedelta(days=1)
+    return TimeUtil.to_ms(start)
+
+
+def deferred_until(now_ms: int) -> Optional[int]:
+    """RSS任务需要延后时返回其最晚开始时间
+
+    配置了批处理时段且当前不在时段内时延后，最多等待 RSS_BATCH_MAX_STALENESS 秒；
+    否则返回None，任务立即执行
+    """
+    if parse_window(settings.RSS_BATCH_WINDOW) is None or in_batch_window(now_ms):
+        return None
+    return now_ms + settings.RSS_BATCH_MAX_STALENESS * 1000
+
+
+class DeferredTaskDispatcher:
+    """延后任务调度器
+
+    批处理时段开始时取出所有延后的任务集中执行，任务处理共用 ThreadPoolManager 的线程池；
+    等待超过 RSS_BATCH_MAX_STALENESS 的任务不等时段开始，到期即执行。
+    新任务延后后通过 notify 唤醒调度器重新计算等待时间
+    """
+    _instance = None
+    _lock = threading.Lock()
+    session_factory = SessionLocal
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+            return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            self._loop: Optional[asyncio.AbstractEventLoop] = None
+            self._wakeup: Optional[asyncio.Event] = None
+            self._task: Optional[asyncio.Task] = None
+            self.initialized = True
+
+    @classmethod
+    def get_instance(cls) -> 'DeferredTaskDispatcher':
+        """获取延后任务调度器实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def start(self):
+        """在当前事件循环中启动调度"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+        log.info("延后任务调度器已启动")
+
+    def shutdown(self):
+        """停止调度，已开始执行的任务继续完成"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._loop = None
+
+    def notify(self):
+        """有新的延后任务，唤醒调度循环重新计算等待时间，可从其他线程调用"""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _claim_due(self, now_ms: int) -> List[str]:
+        """取出应执行的延后任务并清除其延后标记
+
+        处于批处理时段时取出全部延后任务，否则只取出等待超时的任务
+        """
+        window_open = in_batch_window(now_ms)
+        db = self.session_factory()
+        try:
+            query = db.query(Task).filter(
+                Task.status == TaskStatus.PENDING.value,
+                Task.deferred_until.isnot(None)
+            )
+            if not window_open:
+                query = query.filter(Task.deferred_until <= now_ms)
+            tasks = query.order_by(Task.deferred_until).all()
+            for task in tasks:
+                task.deferred_until = None
+            db.commit()
+            task_ids = [task.taskId for task in tasks]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        if task_ids:
+            metrics.RSS_TASKS_DEFERRED.labels(event="window" if window_open else "staleness").inc(len(task_ids))
+        return task_ids
+
+    def _next_delay(self, now_ms: int) -> float:
+        """距最早的延后任务超时、下一个批处理时段开始或下次兜底检查的秒数"""
+        db = self.session_factory()
+        try:
+            earliest = db.query(func.min(Task.deferred_until)).filter(
+                Task.status == TaskStatus.PENDING.value,
+                Task.deferred_until.isnot(None)
+            ).scalar()
+        finally:
+            db.close()
+        # 定期兜底检查，时段配置在运行时修改后也能生效
+        candidates = [now_ms + settings.RSS_MIN_FETCH_INTERVAL * 1000]
+        if earliest is not None:
+            candidates.append(earliest)
+            window_start = next_window_start(now_ms)
+            if window_start is not None:
+                candidates.append(window_start)
+        return max(0, min(candidates) - now_ms) / 1000
+
+    @staticmethod
+    def _start_tasks(task_ids: List[str]):
+        """启动任务处理
+
+        与 FeedManager._start_tasks 相同，execute_task 把任务提交到 ThreadPoolManager
+        并等待其完成，实际并发数由共享线程池的 MAX_TASK_WORKERS 限制
+        """
+        from services.task.task_service import execute_task
+        for task_id in task_ids:
+            threading.Thread(target=execute_task, args=(task_id, False)).start()
+
+    async def _run(self):
+        """调度循环"""
+        while True:
+            try:
+                # 先清除唤醒标记，查询期间到来的通知会在下一轮处理
+                self._wakeup.clear()
+                task_ids = await asyncio.to_thread(self._claim_due, TimeUtil.now_ms())
+                if task_ids:
+                    log.info(f"开始执行延后的任务 {len(task_ids)} 个")
+                    self._start_tasks(task_ids)
+
+                delay = await asyncio.to_thread(self._next_delay, TimeUtil.now_ms())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"延后任务调度器执行出错: {e}")
+                await asyncio.sleep(1)
+
+
+deferred_task_dispatcher = DeferredTaskDispatcher.get_instance()
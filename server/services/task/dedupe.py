@@ -0,0 +1,157 @@
+import json
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core import metrics
+from core.config import settings
+from core.logging import log
+from models.enums import TaskProgress, TaskStatus
+from models.task import Task
+from services.content_cache import canonicalize_url
+from schemas.task import StyleParams
+from services.file import FileService
+
+
+class TaskDeduplicator:
+    """相同任务去重
+
+    规范化URL与风格参数相同的任务生成的音频和字幕完全一致。新任务开始处理前：
+    已有完成的相同任务时，以硬链接共享其文件后直接完成；
+    本进程中已有相同任务正在处理时，排在其后并立即返回，不占用工作线程，
+    处理者结束后由 release 取出重新启动，届时共享其结果或在其失败时自行处理；
+    否则自身作为该组的处理者执行流水线。
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+            return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            # 去重键 -> (处理者任务ID, 开始时间, 排队等待的任务ID)
+            self._inflight: Dict[str, Tuple[str, float, List[str]]] = {}
+            self._inflight_lock = threading.Lock()
+            self.initialized = True
+
+    @classmethod
+    def get_instance(cls) -> 'TaskDeduplicator':
+        """获取任务去重器实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def build_key(url: str, style_params: Optional[Dict]) -> str:
+        """根据规范化URL和风格参数计算去重键，未指定的风格参数按默认值计算"""
+        try:
+            style_params = StyleParams(**(style_params or {})).model_dump()
+        except ValueError:
+            style_params = style_params or {}
+        payload = json.dumps(
+            {"url": canonicalize_url(url), "style_params": style_params},
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def try_reuse(self, task: Task, db: Session) -> bool:
+        """尝试复用相同任务的结果
+
+        Returns:
+            bool: 任务已通过复用完成或已排在进行中的相同任务之后时返回True，需要正常处理时返回False
+        """
+        task.dedupe_key = self.build_key(task.url, task.style_params)
+        db.commit()
+        if not settings.TASK_DEDUPE_ENABLED or task.refresh_content:
+            return False
+
+        if self._reuse_completed(task, db):
+            metrics.TASK_DEDUPE_TOTAL.labels(result="completed").inc()
+            return True
+
+        with self._inflight_lock:
+            leader = self._inflight.get(task.dedupe_key)
+            if leader is None:
+                self._inflight[task.dedupe_key] = (task.taskId, time.monotonic(), [])
+                return False
+            leader_id, started_at, queued = leader
+            # 处理时间过长的处理者可能已停滞，不再排在其后
+            if time.monotonic() - started_at > settings.TASK_DEDUPE_WAIT_TIMEOUT:
+                log.info(f"相同任务处理超时，自行处理: {task.taskId} -> {leader_id}")
+                return False
+            queued.append(task.taskId)
+
+        log.info(f"相同任务正在处理，排队等待其完成: {task.taskId} -> {leader_id}")
+        task.progress_message = "等待相同任务处理完成"
+        db.commit()
+        metrics.TASK_DEDUPE_TOTAL.labels(result="joined").inc()
+        return True
+
+    def release(self, task_id: str) -> List[str]:
+        """任务处理结束(无论成功与否)后取出排在其后的相同任务
+
+        Returns:
+            需要由调用方重新启动的任务ID
+        """
+        followers = []
+        with self._inflight_lock:
+            for key, (leader_id, _, queued) in list(self._inflight.items()):
+                if leader_id == task_id:
+                    del self._inflight[key]
+                    followers.extend(queued)
+        return followers
+
+    def _reuse_completed(self, task: Task, db: Session) -> bool:
+        """查找已完成的相同任务并共享其文件"""
+        source = (
+            db.query(Task)
+            .filter(
+                Task.dedupe_key == task.dedupe_key,
+                Task.status == TaskStatus.COMPLETED.value,
+                Task.taskId != task.taskId
+            )
+            .order_by(Task.updated_at.desc())
+            .first()
+        )
+        if source is None or not source.files:
+            return False
+
+        linked = []
+        files = {}
+        try:
+            for level, langs in source.files.items():
+                for lang, file_types in langs.items():
+                    for file_type, filename in file_types.items():
+                        target = FileService.get_task_file_name(level, lang, file_type, task.taskId)
+                        target_path = FileService.get_task_file_path(task.taskId, target)
+                        FileService.link_file(FileService.get_task_file_path(source.taskId, filename), target_path)
+                        linked.append(target_path)
+                        files.setdefault(level, {}).setdefault(lang, {})[file_type] = target
+        except OSError as e:
+            log.warning(f"共享相同任务的文件失败: {source.taskId} -> {task.taskId}, error: {str(e)}")
+            for path in linked:
+                os.remove(path)
+            return False
+
+        task.files = files
+        task.title = source.title or task.title
+        task.status = TaskStatus.COMPLETED.value
+        task.progress = TaskProgress.COMPLETED.value
+        task.current_step = source.current_step
+        task.current_step_index = source.current_step_index
+        task.total_steps = source.total_steps
+        task.step_progress = 100
+        task.error = None
+        task.progress_message = "已复用相同任务的结果"
+        db.commit()
+        log.info(f"复用相同任务的结果: {source.taskId} -> {task.taskId}")
+        return True
@@ -3,11 +3,13 @@ import sqlalchemy
 from sqlalchemy.orm import Session
 import os
 import time
+import asyncio
 import json
 from concurrent.futures import Future
 
 from models.task import Task
-from models.enums import TaskProgress, TaskStatus
+from models.enums import TaskProgress, TaskStatus, StepRunStatus
+from crud.task_step_run import task_step_run as step_run_crud
 from services.task.steps.audio import AudioStep
 from services.task.steps.audio_merge import AudioMergeStep
 from services.task.steps.content import ContentStep
@@ -21,8 +23,11 @@ from .steps.base import BaseStep
 from core.logging import log
 from core.config import settings
 from core.thread_pool import ThreadPoolManager
+from core.event_loop import EventLoopManager
+from core import metrics
 from services.task.steps.fetch_content import FetchContentStep
 from services.task.steps.generate_title import GenerateTitleStep
+from utils.time_utils import TimeUtil
 
 class TaskProcessor:
     """任务处理器"""
@@ -45,8 +50,11 @@ class TaskProcessor:
         except Exception as e:
             self.db.rollback()
             raise Exception(f"无法刷新任务对象: {str(e)}")
+        # 预先保存taskId，任务被删除后仍可用于日志
+        self.task_id = self.task.taskId
         
         self.context_manager = ContextManager(task, self.temp_dir)
+        self._seed_embedded_content()
         
         # 创建难度等级目录
         self.level_dirs = {}
@@ -60,7 +68,26 @@ class TaskProcessor:
         self.progress_tracker = ProgressTracker(self.task, db, len(self.steps))
         self._update_steps_tracker()
         self.start_step = self._get_start_step(is_retry)
+        self._queued = False
         
+    def _seed_embedded_content(self):
+        """RSS条目内嵌了足够长的正文时预先写入上下文，获取页面内容步骤随之跳过"""
+        if self.context_manager.get("raw_content") or self.task.refresh_content:
+            return
+        entry = next((entry for entry in self.task.rss_entries if entry.content), None)
+        if entry is None:
+            return
+        
+        content_filename = "raw_content.txt"
+        with open(os.path.join(self.temp_dir, content_filename), 'w', encoding='utf-8') as f:
+            f.write(entry.content)
+        self.context_manager.update({
+            "raw_content.txt": content_filename,
+            "raw_content": entry.content,
+            "raw_title": entry.title or self.task.title or "",
+        })
+        log.info(f"使用RSS源内嵌的正文，跳过页面抓取: {self.task_id}")
+
     def _create_steps_without_tracker(self) -> List[BaseStep]:
         """创建处理步骤列表(不包含progress_tracker)"""
         base_params = {
@@ -103,6 +130,8 @@ class TaskProcessor:
     def process_task_async(cls, task: Task, db: Session, is_retry: bool = False) -> Future:
         """异步处理任务
         
+        TASK_ASYNC_RUNTIME 开启时提交到后台事件循环以协程方式执行，否则提交到线程池。
+        
         Args:
             task: Task对象
             db: 数据库会话
@@ -112,6 +141,10 @@ class TaskProcessor:
             Future: 用于跟踪任务执行状态的Future对象
         """
         processor = cls(task, db, is_retry)
+        processor._queued = True
+        metrics.TASK_QUEUE_DEPTH.inc()
+        if settings.TASK_ASYNC_RUNTIME:
+            return EventLoopManager.get_instance().submit(processor.aprocess_task())
         pool = ThreadPoolManager.get_instance()
         return pool.submit(processor.process_task)
 
@@ -121,57 +154,80 @@ class TaskProcessor:
         Args:
             timeout (int, optional): 任务执行超时时间(秒)。默认为None，表示不设置超时。
         """
-        task_id = self.task.taskId  # 预先保存taskId
-        log.info(f"开始处理任务: {task_id}")
+        start_time = self._begin_processing()
+        result = TaskStatus.FAILED.value
         try:
-            start_time = time.time()
             self._execute_steps(timeout=timeout)
             self._complete_task()
-            log.info(f"任务处理完成: {task_id}")
+            result = TaskStatus.COMPLETED.value
+            log.info(f"任务处理完成: {self.task_id}")
         except Exception as e:
-            log.error(f"任务处理失败: {task_id}, error: {str(e)}")
-            try:
-                self._handle_failure(e)
-            except (sqlalchemy.orm.exc.ObjectDeletedError, sqlalchemy.exc.InvalidRequestError):
-                # 任务已被删除，记录日志并优雅退出
-                log.warning(f"Task has been deleted during processing: {task_id}")
+            if self._handle_task_error(e):
+                result = "deleted"
                 return
             raise
+        finally:
+            self._end_processing(result, start_time)
+
+    async def aprocess_task(self, timeout: int = None):
+        """在事件循环中处理任务，参数同 process_task"""
+        start_time = self._begin_processing()
+        result = TaskStatus.FAILED.value
+        try:
+            await self._aexecute_steps(timeout=timeout)
+            await asyncio.to_thread(self._complete_task)
+            result = TaskStatus.COMPLETED.value
+            log.info(f"任务处理完成: {self.task_id}")
+        except Exception as e:
+            if await asyncio.to_thread(self._handle_task_error, e):
+                result = "deleted"
+                return
+            raise
+        finally:
+            self._end_processing(result, start_time)
+
+    def _begin_processing(self) -> float:
+        """记录任务开始处理，返回开始时间"""
+        log.info(f"开始处理任务: {self.task_id}")
+        if self._queued:
+            self._queued = False
+            metrics.TASK_QUEUE_DEPTH.dec()
+        metrics.TASK_ACTIVE_WORKERS.inc()
+        return time.time()
+
+    def _end_processing(self, result: str, start_time: float):
+        """记录任务处理结果和耗时"""
+        metrics.TASK_ACTIVE_WORKERS.dec()
+        metrics.TASKS_TOTAL.labels(status=result).inc()
+        metrics.TASK_DURATION.labels(status=result).observe(time.time() - start_time)
+
+    def _handle_task_error(self, error: Exception) -> bool:
+        """处理任务失败
+
+        Returns:
+            bool: 任务已在处理过程中被删除时返回True
+        """
+        log.error(f"任务处理失败: {self.task_id}, error: {str(error)}")
+        try:
+            self._handle_failure(error)
+        except (sqlalchemy.orm.exc.ObjectDeletedError, sqlalchemy.exc.InvalidRequestError):
+            # 任务已被删除，记录日志并优雅退出
+            log.warning(f"Task has been deleted during processing: {self.task_id}")
+            return True
+        return False
 
     def _execute_steps(self, timeout: int = None):
         """执行所有步骤"""
         try:
-            # 在每次重要操作前刷新任务对象
-            try:
-                # 重新从数据库加载任务对象
-                self.task = self.db.merge(self.task)
-                self.db.refresh(self.task)
-            except Exception as e:
-                self.db.rollback()
-                raise Exception(f"无法刷新任务对象: {str(e)}")
-            
-            # 更新总步骤数
-            self.task.total_steps = len(self.steps)
-            self.task.status = TaskStatus.PROCESSING.value
-            self.task.progress = TaskProgress.PROCESSING.value
-            self.task.progress_message = "开始执行任务"
-            
-            try:
-                self.db.commit()
-            except Exception as e:
-                self.db.rollback()
-                raise Exception(f"更新任务状态失败: {str(e)}")
+            self._start_steps()
             
             start_time = time.time()
             for i, step in enumerate(self.steps[self.start_step:], self.start_step):
-                if timeout and (time.time() - start_time) > timeout:
-                    raise Exception(f"任务执行超时(超过{timeout}秒)")
+                self._check_timeout(start_time, timeout)
                 
                 # 每个步骤开始前刷新任务对象
                 try:
-                    # 重新从数据库加载任务对象
-                    self.task = self.db.merge(self.task)
-                    self.db.refresh(self.task)
+                    self._refresh_task()
                     self._execute_single_step(step, i)
                 except Exception as e:
                     log.error(f"步骤执行失败: {str(e)}")
@@ -184,48 +240,177 @@ class TaskProcessor:
             self.db.rollback()
             raise e
 
-    def _execute_single_step(self, step: BaseStep, step_index: int):
-        """执行单个步骤，失败时自动重试"""
-        level = getattr(step, 'level', None)
-        if level:
-            self.context_manager.set('current_level', level)
-            self.context_manager.set('level_dir', self.level_dirs[level])
+    async def _aexecute_steps(self, timeout: int = None):
+        """在事件循环中依次执行所有步骤，数据库读写均在线程池中执行"""
+        try:
+            await asyncio.to_thread(self._start_steps)
             
-        self.context_manager.set('current_step_index', step_index)
+            start_time = time.time()
+            for i, step in enumerate(self.steps[self.start_step:], self.start_step):
+                self._check_timeout(start_time, timeout)
+                try:
+                    await asyncio.to_thread(self._refresh_task)
+                    await self._aexecute_single_step(step, i)
+                except Exception as e:
+                    log.error(f"步骤执行失败: {str(e)}")
+                    raise e
+                
+        except sqlalchemy.exc.InvalidRequestError as e:
+            await asyncio.to_thread(self.db.rollback)
+            raise Exception(f"任务可能已被删除: {str(e)}")
+        except Exception as e:
+            await asyncio.to_thread(self.db.rollback)
+            raise e
+
+    def _refresh_task(self):
+        """重新从数据库加载任务对象"""
+        self.task = self.db.merge(self.task)
+        self.db.refresh(self.task)
+
+    def _start_steps(self):
+        """刷新任务对象并将任务标记为处理中"""
+        # 在每次重要操作前刷新任务对象
+        try:
+            self._refresh_task()
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"无法刷新任务对象: {str(e)}")
+        
+        # 更新总步骤数
+        self.task.total_steps = len(self.steps)
+        self.task.status = TaskStatus.PROCESSING.value
+        self.task.progress = TaskProgress.PROCESSING.value
+        self.task.progress_message = "开始执行任务"
         
+        try:
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"更新任务状态失败: {str(e)}")
+
+    @staticmethod
+    def _check_timeout(start_time: float, timeout: int = None):
+        if timeout and (time.time() - start_time) > timeout:
+            raise Exception(f"任务执行超时(超过{timeout}秒)")
+
+    def _execute_single_step(self, step: BaseStep, step_index: int):
+        """执行单个步骤，失败时自动重试"""
+        started_at = self._prepare_step(step, step_index)
         retry_count = 0
-        last_error = None
         
         while retry_count <= self.MAX_STEP_RETRIES:
             try:
-                self._update_step_progress(step, step_index, 0, 
-                    "开始执行" if retry_count == 0 else f"第{retry_count}次重试")
-                
-                if self._should_execute_step(step):
-                    log.info(f"步骤 {step.name} 需要执行" + 
-                            (f" (重试 {retry_count})" if retry_count > 0 else ""))
+                if self._start_attempt(step, step_index, retry_count):
                     result = step.execute()
-                    self._handle_step_success(step, result, step_index)
+                    self._finish_step(step, result, step_index, started_at, retry_count + 1)
                 else:
-                    log.info(f"步骤 {step.name} 已完成，跳过执行")
-                    self._load_completed_step(step, step_index)
+                    self._skip_step(step, step_index, started_at)
                 return  # 执行成功，直接返回
                 
             except Exception as e:
-                last_error = e
                 retry_count += 1
-                
                 if retry_count <= self.MAX_STEP_RETRIES:
                     log.warning(f"步骤 {step.name} 执行失败，{self.RETRY_DELAY}秒后进行第{retry_count}次重试。错误: {str(e)}")
                     time.sleep(self.RETRY_DELAY)
                     continue
+                self._fail_step(step, step_index, started_at, retry_count, e)
+
+    async def _aexecute_single_step(self, step: BaseStep, step_index: int):
+        """在事件循环中执行单个步骤，重试策略同 _execute_single_step
+
+        进度更新、上下文保存和步骤记录涉及数据库提交与文件写入，通过 asyncio.to_thread 执行
+        """
+        started_at = await asyncio.to_thread(self._prepare_step, step, step_index)
+        retry_count = 0
+        
+        while retry_count <= self.MAX_STEP_RETRIES:
+            try:
+                if await asyncio.to_thread(self._start_attempt, step, step_index, retry_count):
+                    result = await step.aexecute()
+                    await asyncio.to_thread(self._finish_step, step, result, step_index, started_at, retry_count + 1)
+                else:
+                    await asyncio.to_thread(self._skip_step, step, step_index, started_at)
+                return
                 
-                # 如果已达到最大重试次数，记录错误并重新抛出异常
-                log.error(f"步骤 {step.name} 在重试{self.MAX_STEP_RETRIES}次后仍然失败")
-                self._handle_step_failure(step, last_error)
-                
-                # 抛出特殊异常以触发整个任务的重试
-                raise TaskError(f"步骤 {step.name} 执行失败，需要重试整个任务: {str(last_error)}")
+            except Exception as e:
+                retry_count += 1
+                if retry_count <= self.MAX_STEP_RETRIES:
+                    log.warning(f"步骤 {step.name} 执行失败，{self.RETRY_DELAY}秒后进行第{retry_count}次重试。错误: {str(e)}")
+                    await asyncio.sleep(self.RETRY_DELAY)
+                    continue
+                await asyncio.to_thread(self._fail_step, step, step_index, started_at, retry_count, e)
+
+    def _prepare_step(self, step: BaseStep, step_index: int) -> int:
+        """设置步骤上下文并重置用量统计，返回开始时间(毫秒)"""
+        level = getattr(step, 'level', None)
+        if level:
+            self.context_manager.set('current_level', level)
+            self.context_manager.set('level_dir', self.level_dirs[level])
+            
+        self.context_manager.set('current_step_index', step_index)
+        step.reset_usage()
+        return TimeUtil.now_ms()
+
+    def _start_attempt(self, step: BaseStep, step_index: int, retry_count: int) -> bool:
+        """开始一次步骤执行尝试，返回步骤是否需要执行"""
+        step.retrying = retry_count > 0 or self.is_retry
+        self._update_step_progress(step, step_index, 0, 
+            "开始执行" if retry_count == 0 else f"第{retry_count}次重试")
+        
+        if self._should_execute_step(step):
+            log.info(f"步骤 {step.name} 需要执行" + 
+                    (f" (重试 {retry_count})" if retry_count > 0 else ""))
+            return True
+        log.info(f"步骤 {step.name} 已完成，跳过执行")
+        return False
+
+    def _finish_step(self, step: BaseStep, result: Dict, step_index: int, started_at: int, attempts: int):
+        self._handle_step_success(step, result, step_index)
+        self._record_step_run(step, step_index, StepRunStatus.COMPLETED, started_at, attempts)
+
+    def _skip_step(self, step: BaseStep, step_index: int, started_at: int):
+        self._load_completed_step(step, step_index)
+        self._record_step_run(step, step_index, StepRunStatus.SKIPPED, started_at, 0)
+
+    def _fail_step(self, step: BaseStep, step_index: int, started_at: int, retry_count: int, error: Exception):
+        """记录步骤最终失败，并抛出 TaskError 以触发整个任务的重试"""
+        log.error(f"步骤 {step.name} 在重试{self.MAX_STEP_RETRIES}次后仍然失败")
+        self._handle_step_failure(step, error)
+        self._record_step_run(step, step_index, StepRunStatus.FAILED,
+                              started_at, retry_count, error=error)
+        raise TaskError(f"步骤 {step.name} 执行失败，需要重试整个任务: {str(error)}")
+
+    def _record_step_run(self, step: BaseStep, step_index: int, status: StepRunStatus,
+                         started_at: int, attempts: int, error: Exception = None):
+        """持久化步骤执行记录，记录失败不影响任务执行"""
+        finished_at = TimeUtil.now_ms()
+        metrics.STEP_DURATION.labels(step_type=type(step).__name__, status=status.value).observe(
+            (finished_at - started_at) / 1000
+        )
+        try:
+            step_run_crud.create(
+                self.db,
+                task_id=self.task.taskId,
+                step_index=step_index,
+                step_name=step.name,
+                step_type=type(step).__name__,
+                level=getattr(step, 'level', None),
+                lang=getattr(step, 'lang', None),
+                status=status.value,
+                attempts=attempts,
+                started_at=started_at,
+                finished_at=finished_at,
+                duration_ms=finished_at - started_at,
+                provider=step.usage["provider"],
+                calls=step.usage["calls"],
+                tokens=step.usage["tokens"],
+                characters=step.usage["characters"],
+                error_class=type(error).__name__ if error else None,
+                error_message=str(error)[:1000] if error else None
+            )
+        except Exception as e:
+            self.db.rollback()
+            log.warning(f"保存步骤执行记录失败: {step.name}, error: {str(e)}")
 
     def _should_execute_step(self, step: BaseStep) -> bool:
         """检查步骤是否需要执行"""
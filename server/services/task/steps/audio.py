@@ -1,5 +1,6 @@
 import json
-from typing import Dict, List
+import asyncio
+from typing import Dict, List, Tuple
 import os
 import shutil
 from pydub import AudioSegment
@@ -9,9 +10,13 @@ from services.task.utils.context import ContextManager
 from utils.decorators import error_handler
 from .base import BaseStep
 from services.edgetts import EdgeTTSService
-from openai import OpenAI
+from services.client_pool import ClientPool
+from openai import AsyncOpenAI, OpenAI, RateLimitError
 from core.config import settings
 from core.logging import log
+from core.event_loop import loop_semaphore, run_cpu
+from core.metrics import track_provider_call
+from services.rate_limiter import RateLimiter, RateLimiterRegistry, retry_after_seconds
 from services.task.utils.progress_tracker import ProgressTracker
 
 class AudioStep(BaseStep):
@@ -31,11 +36,37 @@ class AudioStep(BaseStep):
         )
         self.level = level
         self.lang = lang
-        self.edge_tts = EdgeTTSService()
-        self.openai_tts = OpenAI(
-            base_url=settings.TTS_BASE_URL,
-            api_key=settings.TTS_API_KEY
-        )
+        
+    @property
+    def edge_tts(self) -> EdgeTTSService:
+        """共享的Edge TTS服务"""
+        return ClientPool.get_instance().get_edge_tts()
+        
+    @property
+    def openai_tts(self) -> OpenAI:
+        """共享的OpenAI TTS客户端，配置变更后自动重建"""
+        return ClientPool.get_instance().get_openai_tts()
+        
+    @property
+    def async_openai_tts(self) -> AsyncOpenAI:
+        """共享的异步OpenAI TTS客户端"""
+        return ClientPool.get_instance().get_async_openai_tts()
+        
+    @property
+    def tts_provider(self) -> str:
+        """当前使用的TTS服务标识"""
+        if settings.USE_OPENAI_TTS_MODEL:
+            return f"openai-tts:{settings.TTS_MODEL}"
+        return "edge-tts"
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """当前TTS端点的限流器"""
+        if settings.USE_OPENAI_TTS_MODEL:
+            endpoint = f"{settings.TTS_BASE_URL}|{settings.TTS_MODEL}"
+        else:
+            endpoint = "edge-tts"
+        return RateLimiterRegistry.get_instance().get("tts", endpoint)
         
     def _verify_audio_file(self, file_path: str) -> bool:
         """验证音频文件是否有效"""
@@ -60,18 +91,21 @@ class AudioStep(BaseStep):
         """生成音频文件，支持重试"""
         for attempt in range(max_retries):
             try:
+                self.rate_limiter.acquire()
+                self.record_usage(provider=self.tts_provider, characters=len(item['content']))
+                with track_provider_call("tts", self.tts_provider):
+                    if settings.USE_OPENAI_TTS_MODEL:
+                        audio_content = self._sync_openai_tts_request(item['content'], anchor_type)
+                        if audio_content is None:
+                            raise Exception("OpenAI TTS 返回空内容")
+                    else:
+                        temp_audio_file = self.edge_tts.generate_speech(item['content'], anchor_type)
+                        if not temp_audio_file or not os.path.exists(temp_audio_file):
+                            raise Exception("Edge TTS 生成失败")
+                
                 if settings.USE_OPENAI_TTS_MODEL:
-                    audio_content = self._sync_openai_tts_request(item['content'], anchor_type)
-                    if audio_content is None:
-                        raise Exception("OpenAI TTS 返回空内容")
-                    
-                    with open(file_path, 'wb') as f:
-                        f.write(audio_content)
+                    self._write_audio_file(file_path, audio_content)
                 else:
-                    temp_audio_file = self.edge_tts.generate_speech(item['content'], anchor_type)
-                    if not temp_audio_file or not os.path.exists(temp_audio_file):
-                        raise Exception("Edge TTS 生成失败")
-                    
                     shutil.move(temp_audio_file, file_path)
                 
                 # 验证生成的音频文件
@@ -96,26 +130,53 @@ class AudioStep(BaseStep):
                 
         return False
     
+    async def _agenerate_audio_with_retry(self, item: dict, file_path: str, anchor_type: str, max_retries: int = 3) -> bool:
+        """_generate_audio_with_retry 的协程版本，文件写入和音频校验交给线程池"""
+        for attempt in range(max_retries):
+            try:
+                await self.rate_limiter.aacquire()
+                self.record_usage(provider=self.tts_provider, characters=len(item['content']))
+                async with loop_semaphore("tts", settings.ASYNC_MAX_INFLIGHT_CALLS):
+                    with track_provider_call("tts", self.tts_provider):
+                        if settings.USE_OPENAI_TTS_MODEL:
+                            audio_content = await self._async_openai_tts_request(item['content'], anchor_type)
+                            if audio_content is None:
+                                raise Exception("OpenAI TTS 返回空内容")
+                        else:
+                            temp_audio_file = await self.edge_tts.agenerate_speech(item['content'], anchor_type)
+                            if not temp_audio_file or not os.path.exists(temp_audio_file):
+                                raise Exception("Edge TTS 生成失败")
+                
+                if settings.USE_OPENAI_TTS_MODEL:
+                    await asyncio.to_thread(self._write_audio_file, file_path, audio_content)
+                else:
+                    await asyncio.to_thread(shutil.move, temp_audio_file, file_path)
+                
+                if await run_cpu(self._verify_audio_file, file_path):
+                    return True
+                    
+                log.warning(f"音频文件验证失败，尝试重试 {attempt + 1}/{max_retries}")
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1 * (attempt + 1))
+                    
+            except Exception as e:
+                log.error(f"音频生成失败 (尝试 {attempt + 1}/{max_retries}): {str(e)}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1 * (attempt + 1))
+                continue
+                
+        return False
+
+    @staticmethod
+    def _write_audio_file(file_path: str, audio_content: bytes):
+        with open(file_path, 'wb') as f:
+            f.write(audio_content)
+    
     def _execute(self, context_manager: ContextManager) -> Dict:
         """执行音频生成步骤"""
-        level_dir = context_manager.get("level_dir")
-        if not level_dir:
-            raise ValueError(f"缺少{self.level}难度等级目录")
-            
-        dialogue_key = f"{self.level}/dialogue_{self.lang}.json"
-        dialogue_filename = context_manager.get(dialogue_key)
-        if not dialogue_filename:
-            raise ValueError(f"缺少{self.lang}对话内容")
-            
-        # 从文件读取对话内容
-        dialogue_path = os.path.join(level_dir, dialogue_filename)
-        
-        with open(dialogue_path, 'r', encoding='utf-8') as f:
-            dialogue = json.load(f)
-        
-        if not dialogue:
-            raise ValueError("对话内容为空")
-            
+        level_dir, dialogue = self._load_dialogue(context_manager)
         step_index = int(context_manager.get('current_step_index', 0))
         audio_files = []
         total = len(dialogue)
@@ -129,15 +190,10 @@ class AudioStep(BaseStep):
                 message=f"正在合成第 {i+1}/{total} 条对话"
             )
             
-            anchor_type = settings.ANCHOR_TYPE_MAP.get(
-                item['role']+f"_{self.lang}", 
-                settings.ANCHOR_TYPE_MAP['default']
-            )
-
-            audio_filename = f"{i:04d}_{self.lang}_{item['role']}.mp3"
+            audio_filename = self._audio_filename(i, item)
             file_path = os.path.join(level_dir, audio_filename)
             
-            if not self._generate_audio_with_retry(item, file_path, anchor_type):
+            if not self._generate_audio_with_retry(item, file_path, self._anchor_type(item)):
                 raise Exception(f"第 {i+1} 条{self.lang}对话音频生成失败，已重试最大次数:{item['content']}")
             
             audio_files.append({
@@ -146,7 +202,76 @@ class AudioStep(BaseStep):
                 "filename": audio_filename
             })
         
-        # 保存音频文件列表
+        return self._save_audio_files(level_dir, audio_files)
+
+    async def _aexecute(self, context_manager: ContextManager) -> Dict:
+        """并发合成所有对话的音频，同时进行的请求数受 ASYNC_MAX_INFLIGHT_CALLS 约束"""
+        level_dir, dialogue = self._load_dialogue(context_manager)
+        step_index = int(context_manager.get('current_step_index', 0))
+        total = len(dialogue)
+        finished = 0
+
+        async def generate(i: int, item: dict) -> dict:
+            nonlocal finished
+            audio_filename = self._audio_filename(i, item)
+            file_path = os.path.join(level_dir, audio_filename)
+            if not await self._agenerate_audio_with_retry(item, file_path, self._anchor_type(item)):
+                raise Exception(f"第 {i+1} 条{self.lang}对话音频生成失败，已重试最大次数:{item['content']}")
+
+            finished += 1
+            await asyncio.to_thread(
+                self.progress_tracker.update_progress,
+                step_index=step_index,
+                step_name=self.name,
+                progress=int(finished / total * 100),
+                message=f"已合成 {finished}/{total} 条对话"
+            )
+            return {
+                "index": i,
+                "role": item["role"],
+                "filename": audio_filename
+            }
+
+        audio_files = await asyncio.gather(*(generate(i, item) for i, item in enumerate(dialogue)))
+        return self._save_audio_files(level_dir, list(audio_files))
+
+    def _load_dialogue(self, context_manager: ContextManager) -> Tuple[str, List[Dict]]:
+        """读取待合成的对话内容
+
+        Returns:
+            Tuple[str, List[Dict]]: (难度等级目录, 对话列表)
+        """
+        level_dir = context_manager.get("level_dir")
+        if not level_dir:
+            raise ValueError(f"缺少{self.level}难度等级目录")
+            
+        dialogue_key = f"{self.level}/dialogue_{self.lang}.json"
+        dialogue_filename = context_manager.get(dialogue_key)
+        if not dialogue_filename:
+            raise ValueError(f"缺少{self.lang}对话内容")
+            
+        # 从文件读取对话内容
+        dialogue_path = os.path.join(level_dir, dialogue_filename)
+        
+        with open(dialogue_path, 'r', encoding='utf-8') as f:
+            dialogue = json.load(f)
+        
+        if not dialogue:
+            raise ValueError("对话内容为空")
+        return level_dir, dialogue
+
+    def _anchor_type(self, item: dict) -> str:
+        """对话角色对应的发音人"""
+        return settings.ANCHOR_TYPE_MAP.get(
+            item['role']+f"_{self.lang}", 
+            settings.ANCHOR_TYPE_MAP['default']
+        )
+
+    def _audio_filename(self, index: int, item: dict) -> str:
+        return f"{index:04d}_{self.lang}_{item['role']}.mp3"
+
+    def _save_audio_files(self, level_dir: str, audio_files: List[Dict]) -> Dict:
+        """保存音频文件列表"""
         audio_files_filename = f"audio_files_{self.lang}.json"
         audio_files_path = os.path.join(level_dir, audio_files_filename)
         
@@ -169,5 +294,23 @@ class AudioStep(BaseStep):
             )
             return response.content
         except Exception as e:
+            if isinstance(e, RateLimitError):
+                self.rate_limiter.report_throttled(retry_after_seconds(e))
+            log.error(f"音频生成失败: {str(e)}")
+            return None
+
+    async def _async_openai_tts_request(self, text, anchor_type):
+        """异步方式调用 OpenAI TTS"""
+        log.info(f"正在使用OpenAI语音接口生成音频，文本: {text}, 角色: {anchor_type}")
+        try:
+            response = await self.async_openai_tts.audio.speech.create(
+                model=settings.TTS_MODEL,
+                voice=anchor_type,
+                input=text
+            )
+            return response.content
+        except Exception as e:
+            if isinstance(e, RateLimitError):
+                self.rate_limiter.report_throttled(retry_after_seconds(e))
             log.error(f"音频生成失败: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -10,6 +10,9 @@ from services.task.utils.progress_tracker import ProgressTracker
 from services.file import FileService
 
 class AudioMergeStep(BaseStep):
+    # 解码和拼接音频，属于CPU密集的步骤
+    CPU_BOUND = True
+
     def __init__(
         self,
         level: str,
@@ -1,12 +1,18 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
+import asyncio
+import threading
 
 from ..utils.context import ContextManager
 from ..utils.errors import StepInputError, StepOutputError
 from ..utils.progress_tracker import ProgressTracker
+from core.event_loop import run_cpu
 from core.logging import log
 
 class BaseStep(ABC):
+    # 是否为CPU密集的步骤，事件循环模式下交给CPU线程池执行
+    CPU_BOUND = False
+
     def __init__(
         self,
         name: str,
@@ -20,22 +26,61 @@ class BaseStep(ABC):
         self.output_files = output_files
         self.progress_tracker = progress_tracker
         self.context_manager = context_manager
+        # 重试执行时不读取LLM响应缓存，避免重复使用导致失败的结果
+        self.retrying = False
+        self._usage_lock = threading.Lock()
+        self.reset_usage()
+        
+    def reset_usage(self):
+        """重置步骤的外部服务用量统计"""
+        with self._usage_lock:
+            self.usage = {
+                "provider": None,
+                "calls": 0,
+                "tokens": 0,
+                "characters": 0
+            }
+    
+    def record_usage(self, provider: Optional[str] = None, calls: int = 1,
+                     tokens: int = 0, characters: int = 0):
+        """记录一次外部服务调用的用量
+        
+        Args:
+            provider: 服务提供方，如模型名称或TTS引擎
+            calls: 调用次数
+            tokens: LLM token 用量
+            characters: 处理的字符数
+        """
+        with self._usage_lock:
+            if provider:
+                self.usage["provider"] = provider
+            self.usage["calls"] += calls
+            self.usage["tokens"] += tokens or 0
+            self.usage["characters"] += characters or 0
         
     def execute(self) -> Dict:
         """执行步骤"""
-        # 验证输入
+        self._check_inputs()
+        result = self._execute(self.context_manager)
+        return self._check_result(result)
+
+    async def aexecute(self) -> Dict:
+        """在事件循环中执行步骤"""
+        self._check_inputs()
+        result = await self._aexecute(self.context_manager)
+        return self._check_result(result)
+
+    def _check_inputs(self):
+        """验证输入，缺少输入时抛出异常"""
         missing_inputs = self._validate_inputs(self.context_manager)
         if missing_inputs:
             raise StepInputError(self.name, missing_inputs)
-            
-        # 执行步骤
-        result = self._execute(self.context_manager)
+
+    def _check_result(self, result: Dict) -> Dict:
+        """验证输出，输出不完整时抛出异常"""
         log.info(f"步骤 {self.name} 执行结果: {result}")
-        
-        # 验证输出
         if not self._validate_outputs(result):
             raise StepOutputError(self.name, f"步骤输出不完整，当前输出: {result}")
-            
         return result
         
     def _validate_inputs(self, context_manager: ContextManager) -> List[str]:
@@ -63,3 +108,13 @@ class BaseStep(ABC):
     def _execute(self, context_manager: ContextManager) -> Dict:
         """具体步骤实现"""
         pass
+
+    async def _aexecute(self, context_manager: ContextManager) -> Dict:
+        """步骤的协程实现
+
+        默认在线程池中执行同步的 _execute：CPU密集的步骤(CPU_BOUND)使用CPU线程池，
+        其余使用默认线程池。I/O密集的步骤可覆盖此方法直接使用异步客户端。
+        """
+        if self.CPU_BOUND:
+            return await run_cpu(self._execute, context_manager)
+        return await asyncio.to_thread(self._execute, context_manager)
@@ -6,11 +6,15 @@ from services.task.utils.progress_tracker import ProgressTracker
 from services.task.steps.base import BaseStep
 from services.task.utils.context import ContextManager
 from services.llm import LLMService
-from utils.prompt_utils import PromptUtils
+from services.content_condenser import ContentCondenser
+from core.config import settings
 from core.logging import log
 
 
 class ContentStep(BaseStep):
+    LEVELS = ("elementary", "intermediate", "advanced")
+    MULTI_LEVEL_TEMPLATE = "content_processing_multi_level"
+    
     def __init__(
         self,
         level: str,
@@ -29,6 +33,38 @@ class ContentStep(BaseStep):
         
     def _execute(self, context_manager: ContextManager) -> Dict:
         """执行内容处理步骤"""
+        level_dir, raw_content = self._get_inputs(context_manager)
+        
+        # 长文先分段精简到token预算以内
+        raw_content = self._get_source_content(context_manager, raw_content)
+            
+        # 合并生成模式下一次调用生成所有难度的内容，当前难度失败时回退到单独调用
+        processed_content = None
+        if settings.CONTENT_MULTI_LEVEL_MODE and self._is_first_generation(context_manager):
+            processed_content = self._process_all_levels(raw_content, context_manager)
+        
+        # 根据难度等级处理内容
+        if processed_content is None:
+            processed_content = self._process_content_by_level(raw_content)
+        
+        return self._save_content(level_dir, processed_content)
+
+    async def _aexecute(self, context_manager: ContextManager) -> Dict:
+        """在事件循环中执行内容处理步骤，流程同 _execute"""
+        level_dir, raw_content = self._get_inputs(context_manager)
+        raw_content = await self._aget_source_content(context_manager, raw_content)
+
+        processed_content = None
+        if settings.CONTENT_MULTI_LEVEL_MODE and self._is_first_generation(context_manager):
+            processed_content = await self._aprocess_all_levels(raw_content, context_manager)
+
+        if processed_content is None:
+            processed_content = await self._aprocess_content_by_level(raw_content)
+
+        return self._save_content(level_dir, processed_content)
+
+    def _get_inputs(self, context_manager: ContextManager):
+        """校验并获取难度等级目录和原始内容"""
         level_dir = context_manager.get("level_dir")
         if not level_dir:
             raise ValueError(f"缺少{self.level}难度等级目录")
@@ -40,11 +76,10 @@ class ContentStep(BaseStep):
             raise ValueError("缺少原始内容")
         if not title:
             raise ValueError("缺少标题")
-            
-        # 根据难度等级处理内容
-        processed_content = self._process_content_by_level(raw_content)
-        
-        # 保存处理后的内容到文件
+        return level_dir, raw_content
+
+    def _save_content(self, level_dir: str, processed_content: str) -> Dict:
+        """保存处理后的内容到文件"""
         content_path = os.path.join(level_dir, "content.txt")
         
         with open(content_path, 'w', encoding='utf-8') as f:
@@ -58,24 +93,140 @@ class ContentStep(BaseStep):
         """根据难度等级处理内容"""
         log.info(f"开始处理{self.level}难度内容")
         try:
-            template_name = f"content_processing_{self.level}"
-            chat_prompt = PromptUtils.create_chat_prompt(template_name)
-            chain = chat_prompt | self.llm_service.llm
-            
-            response = chain.invoke({
-                "content": content,
-                "level": self.level,
-                "style_params": self.context_manager.get("style_params", {})
-            })
-            
-            processed_content = response.content if hasattr(response, 'content') else str(response)
-            if not processed_content or not processed_content.strip():
-                raise ValueError("处理后的内容为空")
-            
-            processed_content = processed_content.strip()
-            log.info(f"成功处理{self.level}难度内容")
-            return processed_content
-            
+            processed_content = self.llm_service.invoke(
+                f"content_processing_{self.level}", self._level_inputs(content), step=self,
+                validate=self._validate_content
+            )
+            return self._clean_content(processed_content)
+        except Exception as e:
+            log.error(f"处理{self.level}难度内容失败: {str(e)}")
+            raise ValueError(f"内容处理失败: {str(e)}")
+
+    async def _aprocess_content_by_level(self, content: str) -> str:
+        """_process_content_by_level 的协程版本"""
+        log.info(f"开始处理{self.level}难度内容")
+        try:
+            processed_content = await self.llm_service.ainvoke(
+                f"content_processing_{self.level}", self._level_inputs(content), step=self,
+                validate=self._validate_content
+            )
+            return self._clean_content(processed_content)
         except Exception as e:
             log.error(f"处理{self.level}难度内容失败: {str(e)}")
             raise ValueError(f"内容处理失败: {str(e)}")
+
+    def _level_inputs(self, content: str) -> Dict:
+        return {
+            "content": content,
+            "level": self.level,
+            "style_params": self.context_manager.get("style_params", {})
+        }
+
+    @staticmethod
+    def _validate_content(processed_content: str) -> None:
+        """校验改写结果，空内容不写入缓存"""
+        if not processed_content or not processed_content.strip():
+            raise ValueError("处理后的内容为空")
+
+    def _clean_content(self, processed_content: str) -> str:
+        self._validate_content(processed_content)
+        processed_content = processed_content.strip()
+        log.info(f"成功处理{self.level}难度内容")
+        return processed_content
+
+    def _get_source_content(self, context_manager: ContextManager, raw_content: str) -> str:
+        """获取用于改写的原文，超长时使用精简结果(各难度共享)"""
+        condensed = context_manager.get("condensed_content")
+        if condensed:
+            return condensed
+        
+        source = ContentCondenser(self.llm_service).condense(raw_content, step=self)
+        if source != raw_content:
+            context_manager.set("condensed_content", source)
+        return source
+
+    async def _aget_source_content(self, context_manager: ContextManager, raw_content: str) -> str:
+        """_get_source_content 的协程版本"""
+        condensed = context_manager.get("condensed_content")
+        if condensed:
+            return condensed
+
+        source = await ContentCondenser(self.llm_service).acondense(raw_content, step=self)
+        if source != raw_content:
+            context_manager.set("condensed_content", source)
+        return source
+
+    def _is_first_generation(self, context_manager: ContextManager) -> bool:
+        """所有难度的内容都尚未生成时才使用合并生成"""
+        for level in self.LEVELS:
+            level_dir = context_manager.get(f"{level}_dir")
+            if not level_dir or os.path.exists(os.path.join(level_dir, "content.txt")):
+                return False
+        return True
+
+    def _process_all_levels(self, content: str, context_manager: ContextManager):
+        """一次调用生成所有难度的内容
+
+        校验通过的其他难度内容直接写入对应目录，其内容步骤会被识别为已完成；
+        校验失败的难度由其自身步骤单独调用生成。
+
+        Returns:
+            当前难度的内容，当前难度生成失败时返回None
+        """
+        log.info("开始合并生成所有难度内容")
+        try:
+            result = self.llm_service.invoke(
+                self.MULTI_LEVEL_TEMPLATE, self._multi_level_inputs(content),
+                json_output=True, step=self, validate=self._validate_multi_level
+            )
+        except Exception as e:
+            log.warning(f"合并生成内容失败，回退到逐级生成: {str(e)}")
+            return None
+        return self._store_other_levels(result, context_manager)
+
+    async def _aprocess_all_levels(self, content: str, context_manager: ContextManager):
+        """_process_all_levels 的协程版本"""
+        log.info("开始合并生成所有难度内容")
+        try:
+            result = await self.llm_service.ainvoke(
+                self.MULTI_LEVEL_TEMPLATE, self._multi_level_inputs(content),
+                json_output=True, step=self, validate=self._validate_multi_level
+            )
+        except Exception as e:
+            log.warning(f"合并生成内容失败，回退到逐级生成: {str(e)}")
+            return None
+        return self._store_other_levels(result, context_manager)
+
+    def _multi_level_inputs(self, content: str) -> Dict:
+        return {
+            "content": content,
+            "style_params": self.context_manager.get("style_params", {})
+        }
+
+    def _store_other_levels(self, result: Dict, context_manager: ContextManager):
+        """写入合并生成结果中其他难度的有效内容，返回当前难度的内容"""
+        current_content = None
+        for level in self.LEVELS:
+            level_content = result.get(level)
+            if not isinstance(level_content, str) or not level_content.strip():
+                log.warning(f"合并生成结果中{level}难度内容无效，该难度将单独生成")
+                continue
+            
+            level_content = level_content.strip()
+            if level == self.level:
+                current_content = level_content
+                continue
+            
+            level_path = os.path.join(context_manager.get(f"{level}_dir"), "content.txt")
+            with open(level_path, 'w', encoding='utf-8') as f:
+                f.write(level_content)
+            log.info(f"已通过合并生成写入{level}难度内容")
+        
+        return current_content
+
+    def _validate_multi_level(self, result) -> None:
+        """校验合并生成结果，至少包含一个有效难度"""
+        if not isinstance(result, dict):
+            raise ValueError(f"合并生成结果格式错误：期望字典格式，实际得到 {type(result)}")
+        if not any(isinstance(result.get(level), str) and result[level].strip() for level in self.LEVELS):
+            raise ValueError("合并生成结果中没有有效的难度内容")
@@ -1,10 +1,12 @@
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import os
 import json
+import asyncio
 
 from services.task.utils.progress_tracker import ProgressTracker
 from services.task.steps.base import BaseStep
-from services.url_fetcher import fetch_url_content
+from services.url_fetcher import afetch_url_content, fetch_url_content
+from services.content_cache import content_cache
 from services.task.utils.context import ContextManager
 from core.logging import log
 
@@ -23,17 +25,53 @@ class FetchContentStep(BaseStep):
         )
         
     def _execute(self, context_manager: ContextManager) -> Dict:
-        """执行内容获取步骤"""
+        """执行内容获取步骤，优先使用按规范化URL缓存的正文"""
+        url = self._get_url(context_manager)
+        cached = self._get_cached(context_manager, url)
+        if cached:
+            return self._save_content(*cached, cached=True)
+        
+        text_content, raw_title = fetch_url_content(url)
+        result = self._save_content(text_content, raw_title)
+        content_cache.set(url, text_content, raw_title)
+        return result
+
+    async def _aexecute(self, context_manager: ContextManager) -> Dict:
+        """在事件循环中执行内容获取步骤"""
+        url = self._get_url(context_manager)
+        cached = await asyncio.to_thread(self._get_cached, context_manager, url)
+        if cached:
+            return self._save_content(*cached, cached=True)
+        
+        text_content, raw_title = await afetch_url_content(url)
+        result = self._save_content(text_content, raw_title)
+        await asyncio.to_thread(content_cache.set, url, text_content, raw_title)
+        return result
+
+    def _get_cached(self, context_manager: ContextManager, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """查询正文缓存，任务要求强制重新抓取时跳过"""
+        if context_manager.get("refresh_content"):
+            log.info(f"任务要求重新抓取，跳过网页正文缓存: {url}")
+            return None
+        return content_cache.get(url)
+
+    def _get_url(self, context_manager: ContextManager) -> str:
         url = context_manager.get("url")
         if not url:
             raise ValueError("缺少URL")
-            
-        text_content, raw_title = fetch_url_content(url)
+        return url
+
+    def _save_content(self, text_content: str, raw_title, cached: bool = False) -> Dict:
+        """校验并保存原始内容到文件，命中缓存时不计入抓取次数"""
+        self.record_usage(
+            provider="content_cache" if cached else None,
+            calls=0 if cached else 1,
+            characters=len(text_content or "")
+        )
         if not text_content or len(text_content) < 4:
             raise ValueError("获取页面内容失败或内容太短")
             
         # 保存原始内容到文件
-        task_id = context_manager.get("taskId")
         content_filename = "raw_content.txt"
         content_path = os.path.join(self.context_manager.get("temp_dir"), content_filename)
         
@@ -44,4 +82,4 @@ class FetchContentStep(BaseStep):
             "raw_content.txt": content_filename,
             "raw_content": text_content,
             "raw_title": raw_title,
-        }
\ No newline at end of file
+        }
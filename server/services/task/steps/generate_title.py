@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict
 import os
 import json
@@ -6,7 +7,6 @@ from services.task.utils.progress_tracker import ProgressTracker
 from services.task.steps.base import BaseStep
 from services.task.utils.context import ContextManager
 from services.llm import LLMService
-from utils.prompt_utils import PromptUtils
 from core.logging import log
 
 class GenerateTitleStep(BaseStep):
@@ -27,29 +27,30 @@ class GenerateTitleStep(BaseStep):
     def _execute(self, context_manager: ContextManager) -> Dict:
         """执行标题生成步骤"""
         raw_title = context_manager.get("raw_title")
-        raw_content = context_manager.get("raw_content")
-        if not raw_content:
-            raise ValueError("缺少原始内容")
+        raw_content = self._get_raw_content(context_manager)
             
         # 如果原始标题为空或无效,使用LLM生成标题
         title = raw_title if raw_title else self._generate_title(raw_content)
+        return self._save_title(title)
+
+    async def _aexecute(self, context_manager: ContextManager) -> Dict:
+        """在事件循环中执行标题生成步骤"""
+        raw_title = context_manager.get("raw_title")
+        raw_content = self._get_raw_content(context_manager)
+
+        title = raw_title if raw_title else await self._agenerate_title(raw_content)
+        return await asyncio.to_thread(self._save_title, title)
+
+    def _get_raw_content(self, context_manager: ContextManager) -> str:
+        raw_content = context_manager.get("raw_content")
+        if not raw_content:
+            raise ValueError("缺少原始内容")
+        return raw_content
+
+    def _save_title(self, title: str) -> Dict:
+        """校验并更新任务标题"""
         if not title or title == "无标题":
             raise ValueError("无法获取或生成有效的标题")
-            
-        # # 获取context文件路径
-        # temp_dir = self.context_manager.get("temp_dir")
-        # context_path = os.path.join(temp_dir, "context.json")
-        
-        # # 读取现有context
-        # with open(context_path, 'r', encoding='utf-8') as f:
-        #     context_data = json.load(f)
-        
-        # # 更新title
-        # context_data['title'] = title
-        
-        # # 保存更新后的context
-        # with open(context_path, 'w', encoding='utf-8') as f:
-        #     json.dump(context_data, f, ensure_ascii=False, indent=2)
         
         # 更新任务标题
         self.progress_tracker.db.refresh(self.progress_tracker.task)
@@ -68,16 +69,43 @@ class GenerateTitleStep(BaseStep):
         """使用LLM生成标题"""
         log.info("开始生成播客标题")
         try:
-            chat_prompt = PromptUtils.create_chat_prompt("podcast_title_generation")
-            chain = chat_prompt | self.llm_service.llm
-            response = chain.invoke({"content": content})
-            title = response.content if hasattr(response, 'content') else str(response)
-            if not title or not title.strip():
-                raise ValueError("生成的标题为空")
-            
-            title = title.strip()
-            log.info(f"成功生成播客标题: {title}")
-            return title
+            title = self.llm_service.invoke(
+                "podcast_title_generation",
+                {"content": content},
+                step=self,
+                validate=self._validate_title
+            )
+            return self._clean_title(title)
+        except Exception as e:
+            log.error(f"生成标题失败: {str(e)}")
+            raise ValueError(f"标题生成失败: {str(e)}")
+
+    async def _agenerate_title(self, content: str) -> str:
+        """_generate_title 的协程版本"""
+        log.info("开始生成播客标题")
+        try:
+            title = await self.llm_service.ainvoke(
+                "podcast_title_generation",
+                {"content": content},
+                step=self,
+                validate=self._validate_title
+            )
+            return self._clean_title(title)
         except Exception as e:
             log.error(f"生成标题失败: {str(e)}")
-            raise ValueError(f"标题生成失败: {str(e)}") 
\ No newline at end of file
+            raise ValueError(f"标题生成失败: {str(e)}")
+
+    @staticmethod
+    def _validate_title(title: str) -> None:
+        """校验生成的标题，空标题或"无标题"不写入缓存"""
+        if not title or not title.strip():
+            raise ValueError("生成的标题为空")
+        if title.strip() == "无标题":
+            raise ValueError("无法获取或生成有效的标题")
+
+    @classmethod
+    def _clean_title(cls, title: str) -> str:
+        cls._validate_title(title)
+        title = title.strip()
+        log.info(f"成功生成播客标题: {title}")
+        return title
@@ -8,6 +8,9 @@ from pydub import AudioSegment
 from services.file import FileService
 
 class SubtitleStep(BaseStep):
+    # 需要解码音频计算时长，属于CPU密集的步骤
+    CPU_BOUND = True
+
     def __init__(
         self,
         level: str,
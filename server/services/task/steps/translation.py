@@ -1,9 +1,12 @@
-from typing import Dict, List
+import asyncio
+from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from .base import BaseStep
+from services.client_pool import ClientPool
 from services.llm import LLMService
-from utils.prompt_utils import PromptUtils
-from langchain_core.output_parsers import JsonOutputParser
 from core.logging import log
+from core.config import settings
+from utils.token_utils import TokenUtil
 from services.task.utils.context import ContextManager
 from services.task.utils.progress_tracker import ProgressTracker
 import os
@@ -28,6 +31,22 @@ class TranslationStep(BaseStep):
         
     def _execute(self, context_manager: ContextManager) -> Dict:
         """执行翻译步骤"""
+        level_dir, dialogue = self._load_dialogue(context_manager)
+        translated_dialogue = self._translate_dialogue(dialogue)
+        return self._save_translation(level_dir, translated_dialogue)
+
+    async def _aexecute(self, context_manager: ContextManager) -> Dict:
+        """在事件循环中并发翻译所有批次"""
+        level_dir, dialogue = self._load_dialogue(context_manager)
+        translated_dialogue = await self._atranslate_dialogue(dialogue)
+        return self._save_translation(level_dir, translated_dialogue)
+
+    def _load_dialogue(self, context_manager: ContextManager) -> Tuple[str, List[Dict]]:
+        """读取英文对话内容
+
+        Returns:
+            Tuple[str, List[Dict]]: (难度等级目录, 对话列表)
+        """
         level_dir = context_manager.get("level_dir")
         if not level_dir:
             raise ValueError(f"缺少{self.level}难度等级目录")
@@ -44,10 +63,10 @@ class TranslationStep(BaseStep):
         
         if not dialogue:
             raise ValueError("对话内容为空")
-            
-        translated_dialogue = self._translate_dialogue(dialogue)
-        
-        # 保存翻译结果到文件
+        return level_dir, dialogue
+
+    def _save_translation(self, level_dir: str, translated_dialogue: List[Dict]) -> Dict:
+        """保存翻译结果到文件"""
         dialogue_path = os.path.join(level_dir, "dialogue_cn.json")
         
         # 将翻译内容写入文件
@@ -59,52 +78,160 @@ class TranslationStep(BaseStep):
         }
         
     def _translate_dialogue(self, dialogue: List[Dict]) -> List[Dict]:
-        """批量翻译对话内容"""
+        """批量翻译对话内容
+
+        按token预算划分批次并发提交(受LLM并发上限约束)，结果按原始下标重新组装。
+        批次返回条数与提交条数不一致时视为失败，失败批次对半拆分后重新提交，
+        直到单条仍失败时才以空内容占位，调用次数随失败数对数增长。
+        """
         log.info(f"开始翻译{self.level}难度对话内容")
         
         # 根据难度等级选择不同的翻译提示模板
         template_name = f"dialogue_translation_{self.level}"
-        chat_prompt = PromptUtils.create_chat_prompt(template_name)
-        chain = chat_prompt | self.llm_service.llm | JsonOutputParser()
+        style_params = self.context_manager.get("style_params", {})
+        step_index = int(self.context_manager.get('current_step_index', 0))
         
-        translated_dialogue = []
-        batch_size = 5
         total = len(dialogue)
+        batches = self._split_batches(dialogue)
+        translated: Dict[int, Dict] = {}
+        max_workers = max(1, min(ClientPool.llm_concurrency(), len(batches)))
+        log.info(f"共 {total} 条对话，划分为 {len(batches)} 个批次")
         
-        for i in range(0, total, batch_size):
-            batch = dialogue[i:i+batch_size]
-            progress = int((i / total) * 100)
-            self.progress_tracker.update_progress(
-                step_index=int(self.context_manager.get('current_step_index', 0)),
-                step_name=self.name,
-                progress=progress,
-                message=f"正在翻译第 {i+1} 到 {min(i+batch_size, total)} 条对话"
-            )
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translation') as executor:
+            def submit(start: int, batch: List[Dict]):
+                future = executor.submit(self._translate_batch, template_name, batch, style_params)
+                pending[future] = (start, batch)
             
-            try:
-                batch_translated = chain.invoke({
-                    "content": batch,
-                    "level": self.level,
-                    "style_params": self.context_manager.get("style_params", {})
-                })
-                translated_dialogue.extend(batch_translated)
-                log.info(f"成功翻译批次,共 {len(batch_translated)} 条对话")
-            except Exception as e:
-                log.error(f"翻译批次失败: {str(e)}, 尝试逐条翻译")
-                # 批次翻译失败时逐条翻译
-                for item in batch:
-                    try:
-                        single_translated = chain.invoke({
-                            "content": [item],
-                            "level": self.level,
-                            "style_params": self.context_manager.get("style_params", {})
-                        })
-                        translated_dialogue.extend(single_translated)
-                    except Exception as e:
-                        log.error(f"单条翻译失败: {str(e)}")
-                        translated_dialogue.append({
-                            "role": item["role"],
-                            "content": ""
-                        })
+            pending = {}
+            for start, batch in batches:
+                submit(start, batch)
+            
+            # 进度更新会写数据库，只在当前线程中进行
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, batch = pending.pop(future)
+                    for retry in self._collect_batch(future, start, batch, translated):
+                        submit(*retry)
+                self._report_progress(step_index, len(translated), total)
                         
-        return translated_dialogue
+        return [translated[index] for index in range(total)]
+
+    async def _atranslate_dialogue(self, dialogue: List[Dict]) -> List[Dict]:
+        """_translate_dialogue 的协程版本，批次以协程并发提交，失败批次同样对半拆分重试"""
+        log.info(f"开始翻译{self.level}难度对话内容")
+        template_name = f"dialogue_translation_{self.level}"
+        style_params = self.context_manager.get("style_params", {})
+        step_index = int(self.context_manager.get('current_step_index', 0))
+        
+        total = len(dialogue)
+        batches = self._split_batches(dialogue)
+        translated: Dict[int, Dict] = {}
+        log.info(f"共 {total} 条对话，划分为 {len(batches)} 个批次")
+        
+        pending = {}
+        def submit(start: int, batch: List[Dict]):
+            task = asyncio.create_task(self._atranslate_batch(template_name, batch, style_params))
+            pending[task] = (start, batch)
+        
+        for start, batch in batches:
+            submit(start, batch)
+        
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                start, batch = pending.pop(task)
+                for retry in self._collect_batch(task, start, batch, translated):
+                    submit(*retry)
+            await asyncio.to_thread(self._report_progress, step_index, len(translated), total)
+        
+        return [translated[index] for index in range(total)]
+
+    def _collect_batch(self, future, start: int, batch: List[Dict],
+                       translated: Dict[int, Dict]) -> List[Tuple[int, List[Dict]]]:
+        """收集已完成批次的结果
+
+        Returns:
+            List[Tuple[int, List[Dict]]]: 需要重新提交的 (起始下标, 批次) 列表
+        """
+        try:
+            for offset, item in enumerate(future.result()):
+                translated[start + offset] = item
+            log.info(f"成功翻译批次,共 {len(batch)} 条对话")
+        except Exception as e:
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                log.warning(f"翻译批次失败: {str(e)}, 拆分为 {middle}+{len(batch) - middle} 条重试")
+                return [(start, batch[:middle]), (start + middle, batch[middle:])]
+            log.error(f"单条翻译失败: {str(e)}")
+            translated[start] = {
+                "role": batch[0]["role"],
+                "content": ""
+            }
+        return []
+
+    def _report_progress(self, step_index: int, finished: int, total: int):
+        self.progress_tracker.update_progress(
+            step_index=step_index,
+            step_name=self.name,
+            progress=int(finished / total * 100),
+            message=f"已翻译 {finished}/{total} 条对话"
+        )
+
+    def _split_batches(self, dialogue: List[Dict]) -> List[Tuple[int, List[Dict]]]:
+        """按token预算和条数上限顺序划分批次
+
+        Returns:
+            List[Tuple[int, List[Dict]]]: (批次起始下标, 批次对话) 列表
+        """
+        budget = settings.TRANSLATION_BATCH_TOKEN_BUDGET
+        max_items = settings.TRANSLATION_MAX_BATCH_ITEMS
+        batches = []
+        start, batch, batch_tokens = 0, [], 0
+        
+        for index, item in enumerate(dialogue):
+            tokens = TokenUtil.count_json(item)
+            # 单条超出预算时独占一个批次
+            if batch and (batch_tokens + tokens > budget or len(batch) >= max_items):
+                batches.append((start, batch))
+                start, batch, batch_tokens = index, [], 0
+            batch.append(item)
+            batch_tokens += tokens
+        
+        if batch:
+            batches.append((start, batch))
+        return batches
+
+    def _translate_batch(self, template_name: str, batch: List[Dict], style_params: Dict) -> List[Dict]:
+        """翻译一批对话，并校验返回条数与提交条数一致"""
+        return self.llm_service.invoke(
+            template_name, self._batch_inputs(batch, style_params),
+            json_output=True, step=self, validate=self._batch_validator(batch)
+        )
+
+    async def _atranslate_batch(self, template_name: str, batch: List[Dict], style_params: Dict) -> List[Dict]:
+        """_translate_batch 的协程版本"""
+        return await self.llm_service.ainvoke(
+            template_name, self._batch_inputs(batch, style_params),
+            json_output=True, step=self, validate=self._batch_validator(batch)
+        )
+
+    def _batch_inputs(self, batch: List[Dict], style_params: Dict) -> Dict:
+        return {
+            "content": batch,
+            "level": self.level,
+            "style_params": style_params
+        }
+
+    @staticmethod
+    def _batch_validator(batch: List[Dict]):
+        """返回校验翻译结果条数与格式的函数"""
+        def validate(result):
+            if not isinstance(result, list):
+                raise ValueError(f"翻译结果格式错误：期望列表格式，实际得到 {type(result)}")
+            if len(result) != len(batch):
+                raise ValueError(f"翻译结果条数不一致：提交 {len(batch)} 条，返回 {len(result)} 条")
+            for i, item in enumerate(result):
+                if not isinstance(item, dict) or "content" not in item:
+                    raise ValueError(f"翻译结果第 {i} 条格式错误")
+        return validate
@@ -8,10 +8,12 @@ from models.enums import TaskProgress, TaskStatus
 from services.task.utils.errors import TaskError
 from utils.time_utils import TimeUtil
 from services.task.processor import TaskProcessor
+from services.task.dedupe import TaskDeduplicator
 from utils.decorators import error_handler
 from core.logging import log
 import sqlalchemy.orm.exc
 import sqlalchemy.exc
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 import time
 
@@ -38,6 +40,7 @@ def execute_task(task_id: str, is_retry: bool = False, db_session = None):
     
     retry_count = 0
     temp_dir = os.path.join(settings.TASK_DIR, task_id)
+    deduplicator = TaskDeduplicator.get_instance()
         
     try:
         while retry_count <= MAX_RETRIES:
@@ -48,6 +51,11 @@ def execute_task(task_id: str, is_retry: bool = False, db_session = None):
                     log.error(f"Task not found in execute_task: {task_id}")
                     return
 
+                # 相同URL与风格参数的任务已完成时直接复用其结果，正在处理时排队等待其完成
+                if retry_count == 0 and not is_retry and deduplicator.try_reuse(task, db):
+                    log.info(f"Task completed by or queued behind a duplicate task: {task_id}")
+                    return
+
                 # 如果是重试，重置任务状态和清理临时文件
                 if retry_count > 0:
                     log.info(f"Retrying task {task_id} (attempt {retry_count}/{MAX_RETRIES})")
@@ -71,7 +79,7 @@ def execute_task(task_id: str, is_retry: bool = False, db_session = None):
                 db.refresh(task)
                 
                 log.info(f"Task found, current status: {task.status}, progress: {task.progress}")
-                future = TaskProcessor.process_task_async(task, db, is_retry)
+                future = TaskProcessor.process_task_async(task, db, is_retry or retry_count > 0)
                 future.result()  # 等待任务完成
                 log.info(f"Task processing completed successfully: {task_id}")
                 return  # 任务成功完成，直接返回
@@ -100,6 +108,9 @@ def execute_task(task_id: str, is_retry: bool = False, db_session = None):
                 raise
                 
     finally:
+        # 排在本任务之后的相同任务重新启动，本任务成功时直接复用其结果
+        for follower_id in deduplicator.release(task_id):
+            threading.Thread(target=execute_task, args=(follower_id, False)).start()
         if should_close and db:
             try:
                 db.close()
@@ -160,10 +171,11 @@ class TaskService:
     def check_incomplete_tasks(db):
         """检查未完成的任务并清理文件"""
         try:
-            # 1. 将所有未完成任务标记为失败
+            # 1. 将所有未完成任务标记为失败，尚未到批处理时段的延后任务除外
             incomplete_tasks = (
                 db.query(Task)
                 .filter(Task.status.in_(['pending', 'processing']))
+                .filter(or_(Task.status == 'processing', Task.deferred_until.is_(None)))
                 .all()
             )
             
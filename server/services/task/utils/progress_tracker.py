@@ -1,3 +1,4 @@
+import threading
 from core.logging import log
 from typing import Optional
 
@@ -17,6 +18,8 @@ class ProgressTracker:
         self.db = db
         self.total_steps = total_steps
         self.current_step = 0
+        # 协程步骤通过 asyncio.to_thread 并发更新进度时，串行化对共享会话的访问
+        self._lock = threading.RLock()
         try:
             if not self.db.in_transaction():
                 self.db.begin()
@@ -54,7 +57,7 @@ class ProgressTracker:
             current_step_index=step_index,
             step_progress=progress
         )
-    
+
     def _update_task_status(
         self,
         status: str,
@@ -68,39 +71,40 @@ class ProgressTracker:
         """更新任务状态"""
         log.info(f"Updating task {self.task.taskId} status: status={status}, progress={progress}, message={progress_message}")
         
-        try:
-            if not self.db.in_transaction():
-                self.db.begin()
+        with self._lock:
+            try:
+                if not self.db.in_transaction():
+                    self.db.begin()
                 
-            self.db.refresh(self.task)
+                self.db.refresh(self.task)
             
-            if error_message:
-                self.task.status = TaskStatus.FAILED.value
-                self.task.progress = TaskProgress.FAILED.value
-                self.task.progress_message = error_message
-                self.task.error = error_message
-            else:
-                self.task.status = status
-                self.task.progress = progress
-                self.task.progress_message = progress_message
+                if error_message:
+                    self.task.status = TaskStatus.FAILED.value
+                    self.task.progress = TaskProgress.FAILED.value
+                    self.task.progress_message = error_message
+                    self.task.error = error_message
+                else:
+                    self.task.status = status
+                    self.task.progress = progress
+                    self.task.progress_message = progress_message
                 
-            self.task.updatedAt = TimeUtil.now_ms()
-            self.task.current_step = current_step
-            self.task.current_step_index = current_step_index
-            self.task.step_progress = step_progress
+                self.task.updatedAt = TimeUtil.now_ms()
+                self.task.current_step = current_step
+                self.task.current_step_index = current_step_index
+                self.task.step_progress = step_progress
             
-            self.db.commit()
+                self.db.commit()
             
-        except sqlalchemy.orm.exc.ObjectDeletedError as e:
-            if self.db.in_transaction():
-                self.db.rollback()
-            log.warning(f"Task has been deleted during update: {self.task.taskId}")
-            raise
-        except Exception as e:
-            if self.db.in_transaction():
-                self.db.rollback()
-            log.error(f"Failed to update task status: {str(e)}")
-            raise Exception(f"更新任务状态失败: {str(e)}")
+            except sqlalchemy.orm.exc.ObjectDeletedError as e:
+                if self.db.in_transaction():
+                    self.db.rollback()
+                log.warning(f"Task has been deleted during update: {self.task.taskId}")
+                raise
+            except Exception as e:
+                if self.db.in_transaction():
+                    self.db.rollback()
+                log.error(f"Failed to update task status: {str(e)}")
+                raise Exception(f"更新任务状态失败: {str(e)}")
     
     def update_error(self, error_msg: str, stack_trace: Optional[str] = None):
         """处理错误进度更新"""
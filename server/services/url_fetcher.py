@@ -1,84 +1,291 @@
 import os
+import re
 import json
+import codecs
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
-from typing import Tuple, Optional
+from charset_normalizer import from_bytes
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
+from core.config import settings
+from core.event_loop import run_cpu
 from core.logging import log
+from services.html_extractor import get_extractor
 from utils.decorators import error_handler
 
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    # 未安装 brotli 时无法解压 br，不声明该编码
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+}
+
+# 响应头与 <meta> 标签中的字符集声明
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+# 查找 <meta> 声明和自动检测编码时读取的字节数
+META_SNIFF_BYTES = 4096
+DETECT_SNIFF_BYTES = 65536
+
 class URLContentError(Exception):
     """URL内容获取错误"""
     pass
 
-@error_handler
-def fetch_url_content(url: str) -> Tuple[str, Optional[str]]:
+
+@dataclass
+class FetchedPage:
+    """一次页面获取的结果及其缓存校验信息"""
+    url: str
+    content: str
+    title: Optional[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # 服务端返回304，内容沿用上次获取的结果
+    not_modified: bool = False
+
+
+class _RevalidationCache:
+    """最近获取过的页面，用于 ETag/Last-Modified 条件请求，按最近使用淘汰"""
+
+    def __init__(self):
+        self._pages: "OrderedDict[str, FetchedPage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[FetchedPage]:
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+            return page
+
+    def put(self, page: FetchedPage):
+        """只保存带有校验信息的页面"""
+        if not (page.etag or page.last_modified):
+            return
+        with self._lock:
+            self._pages[page.url] = replace(page, not_modified=False)
+            self._pages.move_to_end(page.url)
+            while len(self._pages) > max(settings.URL_FETCH_REVALIDATE_ENTRIES, 0):
+                self._pages.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+
+revalidation_cache = _RevalidationCache()
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+# 每个事件循环各自的 aiohttp 会话，会话不能跨事件循环使用
+_async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _get_session() -> requests.Session:
+    """获取进程内共享的HTTP会话，复用keep-alive连接"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=settings.URL_FETCH_POOL_SIZE,
+                    pool_maxsize=settings.URL_FETCH_POOL_SIZE
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(REQUEST_HEADERS)
+                _session = session
+    return _session
+
+
+def _get_async_session() -> aiohttp.ClientSession:
+    """获取当前事件循环共享的 aiohttp 会话"""
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            headers=REQUEST_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=settings.URL_FETCH_TIMEOUT),
+            connector=aiohttp.TCPConnector(limit=settings.URL_FETCH_POOL_SIZE)
+        )
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_async_session():
+    """关闭当前事件循环的 aiohttp 会话"""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def _conditional_headers(previous: Optional[FetchedPage]) -> Dict[str, str]:
+    """根据上次获取结果构造条件请求头"""
+    headers = {}
+    if previous is not None:
+        if previous.etag:
+            headers['If-None-Match'] = previous.etag
+        if previous.last_modified:
+            headers['If-Modified-Since'] = previous.last_modified
+    return headers
+
+
+def _check_declared_size(headers) -> None:
+    """响应头声明的长度超过上限时直接放弃"""
+    declared = headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) > settings.URL_FETCH_MAX_BYTES:
+        raise URLContentError(f"页面大小 {declared} 字节超过上限 {settings.URL_FETCH_MAX_BYTES} 字节")
+
+
+def _read_limited(chunks: Iterable[bytes]) -> bytes:
+    """流式读取响应体，超过大小上限时提前中止"""
+    max_bytes = settings.URL_FETCH_MAX_BYTES
+    body = bytearray()
+    for chunk in chunks:
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise URLContentError(f"页面大小超过上限 {max_bytes} 字节")
+    return bytes(body)
+
+
+async def _aread_limited(chunks: AsyncIterator[bytes]) -> bytes:
+    """_read_limited 的协程版本"""
+    max_bytes = settings.URL_FETCH_MAX_BYTES
+    body = bytearray()
+    async for chunk in chunks:
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise URLContentError(f"页面大小超过上限 {max_bytes} 字节")
+    return bytes(body)
+
+
+def _valid_codec(name) -> Optional[str]:
+    if not name:
+        return None
+    if isinstance(name, bytes):
+        name = name.decode('ascii', errors='ignore')
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def detect_charset(content_type: Optional[str], body: bytes) -> str:
+    """确定页面编码
+
+    依次使用响应头 Content-Type 的 charset、页面开头 <meta> 中的声明，
+    都没有时只对页面开头的一段内容做编码检测，最后默认 utf-8。
     """
-    获取URL内容，返回 (正文内容, 标题)
+    match = _HEADER_CHARSET.search(content_type or '')
+    charset = _valid_codec(match.group(1)) if match else None
+    if charset:
+        return charset
+
+    match = _META_CHARSET.search(body[:META_SNIFF_BYTES])
+    charset = _valid_codec(match.group(1)) if match else None
+    if charset:
+        return charset
+
+    best = from_bytes(body[:DETECT_SNIFF_BYTES]).best()
+    return _valid_codec(best.encoding if best else None) or 'utf-8'
+
+
+def _parse_page(url: str, body: bytes, headers) -> FetchedPage:
+    """解码并提取页面内容"""
+    html = body.decode(detect_charset(headers.get('Content-Type'), body), errors='replace')
+    content, title = extract_content(html)
+    return FetchedPage(
+        url=url,
+        content=content,
+        title=title,
+        etag=headers.get('ETag'),
+        last_modified=headers.get('Last-Modified')
+    )
+
+
+def fetch_page(url: str, previous: Optional[FetchedPage] = None) -> FetchedPage:
+    """
+    获取页面，提供上次的获取结果时发送条件请求
     
     Args:
         url: 要获取的网页URL
-        task_id: 任务ID，用于日志记录
+        previous: 上次获取的结果，其 ETag/Last-Modified 用于条件请求
         
     Returns:
-        Tuple[str, Optional[str]]: (正文内容, 标题)
+        FetchedPage: 获取结果，服务端返回304时为上次结果且 not_modified 为True
         
     Raises:
-        URLContentError: 当内容获取失败时抛出
+        URLContentError: 当内容获取失败或页面超过大小上限时抛出
     """
     log.info(f"开始获取URL内容: {url}")
     
     try:
-        # 设置请求头
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        # 发送请求
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()  # 检查响应状态
+        with _get_session().get(
+            url,
+            headers=_conditional_headers(previous),
+            timeout=settings.URL_FETCH_TIMEOUT,
+            stream=True
+        ) as response:
+            if response.status_code == 304 and previous is not None:
+                log.info(f"页面未修改，使用上次获取的内容: {url}")
+                return replace(previous, not_modified=True)
+            response.raise_for_status()  # 检查响应状态
+            _check_declared_size(response.headers)
+            body = _read_limited(response.iter_content(chunk_size=65536))
         
-        # 设置正确的编码
-        response.encoding = response.apparent_encoding
+        page = _parse_page(url, body, response.headers)
+        log.info(f"成功获取URL内容，长度: {len(page.content)}字")
+        return page
         
-        # 使用BeautifulSoup解析内容
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 移除不需要的标签
-        for tag in soup(['script', 'style', 'nav', 'footer', 'iframe']):
-            tag.decompose()
-        
-        # 获取标题
-        title = None
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text().strip()
-        
-        # 获取正文内容
-        # 首先尝试获取文章主体
-        article = soup.find('article')
-        if not article:
-            article = soup.find('main')
-        if not article:
-            article = soup.find('div', class_=['content', 'article', 'post'])
-        
-        if article:
-            content = article.get_text(separator='\n', strip=True)
-        else:
-            # 如果找不到明确的文章区域，获取所有段落文本
-            paragraphs = soup.find_all('p')
-            content = '\n'.join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
-        
-        # 清理和格式化内容
-        content = clean_content(content)
-        
-        if not content:
-            raise URLContentError("无法提取有效内容")
+    except URLContentError:
+        raise
+    
+    except requests.RequestException as e:
+        error_msg = f"请求URL失败: {str(e)}"
+        log.error(error_msg)
+        raise URLContentError(error_msg)
+    
+    except Exception as e:
+        error_msg = f"获取URL内容时发生错误: {str(e)}"
+        log.error(error_msg)
+        raise URLContentError(error_msg)
+
+
+async def afetch_page(url: str, previous: Optional[FetchedPage] = None) -> FetchedPage:
+    """fetch_page 的协程版本，HTML解码与解析在CPU线程池中执行"""
+    log.info(f"开始获取URL内容: {url}")
+    
+    try:
+        async with _get_async_session().get(url, headers=_conditional_headers(previous)) as response:
+            if response.status == 304 and previous is not None:
+                log.info(f"页面未修改，使用上次获取的内容: {url}")
+                return replace(previous, not_modified=True)
+            response.raise_for_status()
+            _check_declared_size(response.headers)
+            body = await _aread_limited(response.content.iter_chunked(65536))
         
-        log.info(f"成功获取URL内容，长度: {len(content)}字")
-        return content, title
+        page = await run_cpu(_parse_page, url, body, response.headers)
+        log.info(f"成功获取URL内容，长度: {len(page.content)}字")
+        return page
         
-    except requests.RequestException as e:
+    except URLContentError:
+        raise
+    
+    except aiohttp.ClientError as e:
         error_msg = f"请求URL失败: {str(e)}"
         log.error(error_msg)
         raise URLContentError(error_msg)
@@ -88,34 +295,54 @@ def fetch_url_content(url: str) -> Tuple[str, Optional[str]]:
         log.error(error_msg)
         raise URLContentError(error_msg)
 
-def clean_content(content: str) -> str:
+
+@error_handler
+def fetch_url_content(url: str) -> Tuple[str, Optional[str]]:
     """
-    清理和格式化内容
+    获取URL内容，返回 (正文内容, 标题)
+    
+    最近获取过且带有 ETag/Last-Modified 的页面会发送条件请求，未修改时直接复用上次的内容。
     
     Args:
-        content: 原始内容文本
+        url: 要获取的网页URL
         
     Returns:
-        str: 清理后的内容
+        Tuple[str, Optional[str]]: (正文内容, 标题)
+        
+    Raises:
+        URLContentError: 当内容获取失败时抛出
     """
-    # 分行处理
-    lines = content.split('\n')
-    
-    # 清理每一行
-    cleaned_lines = []
-    for line in lines:
-        line = line.strip()
-        # 跳过空行和太短的行
-        if line and len(line) > 2:
-            cleaned_lines.append(line)
+    page = fetch_page(url, revalidation_cache.get(url))
+    revalidation_cache.put(page)
+    return page.content, page.title
+
+
+async def afetch_url_content(url: str) -> Tuple[str, Optional[str]]:
+    """fetch_url_content 的协程版本"""
+    page = await afetch_page(url, revalidation_cache.get(url))
+    revalidation_cache.put(page)
+    return page.content, page.title
+
+
+def extract_content(html: str) -> Tuple[str, Optional[str]]:
+    """
+    从HTML中提取正文内容和标题，提取器由 HTML_EXTRACTOR 配置选择
     
-    # 合并行
-    cleaned_content = '\n'.join(cleaned_lines)
+    Args:
+        html: 网页HTML
+        
+    Returns:
+        Tuple[str, Optional[str]]: (正文内容, 标题)
+        
+    Raises:
+        URLContentError: 无法提取有效内容时抛出
+    """
+    content, title = get_extractor().extract(html)
     
-    # 删除多余的空白字符
-    cleaned_content = ' '.join(cleaned_content.split())
+    if not content:
+        raise URLContentError("无法提取有效内容")
     
-    return cleaned_content
+    return content, title
 
 def save_content(content: str, title: Optional[str], task_id: str, task_dir: str):
     """
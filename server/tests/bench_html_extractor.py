@@ -0,0 +1,95 @@
+"""正文提取器基准测试
+
+对保存的网页语料比较各提取器的耗时与提取质量，在 server 目录下运行：
+
+    python -m tests.bench_html_extractor [语料目录] [--repeat N]
+
+语料目录中每个 <name>.html 为保存的网页，同名 <name>.txt 为人工标注的正文(可选)，
+有标注时按词袋计算提取结果的准确率、召回率和F1。默认使用 tests/fixtures/pages。
+默认语料除几个小页面外，还包含按真实新闻站、技术博客和中文门户结构构造的大页面
+(100KB以上，含内联脚本与样式、导航菜单、广告位、评论区和推荐列表)，正文只占其中一小部分。
+"""
+import argparse
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from services.html_extractor import _EXTRACTORS, get_extractor
+
+CORPUS_DIR = Path(__file__).parent / "fixtures" / "pages"
+# 中文按字切分，其他文字按单词切分
+_TOKEN = re.compile(r'[一-鿿]|\w+')
+
+
+def load_corpus(corpus_dir: Path = CORPUS_DIR) -> List[Tuple[str, str, str]]:
+    """读取语料，返回 (名称, HTML, 标注正文) 列表，无标注时正文为空字符串"""
+    pages = []
+    for html_path in sorted(corpus_dir.glob("*.html")):
+        html = html_path.read_bytes().decode("utf-8", errors="replace")
+        expected_path = html_path.with_suffix(".txt")
+        expected = expected_path.read_text(encoding="utf-8") if expected_path.exists() else ""
+        pages.append((html_path.stem, html, expected))
+    return pages
+
+
+def score_extraction(extracted: str, expected: str) -> Tuple[float, float, float]:
+    """按词袋计算 (准确率, 召回率, F1)"""
+    got = Counter(_TOKEN.findall(extracted.lower()))
+    want = Counter(_TOKEN.findall(expected.lower()))
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 0.0, 0.0, 0.0
+    precision = overlap / sum(got.values())
+    recall = overlap / sum(want.values())
+    return precision, recall, 2 * precision * recall / (precision + recall)
+
+
+def run_benchmark(pages: List[Tuple[str, str, str]], repeat: int = 20) -> Dict[str, Dict]:
+    """对每个可用的提取器统计单页平均耗时(毫秒)和平均F1"""
+    results = {}
+    for name, cls in _EXTRACTORS.items():
+        if not cls.available():
+            continue
+        extractor = get_extractor(name)
+        elapsed, scores = 0.0, []
+        for _, html, expected in pages:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                content, _ = extractor.extract(html)
+            elapsed += time.perf_counter() - start
+            if expected:
+                scores.append(score_extraction(content, expected))
+
+        results[name] = {
+            "ms_per_page": elapsed / repeat / max(len(pages), 1) * 1000,
+            "precision": sum(s[0] for s in scores) / len(scores) if scores else None,
+            "recall": sum(s[1] for s in scores) / len(scores) if scores else None,
+            "f1": sum(s[2] for s in scores) / len(scores) if scores else None,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较正文提取器的耗时与提取质量")
+    parser.add_argument("corpus", nargs="?", default=str(CORPUS_DIR), help="保存的网页目录")
+    parser.add_argument("--repeat", type=int, default=20, help="每个页面重复提取的次数")
+    args = parser.parse_args()
+
+    pages = load_corpus(Path(args.corpus))
+    if not pages:
+        parser.error(f"目录中没有 .html 文件: {args.corpus}")
+
+    print(f"语料: {len(pages)} 个页面, 每页重复 {args.repeat} 次")
+    print(f"{'提取器':<10}{'ms/页':>10}{'准确率':>10}{'召回率':>10}{'F1':>10}")
+    for name, result in run_benchmark(pages, args.repeat).items():
+        quality = [
+            f"{result[key]:>10.3f}" if result[key] is not None else f"{'-':>10}"
+            for key in ("precision", "recall", "f1")
+        ]
+        print(f"{name:<10}{result['ms_per_page']:>10.2f}{''.join(quality)}")
+
+
+if __name__ == "__main__":
+    main()
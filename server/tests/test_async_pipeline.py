@@ -0,0 +1,178 @@
+import asyncio
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from core.config import config_manager
+from core.event_loop import EventLoopManager, run_cpu
+from services.client_pool import ClientPool
+from services.llm import LLMService
+from services.rate_limiter import RateLimiterRegistry
+from services.task.steps.audio import AudioStep
+from services.task.steps.base import BaseStep
+from services.task.steps.translation import TranslationStep
+
+
+class FakeContext:
+    """基于字典的上下文"""
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def validate_keys(self, keys):
+        return [key for key in keys if key not in self.data]
+
+
+class AsyncFakeLLMService:
+    """逐条返回译文的异步假LLM服务，批次包含指定内容时返回条数错误"""
+    def __init__(self, poison=()):
+        self.poison = set(poison)
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    async def ainvoke(self, template_name, inputs, json_output=False, step=None, validate=None):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            result = [
+                {"role": item["role"], "content": f"译:{item['content']}"}
+                for item in inputs["content"]
+            ]
+            if any(item["content"] in self.poison for item in inputs["content"]):
+                result = result[:-1]
+            if validate is not None:
+                validate(result)
+            return result
+        finally:
+            self.active -= 1
+
+
+class FakeEdgeTTS:
+    """记录同时进行的请求数的异步假TTS"""
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.active = 0
+        self.max_active = 0
+        self.count = 0
+
+    async def agenerate_speech(self, text, voice):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        self.count += 1
+        path = self.tmp_path / f"tts_{self.count}.mp3"
+        path.write_bytes(b"audio")
+        return str(path)
+
+
+@pytest.fixture
+def async_settings(monkeypatch):
+    monkeypatch.setattr(config_manager, "_db_config", {
+        "LLM_CACHE_ENABLED": False,
+        "USE_OPENAI_TTS_MODEL": False,
+        "TRANSLATION_BATCH_TOKEN_BUDGET": 10000,
+        "TRANSLATION_MAX_BATCH_ITEMS": 2,
+    })
+    RateLimiterRegistry.get_instance().reset()
+    return config_manager._db_config
+
+
+def _dialogue(count):
+    return [
+        {"role": "host" if i % 2 == 0 else "guest", "content": f"line {i}"}
+        for i in range(count)
+    ]
+
+
+def test_sync_step_runs_in_thread_by_default():
+    """测试未实现协程版本的步骤在线程池中执行并校验输出"""
+    class SyncStep(BaseStep):
+        def _execute(self, context_manager):
+            return {"out": threading.current_thread().name}
+
+    step = SyncStep("sync", [], ["out"], MagicMock(), FakeContext({}))
+    result = asyncio.run(step.aexecute())
+
+    assert result["out"] != threading.main_thread().name
+
+
+def test_translation_batches_run_concurrently(async_settings, tmp_path):
+    """测试协程翻译并发提交批次，失败批次拆分重试，结果保持原始顺序"""
+    dialogue = _dialogue(8)
+    (tmp_path / "dialogue_en.json").write_text(json.dumps(dialogue), encoding="utf-8")
+    context = FakeContext({
+        "level_dir": str(tmp_path),
+        "elementary/dialogue_en.json": "dialogue_en.json",
+    })
+    step = TranslationStep(level="elementary", progress_tracker=MagicMock(), context_manager=context)
+    llm = AsyncFakeLLMService(poison={"line 5"})
+    step.llm_service = llm
+
+    asyncio.run(step.aexecute())
+
+    translated = json.loads((tmp_path / "dialogue_cn.json").read_text(encoding="utf-8"))
+    assert [item["content"] for item in translated] == [
+        "" if i == 5 else f"译:line {i}" for i in range(8)
+    ]
+    assert llm.max_active == 4
+    # 4个批次 + 失败批次拆分出的2个单条批次
+    assert llm.calls == 6
+
+
+def test_audio_lines_synthesized_concurrently(async_settings, tmp_path, monkeypatch):
+    """测试协程音频步骤并发合成所有对话，文件列表保持原始顺序"""
+    dialogue = _dialogue(6)
+    (tmp_path / "dialogue_en.json").write_text(json.dumps(dialogue), encoding="utf-8")
+    context = FakeContext({
+        "level_dir": str(tmp_path),
+        "elementary/dialogue_en.json": "dialogue_en.json",
+    })
+    tts = FakeEdgeTTS(tmp_path)
+    monkeypatch.setattr(ClientPool.get_instance(), "get_edge_tts", lambda: tts)
+    monkeypatch.setattr(AudioStep, "_verify_audio_file", lambda self, path: True)
+    step = AudioStep(level="elementary", lang="en", progress_tracker=MagicMock(), context_manager=context)
+
+    asyncio.run(step.aexecute())
+
+    audio_files = json.loads((tmp_path / "audio_files_en.json").read_text(encoding="utf-8"))
+    assert [item["index"] for item in audio_files] == list(range(6))
+    assert all((tmp_path / item["filename"]).exists() for item in audio_files)
+    assert tts.max_active == 6
+    assert step.usage["calls"] == 6
+
+
+def test_llm_ainvoke_uses_async_client(async_settings, monkeypatch):
+    """测试 ainvoke 通过异步接口调用模型并记录用量"""
+    fake = FakeListChatModel(responses=["标题"])
+    monkeypatch.setattr(ClientPool.get_instance(), "get_chat_model", lambda: fake)
+    step = MagicMock()
+
+    result = asyncio.run(LLMService().ainvoke("podcast_title_generation", {"content": "文章"}, step=step))
+
+    assert result == "标题"
+    step.record_usage.assert_called_once()
+
+
+def test_event_loop_manager_runs_coroutines_in_background():
+    """测试后台事件循环执行协程，CPU密集的工作交给CPU线程池"""
+    manager = EventLoopManager.get_instance()
+
+    async def work():
+        return threading.current_thread().name, await run_cpu(lambda: threading.current_thread().name)
+
+    loop_thread, cpu_thread = manager.submit(work()).result(timeout=5)
+
+    assert loop_thread == "async_pipeline"
+    assert cpu_thread.startswith("async_cpu")
@@ -0,0 +1,138 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from core.config import config_manager
+from models.enums import TaskProgress, TaskStatus
+from models.rss import RSSFeed
+from models.task import Task
+from services.rss.feed_manager import FeedManager
+from services.task import batch_window
+from services.task.batch_window import DeferredTaskDispatcher, deferred_until, in_batch_window, next_window_start
+from services.task.task_service import TaskService
+from utils.time_utils import TimeUtil
+
+
+def at(hour, minute=0):
+    """2024-01-01 当天指定时刻(UTC)的毫秒时间戳"""
+    return TimeUtil.to_ms(datetime(2024, 1, 1, hour, minute, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def window(monkeypatch):
+    """批处理时段 23:00-05:00(UTC，跨越午夜)，最长等待1小时"""
+    monkeypatch.setattr(config_manager, "_db_config", {
+        "TIMEZONE": "UTC",
+        "RSS_BATCH_WINDOW": "23:00-05:00",
+        "RSS_BATCH_MAX_STALENESS": 3600,
+        "RSS_MIN_FETCH_INTERVAL": 86400,
+    })
+
+
+def add_task(db_session, user, deferred_until=None, status=TaskStatus.PENDING):
+    task = Task(
+        taskId=str(uuid.uuid4()),
+        url="https://example.com/post",
+        status=status.value,
+        progress=TaskProgress.WAITING.value,
+        user_id=user.id,
+        created_by=user.id,
+        deferred_until=deferred_until,
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def test_window(window):
+    """测试跨越午夜的时段判断、下一时段开始时间和延后期限"""
+    assert in_batch_window(at(23, 30)) and in_batch_window(at(4, 59))
+    assert not in_batch_window(at(5)) and not in_batch_window(at(12))
+    assert next_window_start(at(12)) == at(23)
+    assert next_window_start(at(23, 30)) == at(23) + 86400 * 1000
+
+    assert deferred_until(at(12)) == at(13)
+    assert deferred_until(at(1)) is None
+
+
+@pytest.mark.parametrize("setting", ["", "bad", "06:00-06:00"])
+def test_window_not_configured(window, setting):
+    """测试未配置或配置有误时不延后"""
+    config_manager._db_config["RSS_BATCH_WINDOW"] = setting
+    assert not in_batch_window(at(12))
+    assert deferred_until(at(12)) is None
+
+
+def test_deferred_rss_tasks_not_started(db_session, test_users, window, monkeypatch):
+    """测试开启延后的源在时段外产生的任务只记录期限，不立即执行"""
+    started = []
+    monkeypatch.setattr(FeedManager, "_start_tasks", staticmethod(started.extend))
+    monkeypatch.setattr(batch_window, "in_batch_window", lambda now_ms: False)
+    deferred_feed = RSSFeed(url="https://example.com/rss", user_id=test_users[0].id, defer_to_batch_window=True)
+    feed = RSSFeed(url="https://example.com/rss", user_id=test_users[1].id)
+    db_session.add_all([deferred_feed, feed])
+    db_session.commit()
+
+    keyed_entries = [("post", {"title": "Post", "link": "https://example.com/post", "published": None})]
+    manager = FeedManager(db_session, None)
+    manager._process_entries([deferred_feed, feed], keyed_entries, {}, "hash")
+
+    tasks = {task.user_id: task for task in db_session.query(Task)}
+    assert tasks[test_users[0].id].deferred_until > TimeUtil.now_ms() + 3500 * 1000
+    assert tasks[test_users[1].id].deferred_until is None
+    assert started == [tasks[test_users[1].id]]
+
+
+@pytest.fixture
+def dispatcher(db_session, window, monkeypatch):
+    """从测试数据库取出延后任务，记录被执行的任务"""
+    monkeypatch.setattr(DeferredTaskDispatcher, "session_factory", sessionmaker(bind=db_session.get_bind()))
+    dispatcher = DeferredTaskDispatcher.get_instance()
+    dispatcher.started = []
+    monkeypatch.setattr(dispatcher, "_start_tasks", dispatcher.started.extend)
+    yield dispatcher
+    dispatcher.shutdown()
+
+
+def test_claim_due(db_session, test_user, dispatcher):
+    """测试时段外只执行等待超时的任务，时段内执行全部延后任务"""
+    overdue = add_task(db_session, test_user, deferred_until=at(11))
+    waiting = add_task(db_session, test_user, deferred_until=at(13))
+    add_task(db_session, test_user)
+
+    assert dispatcher._claim_due(at(12)) == [overdue.taskId]
+    assert dispatcher._next_delay(at(12)) == 3600
+    assert dispatcher._claim_due(at(23)) == [waiting.taskId]
+    assert dispatcher._claim_due(at(23)) == []
+    db_session.expire_all()
+    assert overdue.deferred_until is None and waiting.deferred_until is None
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_wakes_on_notify(db_session, test_user, dispatcher, monkeypatch):
+    """测试新延后的任务唤醒调度器，在等待超时时执行"""
+    monkeypatch.setattr(batch_window, "in_batch_window", lambda now_ms: False)
+    dispatcher.start()
+    await asyncio.sleep(0.1)
+    assert dispatcher.started == []
+
+    task = add_task(db_session, test_user, deferred_until=TimeUtil.now_ms() + 300)
+    dispatcher.notify()
+    await asyncio.sleep(0.1)
+    assert dispatcher.started == []
+    await asyncio.sleep(0.5)
+    assert dispatcher.started == [task.taskId]
+
+
+def test_deferred_tasks_survive_restart(db_session, test_user):
+    """测试应用重启时尚未执行的延后任务不被标记为失败"""
+    deferred = add_task(db_session, test_user, deferred_until=TimeUtil.now_ms() + 3600 * 1000)
+    pending = add_task(db_session, test_user)
+
+    TaskService.check_incomplete_tasks(db_session)
+
+    assert deferred.status == TaskStatus.PENDING.value
+    assert pending.status == TaskStatus.FAILED.value
@@ -0,0 +1,61 @@
+import pytest
+
+from core.config import config_manager
+from services.client_pool import ClientPool
+from services.llm import LLMService
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # 隔离数据库配置，避免影响其他测试
+    monkeypatch.setattr(config_manager, "_db_config", {})
+    pool = ClientPool.get_instance()
+    pool.reset()
+    yield pool
+    pool.reset()
+
+
+def test_clients_shared_across_services(pool):
+    """测试多个服务实例共享同一个客户端"""
+    assert LLMService().llm is LLMService().llm
+    assert pool.get_openai_tts() is pool.get_openai_tts()
+    assert pool.get_edge_tts() is pool.get_edge_tts()
+
+
+def test_llm_client_rebuilt_on_config_change(pool, db_session):
+    """测试修改模型配置后重建LLM客户端"""
+    llm = pool.get_chat_model()
+    tts = pool.get_openai_tts()
+
+    config_manager.update_config(db_session, "MODEL", "pool-test-model", "str")
+
+    new_llm = pool.get_chat_model()
+    assert new_llm is not llm
+    assert new_llm.model_name == "pool-test-model"
+    # TTS配置未变化，客户端保持不变
+    assert pool.get_openai_tts() is tts
+
+
+def test_tts_client_rebuilt_on_config_change(pool, db_session):
+    """测试修改TTS地址后重建TTS客户端"""
+    tts = pool.get_openai_tts()
+
+    config_manager.update_config(db_session, "TTS_BASE_URL", "http://tts.example.com/v1", "str")
+
+    new_tts = pool.get_openai_tts()
+    assert new_tts is not tts
+    assert str(new_tts.base_url).startswith("http://tts.example.com/v1")
+
+
+def test_llm_slots_follow_concurrency_config(pool, monkeypatch):
+    """测试LLM并发信号量按当前配置创建，默认与任务线程数一致"""
+    monkeypatch.setattr(config_manager, "_db_config", {"LLM_MAX_CONCURRENCY": 0, "MAX_TASK_WORKERS": 6})
+    slots = pool.get_llm_slots()
+    assert pool.get_llm_slots() is slots
+    assert ClientPool.llm_concurrency() == 6
+
+    monkeypatch.setattr(config_manager, "_db_config", {"LLM_MAX_CONCURRENCY": 2, "MAX_TASK_WORKERS": 6})
+    new_slots = pool.get_llm_slots()
+    assert new_slots is not slots
+    assert new_slots.acquire(blocking=False) and new_slots.acquire(blocking=False)
+    assert not new_slots.acquire(blocking=False)
@@ -0,0 +1,118 @@
+import pytest
+from fastapi import status
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import MagicMock
+
+from core.config import config_manager
+from crud.content_cache import content_cache as content_cache_crud
+from models.content_cache import ContentCacheEntry
+from services.content_cache import canonicalize_url, content_cache
+from services.task.steps import fetch_content as fetch_content_module
+from services.task.steps.fetch_content import FetchContentStep
+
+URL = "https://Example.com:443/news/story?id=7&utm_source=rss&fbclid=abc#comments"
+
+
+class FakeContext:
+    """基于字典的上下文"""
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def validate_keys(self, keys):
+        return [key for key in keys if key not in self.data]
+
+
+@pytest.fixture
+def cached_fetch(db_session, monkeypatch):
+    """缓存写入测试数据库，页面抓取计数并返回固定内容"""
+    monkeypatch.setattr(config_manager, "_db_config", {})
+    monkeypatch.setattr(content_cache, "session_factory", sessionmaker(bind=db_session.get_bind()))
+    calls = []
+
+    def fake_fetch(url):
+        calls.append(url)
+        return f"正文内容 {len(calls)}", "标题"
+
+    monkeypatch.setattr(fetch_content_module, "fetch_url_content", fake_fetch)
+    return calls
+
+
+def _run_step(tmp_path, url, **context):
+    step = FetchContentStep(progress_tracker=MagicMock(), context_manager=FakeContext({
+        "url": url, "temp_dir": str(tmp_path), **context
+    }))
+    return step, step.execute()
+
+
+def test_canonicalize_url():
+    """测试规范化去除跟踪参数、片段和默认端口，其余参数排序"""
+    assert canonicalize_url(URL) == "https://example.com/news/story?id=7"
+    assert canonicalize_url("http://example.com?b=2&a=1&utm_medium=x") == "http://example.com/?a=1&b=2"
+    assert canonicalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+
+
+def test_same_article_fetched_once(db_session, cached_fetch, tmp_path):
+    """测试不同跟踪参数的同一篇文章只抓取一次"""
+    _, first = _run_step(tmp_path, URL)
+    step, second = _run_step(tmp_path, "https://example.com/news/story?id=7&utm_campaign=other")
+
+    assert cached_fetch == [URL]
+    assert first["raw_content"] == second["raw_content"] == "正文内容 1"
+    assert second["raw_title"] == "标题"
+    assert step.usage["calls"] == 0
+    assert step.usage["provider"] == "content_cache"
+    assert db_session.query(ContentCacheEntry).one().hit_count == 1
+
+
+def test_refresh_content_bypasses_cache(db_session, cached_fetch, tmp_path):
+    """测试强制刷新时重新抓取并更新缓存"""
+    _run_step(tmp_path, URL)
+    _, refreshed = _run_step(tmp_path, URL, refresh_content=True)
+    _, cached = _run_step(tmp_path, URL)
+
+    assert len(cached_fetch) == 2
+    assert refreshed["raw_content"] == cached["raw_content"] == "正文内容 2"
+
+
+def test_disabled_cache_always_fetches(db_session, cached_fetch, tmp_path, monkeypatch):
+    """测试关闭缓存后每次都抓取且不写入缓存"""
+    monkeypatch.setitem(config_manager._db_config, "CONTENT_CACHE_ENABLED", False)
+    _run_step(tmp_path, URL)
+    _run_step(tmp_path, URL)
+
+    assert len(cached_fetch) == 2
+    assert db_session.query(ContentCacheEntry).count() == 0
+
+
+def test_evict_expired_and_oldest(db_session):
+    """测试淘汰过期条目与超出容量的最旧条目"""
+    for key, ttl in (("expired", -1), ("a", 60), ("b", 60), ("c", 60)):
+        content_cache_crud.upsert(db_session, url_key=key, ttl_seconds=ttl, url=key, content=key, title=None)
+    db_session.query(ContentCacheEntry).filter_by(url_key="a").update({"created_at": 1})
+    db_session.commit()
+
+    assert content_cache_crud.evict(db_session, max_entries=2) == 2
+    assert {row.url_key for row in db_session.query(ContentCacheEntry).all()} == {"b", "c"}
+
+
+def test_content_cache_admin_api(client, db_session, test_admin, cached_fetch, tmp_path):
+    """测试缓存统计与按URL清空接口"""
+    _run_step(tmp_path, URL)
+    _run_step(tmp_path, URL)
+    admin_token = client.post(
+        "/api/v1/auth/login", data={"username": "admin", "password": "adminpass"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = client.get("/api/v1/admin/content-cache", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["entries"] == 1
+    assert response.json()["stored_hits"] == 1
+
+    response = client.delete(
+        "/api/v1/admin/content-cache", params={"url": "https://example.com/news/story?id=7"}, headers=headers
+    )
+    assert response.json() == {"removed": 1}
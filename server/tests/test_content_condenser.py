@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from core.config import config_manager
+from services.content_condenser import ContentCondenser
+from utils.token_utils import TokenUtil
+
+
+class FakeLLMService:
+    """提炼片段时返回片段序号，整合时返回拼接结果"""
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def invoke(self, template_name, inputs, json_output=False, step=None, validate=None):
+        with self._lock:
+            self.calls.append((template_name, inputs))
+        if template_name == ContentCondenser.MAP_TEMPLATE:
+            result = f"summary-{inputs['chunk_index']}/{inputs['chunk_total']}"
+        else:
+            result = f"reduced[{inputs['content']}]"
+        if validate is not None:
+            validate(result)
+        return result
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    paragraph_tokens = TokenUtil.count(_paragraph(0))
+    monkeypatch.setattr(config_manager, "_db_config", {
+        "LONG_TEXT_TOKEN_BUDGET": paragraph_tokens * 4,
+        "LONG_TEXT_CHUNK_TOKENS": paragraph_tokens * 3,
+    })
+    return paragraph_tokens
+
+
+def _paragraph(i):
+    return f"Paragraph {i}. " + "This sentence carries some article content. " * 20
+
+
+def test_short_text_returned_unchanged(budget):
+    """测试预算以内的文本不调用LLM"""
+    llm = FakeLLMService()
+    text = "\n\n".join(_paragraph(i) for i in range(2))
+
+    assert ContentCondenser(llm).condense(text) == text
+    assert llm.calls == []
+
+
+def test_long_text_condensed_by_map_reduce(budget):
+    """测试长文分段提炼后整合，覆盖全部片段且保持顺序"""
+    llm = FakeLLMService()
+    text = "\n\n".join(_paragraph(i) for i in range(10))
+
+    result = ContentCondenser(llm).condense(text)
+
+    map_calls = [inputs for name, inputs in llm.calls if name == ContentCondenser.MAP_TEMPLATE]
+    reduce_calls = [inputs for name, inputs in llm.calls if name == ContentCondenser.REDUCE_TEMPLATE]
+    total = len(ContentCondenser(llm).split_chunks(text, budget * 3))
+    assert total > 1
+    assert len(map_calls) == total
+    assert len(reduce_calls) == 1
+    assert result == "reduced[" + "\n\n".join(f"summary-{i}/{total}" for i in range(1, total + 1)) + "]"
+    # 每个片段都不超过片段token上限，且拼接后覆盖全部段落
+    assert all(TokenUtil.count(inputs["content"]) <= budget * 3 for inputs in map_calls)
+    merged = "\n\n".join(inputs["content"] for inputs in map_calls)
+    assert all(f"Paragraph {i}." in merged for i in range(10))
+
+
+def test_oversized_paragraph_split_by_sentence(budget):
+    """测试超长段落按句子切分"""
+    condenser = ContentCondenser(FakeLLMService())
+    paragraph = " ".join(_paragraph(i) for i in range(5))
+
+    chunks = condenser.split_chunks(paragraph, budget)
+
+    assert len(chunks) > 1
+    assert all(TokenUtil.count(chunk) <= budget for chunk in chunks)
@@ -0,0 +1,89 @@
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.config import config_manager
+from services.task.steps.content import ContentStep
+
+
+class FakeContext:
+    """基于字典的上下文"""
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+class FakeLLMService:
+    def __init__(self, multi_result):
+        self.multi_result = multi_result
+        self.templates = []
+
+    def invoke(self, template_name, inputs, json_output=False, step=None, validate=None):
+        self.templates.append(template_name)
+        if template_name == ContentStep.MULTI_LEVEL_TEMPLATE:
+            result = self.multi_result
+        else:
+            result = f"single {template_name}"
+        if validate is not None:
+            validate(result)
+        return result
+
+
+@pytest.fixture
+def context(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_manager, "_db_config", {"CONTENT_MULTI_LEVEL_MODE": True})
+    data = {"raw_content": "article text", "title": "title"}
+    for level in ContentStep.LEVELS:
+        level_dir = tmp_path / level
+        level_dir.mkdir()
+        data[f"{level}_dir"] = str(level_dir)
+    return FakeContext(data)
+
+
+def _run(level, context, llm):
+    step = ContentStep(level=level, progress_tracker=MagicMock(), context_manager=context)
+    step.llm_service = llm
+    context.set("level_dir", context.get(f"{level}_dir"))
+    step._execute(context)
+    with open(os.path.join(context.get(f"{level}_dir"), "content.txt"), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_all_levels_generated_in_one_call(context):
+    """测试一次调用生成并写入所有难度内容"""
+    llm = FakeLLMService({"elementary": "easy", "intermediate": "medium", "advanced": "hard"})
+
+    assert _run("elementary", context, llm) == "easy"
+
+    assert llm.templates == [ContentStep.MULTI_LEVEL_TEMPLATE]
+    for level, expected in (("intermediate", "medium"), ("advanced", "hard")):
+        with open(os.path.join(context.get(f"{level}_dir"), "content.txt"), encoding="utf-8") as f:
+            assert f.read() == expected
+
+
+def test_invalid_level_falls_back_to_single_call(context):
+    """测试合并结果中无效的难度回退到单独调用"""
+    llm = FakeLLMService({"elementary": "  ", "intermediate": "medium"})
+
+    assert _run("elementary", context, llm) == "single content_processing_elementary"
+    assert not os.path.exists(os.path.join(context.get("advanced_dir"), "content.txt"))
+
+    assert _run("advanced", context, llm) == "single content_processing_advanced"
+    assert llm.templates == [
+        ContentStep.MULTI_LEVEL_TEMPLATE,
+        "content_processing_elementary",
+        "content_processing_advanced",
+    ]
+
+
+def test_malformed_response_falls_back(context):
+    """测试合并结果格式错误时回退到逐级生成"""
+    llm = FakeLLMService(["not", "a", "dict"])
+
+    assert _run("elementary", context, llm) == "single content_processing_elementary"
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from core import scheduler as scheduler_module
+from core.config import config_manager
+from core.scheduler import FeedScheduler
+from models.rss import RSSFeed
+from utils.time_utils import TimeUtil
+
+
+@pytest.fixture
+def feed_scheduler(db_session, monkeypatch):
+    """从测试数据库载入源，记录每次唤醒抓取的时间"""
+    monkeypatch.setattr(config_manager, "_db_config", {"RSS_MIN_FETCH_INTERVAL": 900})
+    monkeypatch.setattr(FeedScheduler, "session_factory", sessionmaker(bind=db_session.get_bind()))
+    wakeups = []
+
+    async def fake_fetch_all_feeds():
+        wakeups.append(TimeUtil.now_ms())
+        return []
+
+    monkeypatch.setattr(scheduler_module, "fetch_all_feeds", fake_fetch_all_feeds)
+    scheduler = FeedScheduler.get_instance()
+    scheduler.wakeups = wakeups
+    yield scheduler
+    scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_wakes_when_feed_due(db_session, test_user, feed_scheduler):
+    """测试调度器在源到期时唤醒，而不是按固定周期扫描"""
+    now = TimeUtil.now_ms()
+    db_session.add_all([
+        RSSFeed(url="https://a.example.com/rss", user_id=test_user.id, next_fetch_at=now + 300),
+        RSSFeed(url="https://b.example.com/rss", user_id=test_user.id, next_fetch_at=now + 600),
+        RSSFeed(url="https://c.example.com/rss", user_id=test_user.id, next_fetch_at=now + 600, is_active=False),
+    ])
+    db_session.commit()
+
+    feed_scheduler.start()
+    await asyncio.sleep(1)
+
+    # 启动时兜底扫描一次，之后每个源到期时各唤醒一次
+    assert len(feed_scheduler.wakeups) == 3
+    assert feed_scheduler.wakeups[0] < feed_scheduler.wakeups[1] < feed_scheduler.wakeups[2]
+    assert feed_scheduler.wakeups[1] >= now + 300
+    assert feed_scheduler.wakeups[2] >= now + 600
+
+
+@pytest.mark.asyncio
+async def test_schedule_and_remove(db_session, test_user, feed_scheduler):
+    """测试新安排的源提前唤醒调度器，已移除的源不再触发抓取"""
+    feed_scheduler.start()
+    await asyncio.sleep(0.1)
+    start = TimeUtil.now_ms()
+
+    feed_scheduler.schedule(1, start + 200)
+    feed_scheduler.schedule(2, start + 400)
+    feed_scheduler.remove(2)
+    await asyncio.sleep(0.7)
+
+    assert len(feed_scheduler.wakeups) == 2
+    # 已移除的源不会触发第三次唤醒
+    assert feed_scheduler.wakeups[0] < feed_scheduler.wakeups[1]
+    assert feed_scheduler.wakeups[1] >= start + 200
@@ -0,0 +1,50 @@
+import pytest
+
+from core.config import config_manager
+from services.html_extractor import LxmlExtractor, SoupExtractor, get_extractor
+from services.url_fetcher import URLContentError, extract_content
+from tests.bench_html_extractor import load_corpus, score_extraction
+
+CORPUS = load_corpus()
+
+
+@pytest.mark.parametrize("name,html,expected", CORPUS, ids=[page[0] for page in CORPUS])
+def test_lxml_extracts_main_content(name, html, expected):
+    """测试打分提取只保留正文，不包含评论、侧栏和推荐链接"""
+    content, title = get_extractor("lxml").extract(html)
+    precision, recall, _ = score_extraction(content, expected)
+
+    assert title
+    assert precision == 1.0
+    assert recall >= 0.9
+
+
+def test_lxml_not_worse_than_soup():
+    """测试语料上打分提取的质量不低于原有的 BeautifulSoup 提取"""
+    for _, html, expected in CORPUS:
+        soup_f1 = score_extraction(SoupExtractor().extract(html)[0], expected)[2]
+        lxml_f1 = score_extraction(LxmlExtractor().extract(html)[0], expected)[2]
+        assert lxml_f1 >= soup_f1
+
+
+def test_extractor_selected_by_config(monkeypatch):
+    """测试按配置选择提取器，未知名称回退到 bs4"""
+    monkeypatch.setattr(config_manager, "_db_config", {"HTML_EXTRACTOR": "bs4"})
+    assert isinstance(get_extractor(), SoupExtractor)
+
+    monkeypatch.setattr(config_manager, "_db_config", {"HTML_EXTRACTOR": "lxml"})
+    assert isinstance(get_extractor(), LxmlExtractor)
+
+    monkeypatch.setattr(config_manager, "_db_config", {"HTML_EXTRACTOR": "unknown"})
+    assert isinstance(get_extractor(), SoupExtractor)
+
+
+@pytest.mark.parametrize("extractor", ["bs4", "lxml"])
+def test_empty_page_rejected(monkeypatch, extractor):
+    """测试没有正文的页面抛出 URLContentError"""
+    monkeypatch.setattr(config_manager, "_db_config", {"HTML_EXTRACTOR": extractor})
+
+    with pytest.raises(URLContentError):
+        extract_content("<html><head><title>空页面</title></head><body><nav>菜单</nav></body></html>")
+    with pytest.raises(URLContentError):
+        extract_content("")
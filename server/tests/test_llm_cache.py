@@ -0,0 +1,132 @@
+import pytest
+from fastapi import status
+from sqlalchemy.orm import sessionmaker
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from core.config import config_manager
+from crud.llm_cache import llm_cache as llm_cache_crud
+from models.llm_cache import LLMCacheEntry
+from services.client_pool import ClientPool
+from services.llm import LLMService
+from services.llm_cache import llm_cache
+from services.task.steps.generate_title import GenerateTitleStep
+
+TEMPLATE = "podcast_title_generation"
+
+
+@pytest.fixture
+def fake_llm(db_session, monkeypatch):
+    """使用假模型替换共享客户端，缓存写入测试数据库"""
+    monkeypatch.setattr(config_manager, "_db_config", {})
+    monkeypatch.setattr(llm_cache, "session_factory", sessionmaker(bind=db_session.get_bind()))
+    fake = FakeListChatModel(responses=["标题一", "标题二", "标题三"])
+    monkeypatch.setattr(ClientPool.get_instance(), "get_chat_model", lambda: fake)
+    return fake
+
+
+def test_identical_inputs_served_from_cache(db_session, fake_llm):
+    """测试相同输入第二次调用命中缓存"""
+    service = LLMService()
+    first = service.invoke(TEMPLATE, {"content": "同一篇文章"})
+    second = service.invoke(TEMPLATE, {"content": "同一篇文章"})
+    third = service.invoke(TEMPLATE, {"content": "另一篇文章"})
+
+    assert first == second == "标题一"
+    assert third == "标题二"
+    entry = db_session.query(LLMCacheEntry).filter_by(response="标题一").one()
+    assert entry.hit_count == 1
+    assert entry.template_name == TEMPLATE
+
+
+def test_disabled_template_bypasses_cache(db_session, fake_llm, monkeypatch):
+    """测试禁用缓存的模板每次都调用LLM"""
+    monkeypatch.setitem(config_manager._db_config, "LLM_CACHE_DISABLED_TEMPLATES", TEMPLATE)
+    service = LLMService()
+
+    assert service.invoke(TEMPLATE, {"content": "文章"}) == "标题一"
+    assert service.invoke(TEMPLATE, {"content": "文章"}) == "标题二"
+    assert db_session.query(LLMCacheEntry).count() == 0
+
+
+def test_invalid_result_not_cached(db_session, fake_llm):
+    """测试未通过校验的结果不写入缓存"""
+    def reject(result):
+        raise ValueError("结果无效")
+
+    with pytest.raises(ValueError):
+        LLMService().invoke(TEMPLATE, {"content": "文章"}, validate=reject)
+    assert db_session.query(LLMCacheEntry).count() == 0
+
+
+def test_rejected_title_not_cached(db_session, fake_llm):
+    """测试步骤拒绝的标题不写入缓存，下次调用重新生成"""
+    fake_llm.responses = ["无标题", "标题"]
+    step = GenerateTitleStep(progress_tracker=None, context_manager=None)
+
+    with pytest.raises(ValueError):
+        step._generate_title("文章")
+    assert db_session.query(LLMCacheEntry).count() == 0
+    assert step._generate_title("文章") == "标题"
+
+
+def test_retrying_step_skips_cache(db_session, fake_llm):
+    """测试步骤重试时不读取缓存，新的响应覆盖原有缓存"""
+    step = GenerateTitleStep(progress_tracker=None, context_manager=None)
+    service = LLMService()
+    assert service.invoke(TEMPLATE, {"content": "文章"}, step=step) == "标题一"
+
+    step.retrying = True
+    assert service.invoke(TEMPLATE, {"content": "文章"}, step=step) == "标题二"
+    step.retrying = False
+    assert service.invoke(TEMPLATE, {"content": "文章"}, step=step) == "标题二"
+    assert db_session.query(LLMCacheEntry).one().response == "标题二"
+
+
+def _add_entry(db_session, key, ttl_seconds=60):
+    llm_cache_crud.upsert(
+        db_session, cache_key=key, ttl_seconds=ttl_seconds, template_name=TEMPLATE,
+        template_version="v1", model="m", temperature=None, response=key, tokens=10
+    )
+
+
+def test_evict_expired_and_oldest(db_session):
+    """测试淘汰过期条目与超出容量的最旧条目"""
+    _add_entry(db_session, "expired", ttl_seconds=-1)
+    for key in ("a", "b", "c"):
+        _add_entry(db_session, key)
+    db_session.query(LLMCacheEntry).filter_by(cache_key="a").update({"created_at": 1})
+    db_session.commit()
+
+    removed = llm_cache_crud.evict(db_session, max_entries=2)
+
+    assert removed == 2
+    keys = {row.cache_key for row in db_session.query(LLMCacheEntry).all()}
+    assert keys == {"b", "c"}
+
+
+def test_llm_cache_admin_api(client, db_session, test_user, test_admin):
+    """测试缓存统计与清空接口"""
+    _add_entry(db_session, "a")
+    llm_cache_crud.get_valid(db_session, "a")
+
+    user_token = client.post(
+        "/api/v1/auth/login", data={"username": "testuser", "password": "testpass"}
+    ).json()["access_token"]
+    admin_token = client.post(
+        "/api/v1/auth/login", data={"username": "admin", "password": "adminpass"}
+    ).json()["access_token"]
+
+    response = client.get("/api/v1/admin/llm-cache", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = client.get("/api/v1/admin/llm-cache", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    item = response.json()["items"][0]
+    assert item["template_name"] == TEMPLATE
+    assert item["entries"] == 1
+    assert item["hits"] == 1
+    assert item["tokens_saved"] == 10
+
+    response = client.delete(f"/api/v1/admin/llm-cache?template_name={TEMPLATE}", headers=headers)
+    assert response.json() == {"removed": 1}
@@ -0,0 +1,63 @@
+import pytest
+from fastapi import status
+
+from core import metrics
+
+
+def _sample(name, labels=None):
+    return metrics.REGISTRY.get_sample_value(name, labels or {}) or 0
+
+
+def test_metrics_endpoint_exposes_http_route(client):
+    """测试指标接口按路由模板输出HTTP耗时"""
+    client.get("/api/v1/tasks/not-exist-task/timeline")
+
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "lingopod_http_request_duration_seconds_count" in body
+    assert 'route="/api/v1/tasks/{task_id}/timeline"' in body
+    assert "not-exist-task" not in body
+
+
+def test_http_route_label_uses_route_template(client):
+    """测试路径参数值与固定路径段相同时仍输出路由模板，未匹配的路径统一记为 unmatched"""
+    client.get("/api/v1/tasks/tasks/timeline")
+    client.get("/no-such-path/12345")
+
+    body = client.get("/metrics").text
+    assert 'route="/api/v1/tasks/{task_id}/timeline"' in body
+    assert 'route="/api/v1/{task_id}/{task_id}/timeline"' not in body
+    assert _sample(
+        "lingopod_http_request_duration_seconds_count",
+        {"method": "GET", "route": "unmatched", "status": "404"}
+    ) >= 1
+    assert "no-such-path" not in body
+
+
+def test_track_provider_call_counts_errors():
+    """测试外部调用失败时按异常类型计数"""
+    labels = {"kind": "llm", "provider": "test-model", "error": "TimeoutError"}
+    before_errors = _sample("lingopod_provider_call_errors_total", labels)
+    before_calls = _sample(
+        "lingopod_provider_call_duration_seconds_count",
+        {"kind": "llm", "provider": "test-model"}
+    )
+
+    with pytest.raises(TimeoutError):
+        with metrics.track_provider_call("llm", "test-model"):
+            raise TimeoutError("超时")
+
+    assert _sample("lingopod_provider_call_errors_total", labels) == before_errors + 1
+    assert _sample(
+        "lingopod_provider_call_duration_seconds_count",
+        {"kind": "llm", "provider": "test-model"}
+    ) == before_calls + 1
+
+
+def test_db_commit_latency_recorded(db_session):
+    """测试数据库提交耗时被记录"""
+    before = _sample("lingopod_db_commit_duration_seconds_count")
+    db_session.commit()
+    assert _sample("lingopod_db_commit_duration_seconds_count") == before + 1
@@ -0,0 +1,82 @@
+import os
+import pytest
+
+from utils.prompt_utils import PromptUtils
+
+TEMPLATE_YAML = """
+greeting:
+  system: |
+    You are a helpful assistant.
+  human: |
+    Say hello to {name}.
+"""
+
+
+@pytest.fixture
+def template_file(tmp_path, monkeypatch):
+    path = tmp_path / "prompt_templates.yaml"
+    path.write_text(TEMPLATE_YAML, encoding="utf-8")
+    monkeypatch.setattr(PromptUtils, "get_template_file", staticmethod(lambda: str(path)))
+    # 隔离类级缓存，测试结束后恢复
+    for attr, value in (("_loaded_file", None), ("_loaded_mtime", None),
+                        ("_templates", {}), ("_prompts", {}), ("_versions", {})):
+        monkeypatch.setattr(PromptUtils, attr, value)
+    return path
+
+
+def _touch(path, content):
+    """写入新内容并推进修改时间，避免文件系统时间精度导致未检测到变化"""
+    mtime = os.path.getmtime(path)
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, (mtime + 10, mtime + 10))
+
+
+def test_template_parsed_once(template_file, monkeypatch):
+    """测试模板文件只解析一次并返回已编译模板"""
+    calls = []
+    original_load = PromptUtils._load.__func__
+
+    def counting_load(cls, *args):
+        calls.append(args)
+        return original_load(cls, *args)
+
+    monkeypatch.setattr(PromptUtils, "_load", classmethod(counting_load))
+
+    prompt = PromptUtils.create_chat_prompt("greeting")
+    assert PromptUtils.create_chat_prompt("greeting") is prompt
+    assert PromptUtils.get_prompt_template("greeting")["human"].startswith("Say hello")
+    assert prompt.input_variables == ["name"]
+    assert len(calls) == 1
+
+
+def test_template_reloaded_on_mtime_change(template_file):
+    """测试模板文件修改后重新加载并更新版本哈希"""
+    version = PromptUtils.get_template_version("greeting")
+
+    _touch(template_file, TEMPLATE_YAML.replace("Say hello", "Say goodbye"))
+
+    assert PromptUtils.get_template_version("greeting") != version
+    assert "goodbye" in PromptUtils.get_prompt_template("greeting")["human"]
+
+
+def test_invalid_template_fails_validation(template_file):
+    """测试无效模板在校验时直接报错"""
+    template_file.write_text("broken:\n  system: hi\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="broken"):
+        PromptUtils.validate_templates()
+
+
+def test_broken_reload_keeps_previous_templates(template_file):
+    """测试运行中模板被改坏时继续使用旧版本"""
+    version = PromptUtils.get_template_version("greeting")
+
+    _touch(template_file, "greeting: [unclosed")
+
+    assert PromptUtils.get_template_version("greeting") == version
+
+
+def test_project_templates_valid():
+    """测试项目自带的提示词模板全部有效"""
+    versions = PromptUtils.validate_templates()
+    assert "podcast_title_generation" in versions
+    assert all(len(v) == 16 for v in versions.values())
@@ -0,0 +1,178 @@
+import time
+
+import httpx
+import httpx2
+import pytest
+from openai import RateLimitError
+from sqlalchemy.orm import sessionmaker
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from core.config import config_manager
+from services.client_pool import ClientPool
+from services.llm import LLMService
+from services.rate_limiter import (
+    RateLimiter, RateLimiterRegistry, RateLimitTimeout, SharedTokenBucket, TokenBucket,
+    retry_after_seconds
+)
+
+
+def _rate_limit_error(headers):
+    request = httpx2.Request("POST", "http://llm.test/v1/chat/completions")
+    response = httpx2.Response(429, headers=headers, request=request)
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.fixture
+def limiter_settings(monkeypatch):
+    monkeypatch.setattr(config_manager, "_db_config", {
+        "LLM_CACHE_ENABLED": False,
+        "RATE_LIMIT_DEFAULT_BACKOFF": 0.05,
+    })
+    RateLimiterRegistry.get_instance().reset()
+    yield config_manager._db_config
+    RateLimiterRegistry.get_instance().reset()
+
+
+def test_token_bucket_refills_over_time():
+    """测试令牌耗尽后按速率补充"""
+    bucket = TokenBucket(capacity=600)  # 每秒补充10个
+
+    assert bucket.try_acquire(600) == 0
+    wait = bucket.try_acquire(5)
+    assert 0.4 < wait <= 0.5
+
+    time.sleep(wait)
+    assert bucket.try_acquire(5) == 0
+
+
+def test_blocked_bucket_waits_for_retry_after():
+    """测试收到限流响应后在暂停期内不发放令牌"""
+    bucket = TokenBucket(capacity=600)
+    bucket.block(0.2)
+
+    assert 0.1 < bucket.try_acquire(1) <= 0.2
+    time.sleep(0.2)
+    assert bucket.try_acquire(1) == 0
+
+
+def test_acquire_times_out(limiter_settings):
+    """测试等待超过上限时抛出异常"""
+    limiter = RateLimiter("llm:test", rpm=1, tpm=0)
+    limiter.acquire()
+
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(timeout=0.1)
+
+
+def test_request_token_returned_when_tokens_bucket_times_out(limiter_settings):
+    """测试token桶等待超时后归还已取出的请求数令牌"""
+    limiter = RateLimiter("llm:test", rpm=2, tpm=600)
+    limiter.acquire(tokens=600)
+
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(tokens=600, timeout=0.1)
+
+    # 请求数桶仍剩一次配额
+    assert limiter.requests.try_acquire(1) == 0
+
+
+def test_shared_bucket_visible_across_instances(db_session):
+    """测试数据库令牌桶在多个实例(进程)间共享配额"""
+    factory = sessionmaker(bind=db_session.get_bind())
+    first = SharedTokenBucket("llm:shared:tokens", 100, session_factory=factory)
+    second = SharedTokenBucket("llm:shared:tokens", 100, session_factory=factory)
+
+    assert first.try_acquire(80) == 0
+    assert second.try_acquire(30) > 0
+    assert second.try_acquire(20) == 0
+
+    second.block(5)
+    assert first.try_acquire(1) > 4
+
+
+def test_retry_after_header_parsing():
+    """测试解析 Retry-After 与 retry-after-ms 响应头"""
+    assert retry_after_seconds(_rate_limit_error({"retry-after": "7"})) == 7
+    assert retry_after_seconds(_rate_limit_error({"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(_rate_limit_error({})) is None
+    assert retry_after_seconds(ValueError("other")) is None
+
+
+class ThrottledChatModel(FakeListChatModel):
+    """前几次调用返回429的假模型"""
+    failures: int = 1
+
+    def _call(self, *args, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            raise _rate_limit_error({"retry-after-ms": "100"})
+        return super()._call(*args, **kwargs)
+
+
+def test_llm_retries_after_throttle(limiter_settings, monkeypatch):
+    """测试LLM调用被限流后按 Retry-After 暂停并重试"""
+    fake = ThrottledChatModel(responses=["标题"], failures=1)
+    monkeypatch.setattr(ClientPool.get_instance(), "get_chat_model", lambda: fake)
+
+    start = time.monotonic()
+    result = LLMService().invoke("podcast_title_generation", {"content": "文章"})
+
+    assert result == "标题"
+    assert time.monotonic() - start >= 0.1
+
+
+def test_llm_gives_up_after_max_retries(limiter_settings, monkeypatch):
+    """测试持续限流超过重试次数后抛出异常"""
+    limiter_settings["RATE_LIMIT_MAX_RETRIES"] = 1
+    fake = ThrottledChatModel(responses=["标题"], failures=5)
+    monkeypatch.setattr(ClientPool.get_instance(), "get_chat_model", lambda: fake)
+
+    with pytest.raises(RateLimitError):
+        LLMService().invoke("podcast_title_generation", {"content": "文章"})
+    assert fake.failures == 3
+
+
+@pytest.fixture
+def throttling_endpoint(limiter_settings, monkeypatch):
+    """所有请求都返回429的HTTP端点，记录请求次数及限流器收到429时的请求次数"""
+    limiter_settings["RATE_LIMIT_MAX_RETRIES"] = 0
+    requests, throttled_after = [], []
+
+    def handler(request):
+        requests.append(request.url)
+        return httpx.Response(429, headers={"retry-after-ms": "10"}, json={"error": {"message": "rate limited"}})
+
+    pool = ClientPool.get_instance()
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(pool, "_build_http_client", lambda: httpx.Client(transport=transport))
+    monkeypatch.setattr(pool, "_build_async_http_client", lambda: httpx.AsyncClient(transport=transport))
+    report_throttled = RateLimiter.report_throttled
+
+    def record_throttled(self, retry_after=None):
+        throttled_after.append(len(requests))
+        report_throttled(self, retry_after)
+
+    monkeypatch.setattr(RateLimiter, "report_throttled", record_throttled)
+    pool.reset()
+    yield pool, requests, throttled_after
+    pool.reset()
+
+
+def test_llm_429_reaches_limiter_without_sdk_retry(throttling_endpoint):
+    """测试LLM客户端不在SDK内部重试429，一次请求后即由限流器处理"""
+    _, requests, throttled_after = throttling_endpoint
+
+    with pytest.raises(RateLimitError):
+        LLMService().invoke("podcast_title_generation", {"content": "文章"})
+    assert throttled_after == [1]
+    assert len(requests) == 1
+
+
+def test_tts_clients_do_not_retry_429(throttling_endpoint):
+    """测试TTS客户端关闭SDK内置重试，429只产生一次请求"""
+    pool, requests, _ = throttling_endpoint
+
+    with pytest.raises(RateLimitError):
+        pool.get_openai_tts().audio.speech.create(model="tts-1", voice="alloy", input="hi")
+    assert len(requests) == 1
+    assert pool.get_async_openai_tts().max_retries == 0
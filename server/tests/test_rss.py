@@ -162,6 +162,36 @@ class TestRSSAPI:
         assert data["initial_entries_count"] == 5
         assert data["update_entries_count"] == 3
 
+    def test_update_feed_entry_filters(self, client, test_token: str, test_feed: RSSFeed):
+        """测试设置条目过滤规则，无效的正则表达式被拒绝"""
+        filters = {"exclude_keywords": ["Sponsored"], "title_pattern": "^\\[(AI|LLM)\\]"}
+        response = client.put(
+            f"/api/v1/rss/feeds/{test_feed.id}",
+            headers={"Authorization": f"Bearer {test_token}"},
+            json={"entry_filters": filters}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["entry_filters"]
+        assert data["exclude_keywords"] == ["Sponsored"]
+        assert data["title_pattern"] == filters["title_pattern"]
+
+        response = client.put(
+            f"/api/v1/rss/feeds/{test_feed.id}",
+            headers={"Authorization": f"Bearer {test_token}"},
+            json={"entry_filters": {"title_pattern": "(unclosed"}}
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.parametrize("field", ["use_embedded_content", "defer_to_batch_window"])
+    def test_update_feed_rejects_null_flag(self, client, test_token: str, test_feed: RSSFeed, field):
+        """测试非空的开关字段不能更新为null"""
+        response = client.put(
+            f"/api/v1/rss/feeds/{test_feed.id}",
+            headers={"Authorization": f"Bearer {test_token}"},
+            json={field: None}
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
     def test_delete_feed(self, client, test_token: str, test_feed: RSSFeed):
         """测试删除RSS源"""
         response = client.delete(
@@ -0,0 +1,94 @@
+import shutil
+
+import pytest
+
+from core.config import config_manager
+from models.rss import RSSEntry, RSSFeed
+from models.task import Task, TaskProgress, TaskStatus
+from services.rss.feed_manager import FeedManager
+from services.rss.parser import parse_feed_document
+from services.task.processor import TaskProcessor
+from services.task.steps.fetch_content import FetchContentStep
+
+ARTICLE = "<p>Full <b>article</b> paragraph.</p>" * 100
+
+
+def rss(content):
+    """生成条目内嵌了 content:encoded 正文的RSS文档"""
+    return (
+        '<?xml version="1.0"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        '<channel><title>Feed</title><item><title>Post</title><link>https://example.com/post</link>'
+        '<guid>post</guid><description>Summary</description>'
+        f'<content:encoded><![CDATA[{content}]]></content:encoded></item></channel></rss>'
+    ).encode()
+
+
+@pytest.fixture(autouse=True)
+def min_length(monkeypatch):
+    monkeypatch.setattr(config_manager, "_db_config", {"RSS_EMBEDDED_CONTENT_MIN_LENGTH": 1000})
+    monkeypatch.setattr(FeedManager, "_start_tasks", staticmethod(lambda tasks: None))
+
+
+def test_parse_embedded_content():
+    """测试内嵌的HTML正文转换为纯文本，没有内嵌正文时为None"""
+    keyed_entries, _, _ = parse_feed_document(rss(ARTICLE), 10)
+    content = keyed_entries[0][1]["content"]
+    assert content.startswith("Full article paragraph. Full article")
+    assert "<" not in content
+
+    body = b'<?xml version="1.0"?><rss version="2.0"><channel><item><guid>x</guid></item></channel></rss>'
+    keyed_entries, _, _ = parse_feed_document(body, 10)
+    assert keyed_entries[0][1]["content"] is None
+
+
+@pytest.mark.parametrize("article, use_embedded_content, stored", [
+    (ARTICLE, True, True),
+    ("<p>Too short</p>", True, False),
+    (ARTICLE, False, False),
+], ids=["long", "short", "opt-out"])
+def test_store_embedded_content(db_session, test_user, article, use_embedded_content, stored):
+    """测试只保存足够长且源未关闭的内嵌正文"""
+    feed = RSSFeed(url="https://example.com/feed.xml", user_id=test_user.id,
+                   use_embedded_content=use_embedded_content)
+    db_session.add(feed)
+    db_session.commit()
+
+    keyed_entries, _, _ = parse_feed_document(rss(article), 10)
+    FeedManager(db_session, None)._process_entries([feed], keyed_entries, {}, "hash")
+
+    entry = db_session.query(RSSEntry).filter_by(feed_id=feed.id).one()
+    assert (entry.content is not None) == stored
+
+
+def test_task_skips_fetch_with_embedded_content(db_session, test_user):
+    """测试条目带内嵌正文时任务预置正文并跳过页面抓取"""
+    task = Task(
+        taskId="test-embedded-content",
+        url="https://example.com/post",
+        status=TaskStatus.PENDING.value,
+        progress=TaskProgress.WAITING.value,
+        user_id=test_user.id,
+        created_by=test_user.id,
+    )
+    feed = RSSFeed(url="https://example.com/feed.xml", user_id=test_user.id)
+    db_session.add_all([task, feed])
+    db_session.flush()
+    db_session.add(RSSEntry(feed_id=feed.id, guid="post", title="Post", link=task.url,
+                            content="Full article " * 200, user_id=test_user.id, task_id=task.taskId))
+    db_session.commit()
+
+    processor = TaskProcessor(task, db_session)
+    try:
+        fetch_step = next(step for step in processor.steps if isinstance(step, FetchContentStep))
+        assert not processor._should_execute_step(fetch_step)
+        assert processor.context_manager.get("raw_title") == "Post"
+        assert processor.context_manager.get("raw_content").startswith("Full article")
+
+        # 要求重新抓取时不使用内嵌正文
+        shutil.rmtree(processor.temp_dir)
+        task.refresh_content = True
+        db_session.commit()
+        processor = TaskProcessor(task, db_session)
+        assert processor._should_execute_step(fetch_step)
+    finally:
+        shutil.rmtree(processor.temp_dir, ignore_errors=True)
@@ -0,0 +1,73 @@
+import pytest
+
+from models.rss import RSSEntry, RSSFeed
+from models.task import Task
+from services.rss.feed_manager import FeedManager
+from services.rss.filters import entry_skip_reason
+from services.rss.parser import parse_feed_document
+
+ENTRY = {
+    "title": "[AI] New model released",
+    "content": None,
+    "summary": "A long write-up about the new model and its benchmarks.",
+    "categories": ["Tech", "AI"],
+}
+
+
+@pytest.mark.parametrize("filters, reason", [
+    (None, None),
+    ({}, None),
+    ({"include_keywords": ["benchmarks"]}, None),
+    ({"include_keywords": ["crypto"]}, "include_keywords"),
+    ({"exclude_keywords": ["MODEL"]}, "exclude_keywords:MODEL"),
+    ({"min_content_length": 20}, None),
+    ({"min_content_length": 500}, "min_content_length"),
+    ({"categories": ["ai"]}, None),
+    ({"categories": ["Sports"]}, "categories"),
+    ({"title_pattern": r"^\[AI\]"}, None),
+    ({"title_pattern": r"^\[Sponsored\]"}, "title_pattern"),
+])
+def test_entry_skip_reason(filters, reason):
+    """测试各过滤规则，关键词和分类不区分大小写"""
+    assert entry_skip_reason(filters, ENTRY) == reason
+
+
+def rss(*items):
+    """生成带分类和摘要的RSS文档"""
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{guid}</link><guid>{guid}</guid>"
+        f"<category>{category}</category><description>{description}</description></item>"
+        for guid, title, category, description in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{body}</channel></rss>'.encode()
+
+
+def test_skipped_entries_recorded_without_tasks(db_session, test_user, monkeypatch):
+    """测试不满足过滤规则的条目只记录跳过原因，不创建任务，之后也不再重新检查"""
+    started = []
+    monkeypatch.setattr(FeedManager, "_start_tasks", staticmethod(started.extend))
+    feed = RSSFeed(url="https://example.com/feed.xml", user_id=test_user.id, initial_entries_count=3, update_entries_count=3,
+                   entry_filters={"categories": ["tech"], "exclude_keywords": ["sponsored"]})
+    db_session.add(feed)
+    db_session.commit()
+
+    keyed_entries, _, _ = parse_feed_document(rss(
+        ("a", "Chip news", "Tech", "A detailed look at new chips."),
+        ("b", "Match report", "Sports", "Final score."),
+        ("c", "Gadget deal", "Tech", "Sponsored post."),
+    ), 10)
+    manager = FeedManager(db_session, None)
+    manager._process_entries([feed], keyed_entries, {}, "hash")
+
+    entries = {entry.guid: entry for entry in db_session.query(RSSEntry).filter_by(feed_id=feed.id)}
+    assert entries["a"].skip_reason is None and entries["a"].task_id is not None
+    assert entries["b"].skip_reason == "categories" and entries["b"].task_id is None
+    assert entries["c"].skip_reason == "exclude_keywords:sponsored" and entries["c"].task_id is None
+    assert [task.url for task in started] == ["https://example.com/a"]
+
+    # 去掉过滤规则后已跳过的条目不会重新创建任务
+    feed.entry_filters = None
+    db_session.commit()
+    manager._process_entries([feed], keyed_entries, {}, "hash")
+    assert db_session.query(Task).count() == 1
+    assert len(started) == 1
@@ -0,0 +1,305 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import feedparser
+import httpx
+import pytest
+from sqlalchemy import event
+
+from core.config import config_manager
+from models.rss import RSSEntry, RSSFeed
+from models.task import Task
+from main import app
+from services.rss.feed_manager import FeedManager
+
+
+def rss(*items, hours=24, ttl=None):
+    """生成包含指定条目的RSS文档，条目按给定的小时数间隔发布"""
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{guid}</link><guid>{guid}</guid>"
+        f"<pubDate>{format_datetime(datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=hours * index))}</pubDate></item>"
+        for index, (guid, title) in enumerate(items)
+    )
+    ttl = f"<ttl>{ttl}</ttl>" if ttl else ""
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{ttl}{body}</channel></rss>'.encode()
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """返回可在测试中修改的RSS内容，按配置支持 ETag 条件请求"""
+    body = b""
+    etag = None
+    slow_seconds = 1.0
+    cache_control = None
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        FeedHandler.requests_seen.append(dict(self.headers))
+        if "slow" in self.path:
+            time.sleep(self.slow_seconds)
+        if "error" in self.path:
+            self.send_error(500)
+            return
+        if self.etag and self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(self.body)))
+        if self.etag:
+            self.send_header("ETag", self.etag)
+        if self.cache_control:
+            self.send_header("Cache-Control", self.cache_control)
+        self.end_headers()
+        self.wfile.write(self.body)
+
+
+@pytest.fixture
+def feed_server():
+    FeedHandler.body = rss(("a", "First"))
+    FeedHandler.etag = None
+    FeedHandler.slow_seconds = 1.0
+    FeedHandler.cache_control = None
+    FeedHandler.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/feed.xml"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def manager(db_session, monkeypatch):
+    """不实际启动任务处理的 FeedManager"""
+    started = []
+    monkeypatch.setattr(FeedManager, "_start_tasks", staticmethod(started.extend))
+    manager = FeedManager(db_session, None)
+    manager.started = started
+    return manager
+
+
+@pytest.fixture
+def feed(db_session, test_user, feed_server):
+    feed = RSSFeed(
+        title="Feed", url=feed_server, user_id=test_user.id,
+        initial_entries_count=2, update_entries_count=2
+    )
+    db_session.add(feed)
+    db_session.commit()
+    return feed
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation_skips_processing(db_session, manager, feed, monkeypatch):
+    """测试返回304时不解析、不处理条目，只更新抓取时间"""
+    FeedHandler.etag = '"v1"'
+    await manager.fetch_feed(feed)
+    first_fetch = feed.last_fetch
+    assert feed.etag == '"v1"'
+    assert len(manager.started) == 1
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("304 响应不应被解析")
+    monkeypatch.setattr(config_manager, "_db_config", {"RSS_PARSE_WORKERS": 0})
+    monkeypatch.setattr("services.rss.parser.feedparser.parse", fail_parse)
+    await manager.fetch_feed(feed)
+
+    assert FeedHandler.requests_seen[1]["If-None-Match"] == '"v1"'
+    assert "If-None-Match" not in FeedHandler.requests_seen[0]
+    assert feed.last_fetch >= first_fetch
+    assert len(manager.started) == 1
+
+
+@pytest.mark.asyncio
+async def test_unchanged_body_short_circuits(db_session, manager, feed, monkeypatch):
+    """测试服务端不支持条件请求时，内容未变化同样跳过解析"""
+    await manager.fetch_feed(feed)
+    parse_calls = []
+    original_parse = feedparser.parse
+    monkeypatch.setattr(config_manager, "_db_config", {"RSS_PARSE_WORKERS": 0})
+    monkeypatch.setattr(
+        "services.rss.parser.feedparser.parse",
+        lambda body: parse_calls.append(body) or original_parse(body)
+    )
+
+    await manager.fetch_feed(feed)
+    assert parse_calls == []
+
+    FeedHandler.body = rss(("a", "First"), ("b", "Second"))
+    await manager.fetch_feed(feed)
+
+    assert len(parse_calls) == 1
+    assert {entry.guid for entry in db_session.query(RSSEntry).all()} == {"a", "b"}
+    assert db_session.query(Task).count() == 2
+    assert len(manager.started) == 2
+
+
+def _add_feeds(db_session, user, base_url, paths):
+    feeds = [RSSFeed(title=path, url=f"{base_url}?{path}", user_id=user.id) for path in paths]
+    db_session.add_all(feeds)
+    db_session.commit()
+    return feeds
+
+
+@pytest.mark.asyncio
+async def test_slow_feed_does_not_stall_others(db_session, test_user, manager, feed_server, monkeypatch):
+    """测试信号量并发抓取时慢源不阻塞其他源"""
+    monkeypatch.setattr(config_manager, "_db_config", {"RSS_CONCURRENT_TASKS": 4, "RSS_FETCH_TIMEOUT": 5})
+    feeds = _add_feeds(db_session, test_user, feed_server, ["slow"] + [f"fast{i}" for i in range(9)])
+
+    start = time.perf_counter()
+    await manager.process_all_feeds()
+    elapsed = time.perf_counter() - start
+
+    assert all(feed.last_fetch for feed in feeds)
+    # 分批处理时慢源所在批次要等待1秒，批次之间还要再等待1秒
+    assert elapsed < 1.8
+
+
+@pytest.mark.asyncio
+async def test_feed_timeout_isolated(db_session, test_user, manager, feed_server, monkeypatch):
+    """测试超时的源单独失败，不影响同一轮的其他源"""
+    monkeypatch.setattr(config_manager, "_db_config", {"RSS_CONCURRENT_TASKS": 2, "RSS_FETCH_TIMEOUT": 0.3})
+    slow, *fast = _add_feeds(db_session, test_user, feed_server, ["slow", "fast1", "fast2"])
+
+    await manager.process_all_feeds()
+
+    assert slow.last_fetch is None
+    assert all(feed.last_fetch for feed in fast)
+
+
+@pytest.mark.asyncio
+async def test_shared_url_fetched_once(db_session, test_users, manager, feed_server):
+    """测试多个用户订阅同一URL时只抓取一次，并按各自的条目数量和已有条目分发"""
+    feeds = [feed for user in test_users[:4] for feed in _add_feeds(db_session, user, feed_server, ["shared"])]
+    for feed in feeds:
+        feed.initial_entries_count = 1 if feed is feeds[0] else 2
+    db_session.add(RSSEntry(feed_id=feeds[3].id, guid="b", user_id=feeds[3].user_id))
+    db_session.commit()
+    FeedHandler.body = rss(("a", "First"), ("b", "Second"))
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().startswith("SELECT") and "rss_entries" in statement:
+            statements.append(statement)
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        await manager.process_all_feeds()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(FeedHandler.requests_seen) == 1
+    assert len(statements) == 1
+    guids = {
+        feed.user_id: {entry.guid for entry in db_session.query(RSSEntry).filter_by(feed_id=feed.id)}
+        for feed in feeds
+    }
+    assert guids == {
+        feeds[0].user_id: {"b"},
+        feeds[1].user_id: {"a", "b"},
+        feeds[2].user_id: {"a", "b"},
+        feeds[3].user_id: {"a", "b"},
+    }
+    assert len(manager.started) == 6
+    assert all(feed.last_fetch for feed in feeds)
+
+
+@pytest.mark.asyncio
+async def test_poll_interval_follows_cadence_and_publisher(db_session, manager, feed, monkeypatch):
+    """测试抓取间隔随发布频率调整，遵守 ttl/Cache-Control，并限制在配置范围内"""
+    monkeypatch.setattr(config_manager, "_db_config", {"RSS_MIN_FETCH_INTERVAL": 900, "RSS_MAX_FETCH_INTERVAL": 86400})
+    items = [(str(index), f"Item {index}") for index in range(5)]
+
+    # 每天发布一次：每半天抓取一次
+    FeedHandler.body = rss(*items)
+    await manager.fetch_feed(feed)
+    assert feed.poll_interval == 12 * 3600
+    assert feed.next_fetch_at == feed.last_fetch + feed.poll_interval * 1000
+
+    # 每10分钟发布一次：不低于用户设置的抓取间隔
+    FeedHandler.body = rss(*items, hours=1 / 6)
+    await manager.fetch_feed(feed)
+    assert feed.poll_interval == feed.fetch_interval == 900
+
+    # 发布方要求的 ttl 与 Cache-Control 取较大者
+    FeedHandler.body = rss(*items, hours=1 / 6, ttl=60)
+    FeedHandler.cache_control = "public, max-age=7200"
+    await manager.fetch_feed(feed)
+    assert feed.poll_interval == 7200
+
+    # 内容未变化时沿用上次的间隔，超过上限时取上限
+    FeedHandler.cache_control = "max-age=604800"
+    await manager.fetch_feed(feed)
+    assert feed.poll_interval == 86400
+
+
+@pytest.mark.asyncio
+async def test_failing_feed_backs_off_and_pauses(db_session, test_user, manager, feed_server, monkeypatch):
+    """测试抓取失败后指数退避重试，连续失败超过上限后暂停"""
+    monkeypatch.setattr(config_manager, "_db_config", {
+        "RSS_MAX_RETRY_COUNT": 2, "RSS_ERROR_RETRY_INTERVAL": 300, "RSS_MAX_FETCH_INTERVAL": 86400
+    })
+    feed, = _add_feeds(db_session, test_user, feed_server, ["error"])
+
+    for error_count, delay in ((1, 300), (2, 600)):
+        before = time.time() * 1000
+        with pytest.raises(Exception):
+            await manager.fetch_feed(feed)
+        assert feed.error_count == error_count
+        assert before + delay * 500 <= feed.next_fetch_at <= time.time() * 1000 + delay * 1000
+        assert feed.is_active
+
+    # 未到重试时间的源不参与本轮抓取
+    await manager.process_all_feeds()
+    assert len(FeedHandler.requests_seen) == 2
+
+    with pytest.raises(Exception):
+        await manager.fetch_feed(feed)
+    assert feed.error_count == 3
+    assert not feed.is_active
+    assert feed.next_fetch_at is None
+
+
+@pytest.mark.asyncio
+async def test_api_responsive_during_feed_cycle(db_session, test_user, manager, feed_server, monkeypatch):
+    """测试大量RSS源解析和入库期间接口请求仍能完成"""
+    monkeypatch.setattr(config_manager, "_db_config", {"RSS_CONCURRENT_TASKS": 8})
+    FeedHandler.body = rss(*[(f"item-{index}", f"Item {index}") for index in range(1000)], hours=1)
+    feeds = _add_feeds(db_session, test_user, feed_server, [f"large{index}" for index in range(12)])
+    for feed in feeds:
+        feed.initial_entries_count = 50
+    db_session.commit()
+
+    # 条目入库等到有接口请求在本轮抓取期间完成后才继续；入库阻塞事件循环时请求无法完成，等待超时
+    api_responded = threading.Event()
+    waits = []
+    process_entries = FeedManager._process_entries
+
+    def gated_process_entries(self, *args, **kwargs):
+        waits.append(api_responded.wait(timeout=5))
+        return process_entries(self, *args, **kwargs)
+
+    monkeypatch.setattr(FeedManager, "_process_entries", gated_process_entries)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        cycle = asyncio.create_task(manager.process_all_feeds())
+        while not cycle.done():
+            response = await client.get("/")
+            assert response.status_code == 200
+            if not cycle.done():
+                api_responded.set()
+            await asyncio.sleep(0.01)
+        await cycle
+
+    assert waits and all(waits)
+    assert all(feed.last_fetch for feed in feeds)
+    # 各源内容相同，同一用户的相同条目只创建一次
+    assert len(manager.started) == 50
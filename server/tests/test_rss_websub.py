@@ -0,0 +1,195 @@
+import hashlib
+import hmac
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+from fastapi import status
+
+from core.config import config_manager
+from models.rss import RSSEntry, RSSFeed
+from services.rss.feed_manager import FeedManager
+from utils.time_utils import TimeUtil
+
+CALLBACK_BASE_URL = "http://lingopod.test"
+
+
+def rss(hub_url, *guids):
+    """生成声明了 hub 和 self 链接的RSS文档"""
+    items = "".join(
+        f"<item><title>{guid}</title><link>https://example.com/{guid}</link><guid>{guid}</guid>"
+        f"<pubDate>Mon, 0{index + 1} Jan 2024 00:00:00 GMT</pubDate></item>"
+        for index, guid in enumerate(guids)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+        f'<title>Feed</title><atom:link rel="hub" href="{hub_url}"/>'
+        f'<atom:link rel="self" href="https://example.com/feed.xml"/>{items}</channel></rss>'
+    ).encode()
+
+
+class StandInHub:
+    """本地WebSub hub：HTTP接收订阅请求，通过测试客户端回调验证和推送"""
+
+    def __init__(self):
+        self.subscriptions = []
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                hub.subscriptions.append(dict(parse_qsl(self.rfile.read(length).decode())))
+                self.send_response(202)
+                self.end_headers()
+
+            def do_GET(self):
+                body = hub.feed_body
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/hub"
+        self.feed_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/feed.xml"
+        self.feed_body = rss(self.url, "a")
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def callback_path(subscription):
+        callback = urlsplit(subscription["hub.callback"])
+        return f"{callback.path}?{callback.query}"
+
+    def verify(self, client, subscription, topic=None, token=True):
+        callback = urlsplit(subscription["hub.callback"])
+        return client.get(callback.path, params={
+            **(dict(parse_qsl(callback.query)) if token else {}),
+            "hub.mode": "subscribe",
+            "hub.topic": topic or subscription["hub.topic"],
+            "hub.challenge": "challenge-123",
+            "hub.lease_seconds": subscription["hub.lease_seconds"],
+        })
+
+    def publish(self, client, subscription, body, secret=None):
+        secret = secret or subscription["hub.secret"]
+        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return client.post(
+            self.callback_path(subscription),
+            content=body,
+            headers={"X-Hub-Signature": f"sha256={signature}", "Content-Type": "application/rss+xml"}
+        )
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    monkeypatch.setattr(config_manager, "_db_config", {
+        "WEBSUB_CALLBACK_BASE_URL": CALLBACK_BASE_URL,
+        "WEBSUB_LEASE_SECONDS": 864000,
+        "RSS_PARSE_WORKERS": 0,
+        "RSS_MAX_FETCH_INTERVAL": 86400,
+    })
+    started = []
+    monkeypatch.setattr(FeedManager, "_start_tasks", staticmethod(started.extend))
+    hub = StandInHub()
+    hub.started = started
+    yield hub
+    hub.httpd.shutdown()
+
+
+@pytest.fixture
+def feeds(db_session, test_users, hub):
+    feeds = [RSSFeed(title="Feed", url=hub.feed_url, user_id=user.id) for user in test_users[:2]]
+    db_session.add_all(feeds)
+    db_session.commit()
+    return feeds
+
+
+@pytest.mark.asyncio
+async def test_subscribe_verify_and_push(db_session, client, hub, feeds):
+    """测试发现hub后订阅、验证订阅，推送内容分发给所有订阅者并延长轮询间隔"""
+    manager = FeedManager(db_session, None)
+    await manager.fetch_feeds(feeds)
+
+    # 同一URL只订阅一次
+    assert len(hub.subscriptions) == 1
+    subscription = hub.subscriptions[0]
+    leader = next(feed for feed in feeds if feed.websub_secret)
+    assert subscription["hub.callback"].startswith(f"{CALLBACK_BASE_URL}/api/v1/rss/websub/{leader.id}?token=")
+    assert subscription["hub.topic"] == leader.websub_topic == "https://example.com/feed.xml"
+    assert all(feed.hub_url == hub.url for feed in feeds)
+
+    # topic不一致或缺少回调token的验证请求不被确认
+    response = hub.verify(client, subscription, topic="https://example.com/other.xml")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = hub.verify(client, subscription, token=False)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = hub.verify(client, subscription)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text == "challenge-123"
+    db_session.refresh(leader)
+    assert leader.websub_lease_expires_at > leader.last_fetch
+    # 已确认的订阅不能被重放的验证请求延长
+    response = hub.verify(client, subscription)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # 签名错误的推送不处理
+    response = hub.publish(client, subscription, rss(hub.url, "a", "forged"), secret="wrong")
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert db_session.query(RSSEntry).filter_by(guid="forged").count() == 0
+
+    response = hub.publish(client, subscription, rss(hub.url, "a", "b"))
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert {entry.user_id for entry in db_session.query(RSSEntry).filter_by(guid="b")} == {
+        feed.user_id for feed in feeds
+    }
+    # 推送按订阅有效期推迟下次轮询，并保存到数据库
+    for feed in feeds:
+        db_session.refresh(feed)
+        assert feed.poll_interval == 86400
+        assert feed.next_fetch_at == feed.last_fetch + 86400 * 1000
+
+    # 订阅有效期间轮询只作兜底，且不重复订阅
+    hub.feed_body = rss(hub.url, "a", "b")
+    manager = FeedManager(db_session, None)
+    await manager.fetch_feeds(feeds)
+    assert all(feed.poll_interval == 86400 for feed in feeds)
+    assert len(hub.subscriptions) == 1
+
+
+@pytest.mark.asyncio
+async def test_no_subscription_without_callback_url(db_session, hub, feeds, monkeypatch):
+    """测试未配置回调地址时只记录hub，不发起订阅"""
+    monkeypatch.setitem(config_manager._db_config, "WEBSUB_CALLBACK_BASE_URL", "")
+    await FeedManager(db_session, None).fetch_feeds(feeds)
+
+    assert hub.subscriptions == []
+    assert all(feed.hub_url == hub.url and feed.websub_secret is None for feed in feeds)
+
+
+@pytest.mark.asyncio
+async def test_expired_pending_subscription_rejected(db_session, client, hub, feeds):
+    """测试超过等待验证时间后的验证请求不被确认"""
+    await FeedManager(db_session, None).fetch_feeds(feeds)
+    leader = next(feed for feed in feeds if feed.websub_secret)
+    leader.websub_pending_expires_at = TimeUtil.now_ms() - 1
+    db_session.commit()
+
+    response = hub.verify(client, hub.subscriptions[0])
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    db_session.refresh(leader)
+    assert leader.websub_lease_expires_at is None
+
+
+def test_unknown_feed_rejected(client):
+    """测试未订阅的源拒绝验证请求，推送返回2xx但不处理"""
+    response = client.get("/api/v1/rss/websub/999", params={
+        "hub.mode": "subscribe", "hub.topic": "https://example.com/feed.xml", "hub.challenge": "x"
+    })
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = client.post("/api/v1/rss/websub/999", content=b"<rss/>")
+    assert response.status_code == status.HTTP_202_ACCEPTED
@@ -0,0 +1,136 @@
+import os
+
+from core.config import settings
+from models.enums import TaskProgress, TaskStatus
+from models.task import Task
+from services.file import FileService
+from services.task.dedupe import TaskDeduplicator
+from services.task.task_service import execute_task
+
+URL = "https://example.com/news/story?id=7"
+STYLE = {"content_length": "medium", "tone": "casual", "emotion": "neutral"}
+
+
+def _add_task(db_session, user, task_id, url=URL, style=STYLE, status=TaskStatus.PENDING.value):
+    task = Task(
+        taskId=task_id,
+        url=url,
+        status=status,
+        progress=TaskProgress.WAITING.value,
+        user_id=user.id,
+        created_by=user.id,
+        style_params=style
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def _complete_with_files(db_session, task):
+    """模拟流水线完成：写入音频和字幕文件并标记任务完成"""
+    task.files = {}
+    for level in ("elementary", "advanced"):
+        for lang in ("en", "cn"):
+            audio = FileService.write_file(task.taskId, level, lang, "audio", f"{level}-{lang}".encode())
+            subtitle = FileService.write_file(task.taskId, level, lang, "subtitle", f"1\n{level}-{lang}")
+            task.files.setdefault(level, {})[lang] = {"audio": audio, "subtitle": subtitle}
+    task.dedupe_key = TaskDeduplicator.build_key(task.url, task.style_params)
+    task.title = "生成的标题"
+    task.total_steps = 20
+    task.status = TaskStatus.COMPLETED.value
+    task.progress = TaskProgress.COMPLETED.value
+    db_session.commit()
+
+
+def _assert_shares_files(source, task):
+    for level, langs in source.files.items():
+        for lang, file_types in langs.items():
+            for file_type, filename in file_types.items():
+                target = task.files[level][lang][file_type]
+                assert target == FileService.get_task_file_name(level, lang, file_type, task.taskId)
+                assert os.path.samefile(
+                    FileService.get_task_file_path(source.taskId, filename),
+                    FileService.get_task_file_path(task.taskId, target)
+                )
+
+
+def test_duplicate_reuses_completed_task(db_session, test_user):
+    """测试相同规范化URL和风格参数的新任务直接共享已完成任务的文件"""
+    source = _add_task(db_session, test_user, "source")
+    _complete_with_files(db_session, source)
+    task = _add_task(db_session, test_user, "duplicate", url=f"{URL}&utm_source=rss#top")
+
+    execute_task(task.taskId, db_session=db_session)
+
+    db_session.refresh(task)
+    assert task.status == TaskStatus.COMPLETED.value
+    assert task.title == "生成的标题"
+    assert task.total_steps == 20
+    _assert_shares_files(source, task)
+
+    # 删除源任务不影响复用的文件
+    FileService.delete_task_directory(source.taskId)
+    audio = task.files["elementary"]["en"]["audio"]
+    with open(FileService.get_task_file_path(task.taskId, audio), "rb") as f:
+        assert f.read() == b"elementary-en"
+
+
+def test_different_style_or_refresh_not_reused(db_session, test_user):
+    """测试风格参数不同或要求强制刷新的任务不复用"""
+    deduplicator = TaskDeduplicator.get_instance()
+    source = _add_task(db_session, test_user, "source")
+    _complete_with_files(db_session, source)
+
+    other_style = _add_task(db_session, test_user, "formal", style={**STYLE, "tone": "formal"})
+    refresh = _add_task(db_session, test_user, "refresh")
+    refresh.refresh_content = True
+    db_session.commit()
+
+    try:
+        assert not deduplicator.try_reuse(other_style, db_session)
+        assert not deduplicator.try_reuse(refresh, db_session)
+    finally:
+        deduplicator.release(other_style.taskId)
+    assert other_style.files == {}
+
+
+def test_duplicate_queues_behind_inflight_task(db_session, test_user):
+    """测试相同任务正在处理时，新任务排队后立即返回，处理者结束后重新启动并共享文件"""
+    deduplicator = TaskDeduplicator.get_instance()
+    leader = _add_task(db_session, test_user, "leader")
+    follower = _add_task(db_session, test_user, "follower")
+    assert not deduplicator.try_reuse(leader, db_session)
+
+    # 排队不阻塞当前线程
+    assert deduplicator.try_reuse(follower, db_session)
+    assert follower.status == TaskStatus.PENDING.value
+
+    _complete_with_files(db_session, leader)
+    assert deduplicator.release(leader.taskId) == [follower.taskId]
+    assert deduplicator.release(leader.taskId) == []
+
+    execute_task(follower.taskId, db_session=db_session)
+    db_session.refresh(follower)
+    assert follower.status == TaskStatus.COMPLETED.value
+    _assert_shares_files(leader, follower)
+
+
+def test_default_style_params_share_key():
+    """测试未指定风格参数与默认风格参数的任务去重键相同"""
+    assert TaskDeduplicator.build_key(URL, None) == TaskDeduplicator.build_key(URL, STYLE)
+    assert TaskDeduplicator.build_key(URL, {"tone": "casual"}) == TaskDeduplicator.build_key(URL, STYLE)
+    assert TaskDeduplicator.build_key(URL, {"tone": "formal"}) != TaskDeduplicator.build_key(URL, STYLE)
+
+
+def test_rewrite_does_not_touch_shared_file(db_session, test_user):
+    """测试重新写入共享文件时断开硬链接，不修改源任务的文件"""
+    source = _add_task(db_session, test_user, "source")
+    _complete_with_files(db_session, source)
+    task = _add_task(db_session, test_user, "duplicate")
+    execute_task(task.taskId, db_session=db_session)
+
+    FileService.write_file(task.taskId, "elementary", "en", "audio", b"regenerated")
+
+    source_audio = os.path.join(settings.TASK_DIR, source.taskId, source.files["elementary"]["en"]["audio"])
+    with open(source_audio, "rb") as f:
+        assert f.read() == b"elementary-en"
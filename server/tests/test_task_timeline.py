@@ -0,0 +1,168 @@
+import pytest
+from fastapi import status
+
+from models.task import Task
+from models.task_step_run import TaskStepRun
+from models.enums import TaskStatus, TaskProgress, StepRunStatus
+from services.task.processor import TaskProcessor
+from services.task.steps.base import BaseStep
+from services.task.utils.errors import TaskError
+from utils.time_utils import TimeUtil
+
+
+class FlakyStep(BaseStep):
+    """前若干次执行失败的测试步骤"""
+    def __init__(self, fail_times: int, progress_tracker, context_manager):
+        super().__init__(
+            name="测试步骤",
+            input_files=[],
+            output_files=["flaky_output"],
+            progress_tracker=progress_tracker,
+            context_manager=context_manager
+        )
+        self.fail_times = fail_times
+        self.executions = 0
+
+    def _execute(self, context_manager):
+        self.executions += 1
+        self.record_usage(provider="fake-llm", tokens=100, characters=10)
+        if self.executions <= self.fail_times:
+            raise ValueError("模拟失败")
+        return {"flaky_output": "ok"}
+
+
+@pytest.fixture
+def processing_task(db_session, test_user):
+    task = Task(
+        taskId="test-timeline-task",
+        url="https://mp.weixin.qq.com/s/oPu6ngqcN2fNHdvP-dW-AQ",
+        status=TaskStatus.PROCESSING.value,
+        progress=TaskProgress.PROCESSING.value,
+        user_id=test_user.id,
+        created_by=test_user.id,
+        is_public=False
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+@pytest.fixture
+def user_token(client, test_user):
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "testuser", "password": "testpass"}
+    )
+    return response.json()["access_token"]
+
+
+@pytest.fixture
+def admin_token(client, test_admin):
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "admin", "password": "adminpass"}
+    )
+    return response.json()["access_token"]
+
+
+def test_step_run_recorded_with_retries(db_session, processing_task, monkeypatch):
+    """测试步骤重试后成功时记录尝试次数与用量"""
+    monkeypatch.setattr(TaskProcessor, "RETRY_DELAY", 0)
+    processor = TaskProcessor(processing_task, db_session)
+    step = FlakyStep(1, processor.progress_tracker, processor.context_manager)
+
+    processor._execute_single_step(step, 0)
+
+    runs = db_session.query(TaskStepRun).filter_by(task_id=processing_task.taskId).all()
+    assert len(runs) == 1
+    run = runs[0]
+    assert run.status == StepRunStatus.COMPLETED.value
+    assert run.attempts == 2
+    assert run.step_type == "FlakyStep"
+    assert run.provider == "fake-llm"
+    assert run.calls == 2
+    assert run.tokens == 200
+    assert run.duration_ms >= 0
+    assert run.error_class is None
+
+
+def test_step_run_recorded_on_failure(db_session, processing_task, monkeypatch):
+    """测试步骤最终失败时记录异常类名"""
+    monkeypatch.setattr(TaskProcessor, "RETRY_DELAY", 0)
+    processor = TaskProcessor(processing_task, db_session)
+    step = FlakyStep(10, processor.progress_tracker, processor.context_manager)
+
+    with pytest.raises(TaskError):
+        processor._execute_single_step(step, 0)
+
+    run = db_session.query(TaskStepRun).filter_by(task_id=processing_task.taskId).one()
+    assert run.status == StepRunStatus.FAILED.value
+    assert run.attempts == TaskProcessor.MAX_STEP_RETRIES + 1
+    assert run.error_class == "ValueError"
+
+
+def _add_runs(db_session, task_id):
+    now = TimeUtil.now_ms()
+    db_session.add_all([
+        TaskStepRun(task_id=task_id, step_index=0, step_name="获取页面内容",
+                    step_type="FetchContentStep", status=StepRunStatus.COMPLETED.value,
+                    attempts=1, started_at=now, finished_at=now + 500, duration_ms=500,
+                    characters=1200),
+        TaskStepRun(task_id=task_id, step_index=2, step_name="处理elementary难度内容",
+                    step_type="ContentStep", level="elementary",
+                    status=StepRunStatus.COMPLETED.value, attempts=2, started_at=now + 500,
+                    finished_at=now + 3500, duration_ms=3000, provider="fake-llm",
+                    calls=2, tokens=800),
+        TaskStepRun(task_id=task_id, step_index=3, step_name="处理intermediate难度内容",
+                    step_type="ContentStep", level="intermediate",
+                    status=StepRunStatus.FAILED.value, attempts=2, started_at=now + 3500,
+                    finished_at=now + 4500, duration_ms=1000, provider="fake-llm",
+                    calls=2, tokens=100, error_class="ValueError"),
+    ])
+    db_session.commit()
+
+
+def test_get_task_timeline(client, db_session, processing_task, user_token):
+    """测试获取任务时间线"""
+    _add_runs(db_session, processing_task.taskId)
+
+    response = client.get(
+        f"/api/v1/tasks/{processing_task.taskId}/timeline",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["taskId"] == processing_task.taskId
+    assert data["total_duration_ms"] == 4500
+    assert [item["step_index"] for item in data["items"]] == [0, 2, 3]
+    assert data["items"][2]["error_class"] == "ValueError"
+
+
+def test_step_stats_admin_only(client, db_session, processing_task, user_token, admin_token):
+    """测试步骤统计接口的聚合结果和权限"""
+    _add_runs(db_session, processing_task.taskId)
+
+    response = client.get(
+        "/api/v1/admin/step-stats",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.get(
+        "/api/v1/admin/step-stats",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    items = {item["key"]: item for item in response.json()["items"]}
+    content = items["ContentStep"]
+    assert content["runs"] == 2
+    assert content["failures"] == 1
+    assert content["retries"] == 2
+    assert content["total_duration_ms"] == 4000
+    assert content["tokens"] == 900
+
+    response = client.get(
+        "/api/v1/admin/step-stats?group_by=unknown",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,106 @@
+import random
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.config import config_manager
+from services.task.steps.translation import TranslationStep
+from utils.token_utils import TokenUtil
+
+
+class FakeLLMService:
+    """按输入逐条返回译文的假LLM服务，批次包含指定内容时返回条数错误"""
+    def __init__(self, poison=()):
+        self.poison = set(poison)
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def invoke(self, template_name, inputs, json_output=False, step=None, validate=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append([item["content"] for item in inputs["content"]])
+        try:
+            # 随机延迟，打乱批次完成顺序
+            time.sleep(random.uniform(0, 0.02))
+            result = [
+                {"role": item["role"], "content": f"译:{item['content']}"}
+                for item in inputs["content"]
+            ]
+            if any(item["content"] in self.poison for item in inputs["content"]):
+                result = result[:-1]
+            if validate is not None:
+                validate(result)
+            return result
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def batch_settings(monkeypatch):
+    """固定批次条数上限，放宽token预算"""
+    monkeypatch.setattr(config_manager, "_db_config", {})
+    config_manager._db_config.update({
+        "TRANSLATION_BATCH_TOKEN_BUDGET": 10000,
+        "TRANSLATION_MAX_BATCH_ITEMS": 5,
+    })
+    return config_manager._db_config
+
+
+def _make_step(llm_service):
+    context_manager = MagicMock()
+    context_manager.get.side_effect = lambda key, default=None: default
+    step = TranslationStep(level="elementary", progress_tracker=MagicMock(), context_manager=context_manager)
+    step.llm_service = llm_service
+    return step
+
+
+def _dialogue(count):
+    return [
+        {"role": "host" if i % 2 == 0 else "guest", "content": f"line-{i}"}
+        for i in range(count)
+    ]
+
+
+def test_batches_run_concurrently_and_keep_order(batch_settings):
+    """测试批次并发翻译后按原顺序组装"""
+    llm = FakeLLMService()
+    step = _make_step(llm)
+
+    result = step._translate_dialogue(_dialogue(23))
+
+    assert [item["content"] for item in result] == [f"译:line-{i}" for i in range(23)]
+    assert len(llm.calls) == 5
+    assert llm.max_active > 1
+
+
+def test_batch_size_follows_token_budget(batch_settings):
+    """测试长句按token预算拆成更多批次"""
+    short_lines = _dialogue(10)
+    long_lines = [{"role": "host", "content": "word " * 200} for _ in range(10)]
+    batch_settings["TRANSLATION_BATCH_TOKEN_BUDGET"] = TokenUtil.count_json(long_lines[0]) * 3
+    step = _make_step(FakeLLMService())
+
+    assert [len(batch) for _, batch in step._split_batches(short_lines)] == [5, 5]
+    assert [len(batch) for _, batch in step._split_batches(long_lines)] == [3, 3, 3, 1]
+
+
+def test_failed_batch_is_bisected(batch_settings):
+    """测试失败批次对半拆分重试，只有坏的那一条以空内容占位"""
+    batch_settings["TRANSLATION_MAX_BATCH_ITEMS"] = 8
+    llm = FakeLLMService(poison={"line-5"})
+    step = _make_step(llm)
+
+    result = step._translate_dialogue(_dialogue(8))
+
+    expected = [f"译:line-{i}" for i in range(8)]
+    expected[5] = ""
+    assert [item["content"] for item in result] == expected
+    assert [item["role"] for item in result] == [item["role"] for item in _dialogue(8)]
+    # 8 -> 4+4 -> 2+2 -> 1+1，共7次调用，而逐条回退需要9次
+    assert len(llm.calls) == 7
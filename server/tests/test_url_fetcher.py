@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.config import config_manager
+from services import url_fetcher
+from services.url_fetcher import (
+    URLContentError, afetch_url_content, close_async_session, detect_charset, fetch_url_content
+)
+
+ARTICLE = "<html><head>{meta}<title>{title}</title></head><body><article><p>{body}</p></article></body></html>"
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """按路径返回不同测试页面的本地服务"""
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        PageHandler.requests_seen.append((self.path, dict(self.headers)))
+        if self.path == "/gzip":
+            body = gzip.compress(ARTICLE.format(meta="", title="压缩", body="gzip article body").encode("utf-8"))
+            self._send(200, body, {"Content-Type": "text/html; charset=utf-8", "Content-Encoding": "gzip"})
+        elif self.path == "/gbk-meta":
+            html = ARTICLE.format(meta='<meta charset="gbk">', title="中文标题", body="这是一篇中文文章的正文内容")
+            self._send(200, html.encode("gbk"), {"Content-Type": "text/html"})
+        elif self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, b"", {"ETag": '"v1"'})
+                return
+            html = ARTICLE.format(meta="", title="etag", body="cached article body")
+            self._send(200, html.encode("utf-8"), {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'})
+        elif self.path == "/large":
+            # 不声明长度，只能在读取过程中发现超出上限
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(b"<html><body><p>" + b"x" * 20000 + b"</p></body></html>")
+        else:
+            self._send(404, b"", {})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(config_manager, "_db_config", {"URL_FETCH_MAX_BYTES": 10000})
+    url_fetcher.revalidation_cache.clear()
+    PageHandler.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    url_fetcher.revalidation_cache.clear()
+
+
+def test_gzip_response_decoded(server):
+    """测试声明并解压gzip响应"""
+    content, title = fetch_url_content(f"{server}/gzip")
+
+    assert content == "gzip article body"
+    assert title == "压缩"
+    assert "gzip" in PageHandler.requests_seen[0][1]["Accept-Encoding"]
+
+
+def test_charset_from_meta(server):
+    """测试响应头未声明编码时使用 <meta> 中的声明"""
+    content, title = fetch_url_content(f"{server}/gbk-meta")
+
+    assert title == "中文标题"
+    assert content == "这是一篇中文文章的正文内容"
+
+
+def test_oversized_body_aborted(server):
+    """测试超过大小上限的页面中止读取"""
+    with pytest.raises(URLContentError, match="上限"):
+        fetch_url_content(f"{server}/large")
+
+
+def test_unchanged_page_revalidated(server):
+    """测试再次获取时发送条件请求，304时复用上次的内容"""
+    first = fetch_url_content(f"{server}/etag")
+    second = fetch_url_content(f"{server}/etag")
+
+    assert first == second == ("cached article body", "etag")
+    assert "If-None-Match" not in PageHandler.requests_seen[0][1]
+    assert PageHandler.requests_seen[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_async_fetch_shares_behaviour(server):
+    """测试协程版本同样支持编码识别与条件请求"""
+    async def fetch():
+        try:
+            await afetch_url_content(f"{server}/etag")
+            return await afetch_url_content(f"{server}/gbk-meta"), await afetch_url_content(f"{server}/etag")
+        finally:
+            await close_async_session()
+
+    gbk, cached = asyncio.run(fetch())
+
+    assert gbk == ("这是一篇中文文章的正文内容", "中文标题")
+    assert cached == ("cached article body", "etag")
+    assert PageHandler.requests_seen[-1][1]["If-None-Match"] == '"v1"'
+
+
+def test_detect_charset_order():
+    """测试编码识别优先级：响应头 > meta > 自动检测"""
+    body = '<meta charset="gbk"><p>中文内容</p>'.encode("gbk")
+
+    assert detect_charset("text/html; charset=utf-8", body) == "utf-8"
+    assert detect_charset("text/html", body) == "gbk"
+    assert detect_charset("text/html; charset=bogus", "plain ascii text".encode()) == "ascii"
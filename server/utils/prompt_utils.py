@@ -1,10 +1,27 @@
 import os
+import json
+import hashlib
+import threading
 import yaml
 from typing import Dict
 from langchain_core.prompts import ChatPromptTemplate
 from core.config import settings
+from core.logging import log
 
 class PromptUtils:
+    """提示词模板注册表
+
+    模板文件只在首次使用或修改时间变化时解析，解析结果编译为
+    ChatPromptTemplate 缓存在进程内，并为每个模板计算版本哈希，
+    供缓存和步骤指纹使用。
+    """
+    _lock = threading.Lock()
+    _loaded_file = None
+    _loaded_mtime = None
+    _templates: Dict[str, Dict] = {}
+    _prompts: Dict[str, ChatPromptTemplate] = {}
+    _versions: Dict[str, str] = {}
+
     @staticmethod
     def get_template_file() -> str:
         """获取模板文件路径"""
@@ -13,20 +30,105 @@ class PromptUtils:
     @classmethod
     def get_prompt_template(cls, template_name: str) -> Dict:
         """获取提示词模板"""
-        template_file = cls.get_template_file()
-        with open(template_file, 'r', encoding='utf-8') as f:
-            templates = yaml.safe_load(f)
-        
-        if template_name not in templates:
+        cls._ensure_loaded()
+        if template_name not in cls._templates:
             raise ValueError(f"Template '{template_name}' not found")
-        
-        return templates[template_name]
+        return cls._templates[template_name]
 
     @classmethod
     def create_chat_prompt(cls, template_name: str) -> ChatPromptTemplate:
-        """创建聊天提示词模板"""
-        template = cls.get_prompt_template(template_name)
-        return ChatPromptTemplate.from_messages([
-            ("system", template["system"]),
-            ("human", template["human"]),
-        ])
+        """获取已编译的聊天提示词模板"""
+        cls._ensure_loaded()
+        if template_name not in cls._prompts:
+            raise ValueError(f"Template '{template_name}' not found")
+        return cls._prompts[template_name]
+
+    @classmethod
+    def get_template_version(cls, template_name: str) -> str:
+        """获取模板版本哈希，模板内容变化时随之变化"""
+        cls._ensure_loaded()
+        if template_name not in cls._versions:
+            raise ValueError(f"Template '{template_name}' not found")
+        return cls._versions[template_name]
+
+    @classmethod
+    def validate_templates(cls) -> Dict[str, str]:
+        """强制重新解析并校验模板文件，用于启动时快速失败
+
+        Returns:
+            Dict[str, str]: 模板名称到版本哈希的映射
+
+        Raises:
+            ValueError: 模板文件格式错误或模板内容无效
+        """
+        with cls._lock:
+            template_file = cls.get_template_file()
+            cls._load(template_file, os.path.getmtime(template_file))
+            return dict(cls._versions)
+
+    @classmethod
+    def _ensure_loaded(cls):
+        """模板文件修改时间变化时重新加载"""
+        template_file = cls.get_template_file()
+        mtime = os.path.getmtime(template_file)
+        if template_file == cls._loaded_file and mtime == cls._loaded_mtime:
+            return
+
+        with cls._lock:
+            if template_file == cls._loaded_file and mtime == cls._loaded_mtime:
+                return
+            try:
+                cls._load(template_file, mtime)
+            except ValueError as e:
+                # 已有可用模板时保留旧版本，避免运行中的任务因模板编辑中途出错
+                if not cls._prompts or template_file != cls._loaded_file:
+                    raise
+                log.error(f"提示词模板重新加载失败，继续使用旧版本: {str(e)}")
+                cls._loaded_mtime = mtime
+
+    @classmethod
+    def _load(cls, template_file: str, mtime: float):
+        """解析、校验并编译模板文件"""
+        try:
+            with open(template_file, 'r', encoding='utf-8') as f:
+                templates = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise ValueError(f"提示词模板文件解析失败: {str(e)}")
+
+        if not isinstance(templates, dict) or not templates:
+            raise ValueError("提示词模板文件为空或格式错误")
+
+        prompts = {}
+        versions = {}
+        for name, template in templates.items():
+            prompts[name] = cls._compile(name, template)
+            versions[name] = cls._compute_version(template)
+
+        cls._templates = templates
+        cls._prompts = prompts
+        cls._versions = versions
+        cls._loaded_file = template_file
+        cls._loaded_mtime = mtime
+        log.info(f"已加载 {len(prompts)} 个提示词模板")
+
+    @staticmethod
+    def _compile(name: str, template: Dict) -> ChatPromptTemplate:
+        """校验单个模板并编译为 ChatPromptTemplate"""
+        if not isinstance(template, dict):
+            raise ValueError(f"Template '{name}' 格式错误")
+        for role in ("system", "human"):
+            if not isinstance(template.get(role), str) or not template[role].strip():
+                raise ValueError(f"Template '{name}' 缺少 {role} 内容")
+        try:
+            return ChatPromptTemplate.from_messages([
+                ("system", template["system"]),
+                ("human", template["human"]),
+            ])
+        except Exception as e:
+            raise ValueError(f"Template '{name}' 编译失败: {str(e)}")
+
+    @staticmethod
+    def _compute_version(template: Dict) -> str:
+        """根据模板内容计算版本哈希"""
+        payload = json.dumps(template, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,56 @@
+import re
+import json
+import threading
+from typing import Any
+from core.logging import log
+
+# 中日韩字符，每个字符大约对应一个token
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]')
+
+class TokenUtil:
+    """token数量估算工具
+
+    优先使用 tiktoken 的 cl100k_base 编码计数；编码文件无法加载(如离线部署)时
+    退回按字符估算：中日韩字符按1个token计，其余字符按4个字符1个token计。
+    """
+    ENCODING_NAME = "cl100k_base"
+    _encoding = None
+    _encoding_loaded = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def count(cls, text: str) -> int:
+        """估算文本的token数"""
+        if not text:
+            return 0
+        encoding = cls._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return cls.estimate(text)
+
+    @classmethod
+    def count_json(cls, value: Any) -> int:
+        """估算对象序列化为JSON后的token数"""
+        return cls.count(json.dumps(value, ensure_ascii=False))
+
+    @staticmethod
+    def estimate(text: str) -> int:
+        """按字符粗略估算token数"""
+        cjk = len(_CJK_PATTERN.findall(text))
+        return cjk + (len(text) - cjk + 3) // 4
+
+    @classmethod
+    def _get_encoding(cls):
+        """加载tiktoken编码，只尝试一次"""
+        if cls._encoding_loaded:
+            return cls._encoding
+        with cls._lock:
+            if not cls._encoding_loaded:
+                try:
+                    import tiktoken
+                    cls._encoding = tiktoken.get_encoding(cls.ENCODING_NAME)
+                except Exception as e:
+                    log.warning(f"无法加载tiktoken编码，使用字符数估算token: {str(e)}")
+                    cls._encoding = None
+                cls._encoding_loaded = True
+        return cls._encoding